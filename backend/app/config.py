@@ -1,7 +1,99 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+# Deployments that inject their environment can skip the .env lookup with DOTENV=0
+if os.getenv("DOTENV", "1") == "1":
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 ESPNS2 = os.getenv("ESPNS2")
-SWID = os.getenv("SWID")
\ No newline at end of file
+SWID = os.getenv("SWID")
+
+# League cache
+LEAGUE_CACHE_TTL = float(os.getenv("LEAGUE_CACHE_TTL", "300"))
+LEAGUE_CACHE_PAST_SEASON_TTL = float(os.getenv("LEAGUE_CACHE_PAST_SEASON_TTL", "86400"))
+LEAGUE_CACHE_MAX_ENTRIES = int(os.getenv("LEAGUE_CACHE_MAX_ENTRIES", "32"))
+LEAGUE_CACHE_MAX_BYTES = int(os.getenv("LEAGUE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+CURRENT_SEASON = int(os.getenv("CURRENT_SEASON", "2025"))
+FINAL_WEEK_CACHE_MAX_ENTRIES = int(os.getenv("FINAL_WEEK_CACHE_MAX_ENTRIES", "4096"))
+WEEK_FETCH_WORKERS = int(os.getenv("WEEK_FETCH_WORKERS", "4"))
+
+# Snapshot store: "file", "sqlite" or "none"
+SNAPSHOT_BACKEND = os.getenv("SNAPSHOT_BACKEND", "file")
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "data/snapshots")
+# "live" refreshes from ESPN after warm-starting from snapshots; "replay" never calls ESPN
+SNAPSHOT_MODE = os.getenv("SNAPSHOT_MODE", "live")
+
+# ESPN HTTP client
+ESPN_ASYNC_CLIENT = os.getenv("ESPN_ASYNC_CLIENT", "1") == "1"
+ESPN_MAX_CONNECTIONS = int(os.getenv("ESPN_MAX_CONNECTIONS", "20"))
+ESPN_MAX_PER_HOST = int(os.getenv("ESPN_MAX_PER_HOST", "8"))
+ESPN_TIMEOUT = float(os.getenv("ESPN_TIMEOUT", "10"))
+ESPN_RETRIES = int(os.getenv("ESPN_RETRIES", "3"))
+ESPN_BACKOFF_BASE = float(os.getenv("ESPN_BACKOFF_BASE", "0.25"))
+ESPN_BACKOFF_MAX = float(os.getenv("ESPN_BACKOFF_MAX", "4"))
+ESPN_SYNC_WORKERS = int(os.getenv("ESPN_SYNC_WORKERS", "16"))
+
+# Season simulator
+SIM_WORKERS = int(os.getenv("SIM_WORKERS", "4"))
+SIM_SHARD_SIZE = int(os.getenv("SIM_SHARD_SIZE", "25000"))
+SIM_MAX_SIMULATIONS = int(os.getenv("SIM_MAX_SIMULATIONS", "1000000"))
+
+# Free agent index
+FREE_AGENT_POOL_SIZE = int(os.getenv("FREE_AGENT_POOL_SIZE", "500"))
+FREE_AGENT_FULL_REFRESH_SECONDS = float(os.getenv("FREE_AGENT_FULL_REFRESH_SECONDS", "3600"))
+
+# Activity log
+ACTIVITY_LOG_DIR = os.getenv("ACTIVITY_LOG_DIR", "data/activity")
+ACTIVITY_POLL_SECONDS = float(os.getenv("ACTIVITY_POLL_SECONDS", "60"))
+ACTIVITY_PAGE_SIZE = int(os.getenv("ACTIVITY_PAGE_SIZE", "25"))
+ACTIVITY_BACKFILL_MAX = int(os.getenv("ACTIVITY_BACKFILL_MAX", "100"))
+# Pollers stop after this long without a query and restart on the next one
+ACTIVITY_IDLE_SECONDS = float(os.getenv("ACTIVITY_IDLE_SECONDS", "1800"))
+
+# Live scoring stream
+LIVE_SCORES_POLL_SECONDS = float(os.getenv("LIVE_SCORES_POLL_SECONDS", "15"))
+LIVE_SCORES_KEEPALIVE_SECONDS = float(os.getenv("LIVE_SCORES_KEEPALIVE_SECONDS", "15"))
+LIVE_SCORES_QUEUE_SIZE = int(os.getenv("LIVE_SCORES_QUEUE_SIZE", "64"))
+
+# Upstream rate limit shared by every ESPN request (requests/second, burst)
+ESPN_RATE_LIMIT = float(os.getenv("ESPN_RATE_LIMIT", "10"))
+ESPN_RATE_BURST = float(os.getenv("ESPN_RATE_BURST", "20"))
+
+# Refresh scheduler
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "1") == "1"
+# Comma-separated league ids to keep warm from startup; others join when first requested
+SCHEDULER_LEAGUES = [int(x) for x in os.getenv("SCHEDULER_LEAGUES", "").split(",") if x.strip()]
+SCHEDULER_WORKERS = int(os.getenv("SCHEDULER_WORKERS", "2"))
+SCHEDULER_GAME_INTERVAL = float(os.getenv("SCHEDULER_GAME_INTERVAL", "60"))
+SCHEDULER_IDLE_INTERVAL = float(os.getenv("SCHEDULER_IDLE_INTERVAL", "1800"))
+SCHEDULER_MAX_BACKOFF = float(os.getenv("SCHEDULER_MAX_BACKOFF", "3600"))
+# Leagues nobody has requested for this long stop being refreshed
+SCHEDULER_INACTIVE_SECONDS = float(os.getenv("SCHEDULER_INACTIVE_SECONDS", str(3 * 24 * 3600)))
+
+# Startup warm-up: leagues ("id" or "id:year") loaded into the league cache before
+# /ready reports ready; defaults to SCHEDULER_LEAGUES for the current season
+WARMUP_LEAGUES = [
+    (int(league), int(year or CURRENT_SEASON))
+    for league, _, year in (x.strip().partition(":") for x in os.getenv("WARMUP_LEAGUES", ",".join(map(str, SCHEDULER_LEAGUES))).split(","))
+    if league
+]
+# Seconds one league may take to warm before it's skipped
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "60"))
+# Hold the server's startup until warm-up finishes instead of warming in the background
+WARMUP_BLOCKING = os.getenv("WARMUP_BLOCKING", "0") == "1"
+
+# Historical warehouse (columnar .npy files per league season)
+WAREHOUSE_DIR = os.getenv("WAREHOUSE_DIR", "data/warehouse")
+
+# Bulk export (python -m app.services.export): output directory and Parquet rows per row group
+EXPORT_DIR = os.getenv("EXPORT_DIR", "data/exports")
+EXPORT_ROW_GROUP_SIZE = int(os.getenv("EXPORT_ROW_GROUP_SIZE", "10000"))
+
+# Instrumentation
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# Allow per-request profiling (X-Profile: 1 header or ?profile=1) to return a Server-Timing breakdown
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "1") == "1"
+
+# League overview: seconds each section may take before it's reported as timed out
+OVERVIEW_SECTION_TIMEOUT = float(os.getenv("OVERVIEW_SECTION_TIMEOUT", "5"))
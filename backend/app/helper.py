@@ -1,14 +1,165 @@
-from espn_api.football import League
-from app.config import ESPNS2, SWID
+import hashlib
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
 
-def get_league(league_id: int, year: int = 2025, debug: bool = False) -> League:
+from app.config import (
+    ESPNS2,
+    SWID,
+    CURRENT_SEASON,
+    SNAPSHOT_MODE,
+    LEAGUE_CACHE_TTL,
+    LEAGUE_CACHE_PAST_SEASON_TTL,
+    LEAGUE_CACHE_MAX_ENTRIES,
+    LEAGUE_CACHE_MAX_BYTES,
+)
+from app.services import snapshots
+from app.services.espn_client import run_blocking
+from app.utils.cache import TTLCache
+from app.utils.metrics import span
+
+if TYPE_CHECKING:
+    from espn_api.football import League
+
+logger = logging.getLogger(__name__)
+
+# Process-wide cache of hydrated League objects, shared by every router and service
+league_cache = TTLCache(
+    default_ttl=LEAGUE_CACHE_TTL,
+    max_entries=LEAGUE_CACHE_MAX_ENTRIES,
+    max_bytes=LEAGUE_CACHE_MAX_BYTES,
+)
+
+def _credentials_fingerprint() -> str:
+    """
+    Short hash of the ESPN cookies so the cache key never holds raw credentials.
+    """
+    raw = f"{ESPNS2 or ''}:{SWID or ''}".encode()
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+def league_key(league_id: int, year: int = 2025) -> tuple:
+    """
+    Cache key for a league: (league_id, year, credentials).
+    """
+    return (int(league_id), int(year), _credentials_fingerprint())
+
+def league_ttl(year: int) -> float:
+    """
+    Past seasons never change, so they can stay cached much longer.
+    """
+    return LEAGUE_CACHE_PAST_SEASON_TTL if year < CURRENT_SEASON else LEAGUE_CACHE_TTL
+
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# league key -> time.monotonic() of its last request; read by the refresh scheduler
+league_access = {}
+
+def _load_league(league_id: int, year: int) -> "League":
+    """
+    Cold-cache loader: warm-start from the last snapshot when one exists and
+    refresh from ESPN in the background, otherwise fetch live.
+    """
+    if SNAPSHOT_MODE == snapshots.REPLAY:
+        return snapshots.build_league(league_id, year, mode=snapshots.REPLAY)
+
+    try:
+        league = snapshots.build_league(league_id, year, mode=snapshots.REPLAY)
+    except snapshots.SnapshotMiss:
+        return snapshots.build_league(league_id, year, mode=snapshots.LIVE)
+    except Exception as e:
+        logger.warning("Discarding unreadable snapshot for league %s (%s): %s", league_id, year, e)
+        return snapshots.build_league(league_id, year, mode=snapshots.LIVE)
+
+    # Follow-up calls on this object (box scores, activity...) should reach ESPN
+    league.espn_request.mode = snapshots.LIVE
+    refresh_league_in_background(league_id, year)
+    return league
+
+def refresh_league(league_id: int, year: int = 2025, ttl: float = None) -> "League":
+    """
+    Fetches a league from ESPN and replaces whatever the cache holds for it.
+    """
+    league = snapshots.build_league(league_id, year, mode=snapshots.LIVE)
+    league_cache.set(league_key(league_id, year), league, ttl=ttl or league_ttl(year))
+    return league
+
+def refresh_league_in_background(league_id: int, year: int = 2025) -> bool:
+    """
+    Starts a background refresh unless one is already running for this league.
+    """
+    key = league_key(league_id, year)
+    with _refreshing_lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+
+    def run():
+        try:
+            refresh_league(league_id, year)
+        except Exception as e:
+            logger.warning("Background refresh failed for league %s (%s): %s", league_id, year, e)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=run, name=f"refresh-{league_id}-{year}", daemon=True).start()
+    return True
+
+def get_league(league_id: int, year: int = 2025, debug: bool = False) -> "League":
+    """
+    Returns an ESPN League object, served from the shared league cache when possible.
+    """
+    if debug:
+        from espn_api.football import League
+
+        # Debug leagues log every request, so never share them
+        return League(
+            league_id=league_id,
+            year=year,
+            espn_s2=ESPNS2,
+            swid=SWID,
+            debug=True
+        )
+
+    key = league_key(league_id, year)
+    with span("get_league"):
+        league = league_cache.get_or_load(
+            key,
+            lambda: _load_league(league_id, year),
+            ttl=league_ttl(year),
+        )
+    # Only leagues that loaded are worth refreshing in the background
+    league_access[key] = time.monotonic()
+    return league
+
+
+def team_index(league: "League") -> dict:
+    """
+    team_id -> Team map, built once per cached League object.
+    """
+    index = getattr(league, "_team_index", None)
+    if index is None:
+        index = {team.team_id: team for team in league.teams}
+        league._team_index = index
+    return index
+
+def get_team(league_id: int, team_id: int, year: int = 2025):
+    """
+    Returns a single Team from the cached league in O(1), or None if it doesn't exist.
+    """
+    return team_index(get_league(league_id, year)).get(team_id)
+
+def is_league_warm(league_id: int, year: int = 2025) -> bool:
+    return league_cache.peek(league_key(league_id, year)) is not None
+
+
+async def aget_league(league_id: int, year: int = 2025) -> "League":
     """
-    Initializes and returns an ESPN League object.
+    Async get_league: returns warm leagues immediately and hydrates cold ones
+    in the bounded ESPN thread pool so the event loop never blocks.
     """
-    return League(
-        league_id=league_id,
-        year=year,
-        espn_s2=ESPNS2,
-        swid=SWID,
-        debug=debug
-    )
\ No newline at end of file
+    if is_league_warm(league_id, year):
+        return get_league(league_id, year)
+    return await run_blocking(get_league, league_id, year)
@@ -1,8 +1,57 @@
-from fastapi import FastAPI
+import time
+
+# Startup timings are measured from here, before the app's own imports
+_import_started = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.routers import league, players, free_agents
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.routers import league, players, player_index, free_agents, waivers, lineups, simulations, history, drafts, export, system
+from app.config import SCHEDULER_ENABLED, LOG_LEVEL, PROFILING_ENABLED, WARMUP_BLOCKING
+from app.helper import league_cache
+from app.services import espn_client, startup
+from app.services.espn_service import team_view_cache, final_week_cache
+from app.services.free_agent_index import free_agent_indexes
+from app.services.scheduler import scheduler
+from app.services.simulator import odds_cache
+from app.utils import metrics
+
+logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+# httpx logs every request at INFO; upstream calls are counted in /metrics instead
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+metrics.registry.add_collector(metrics.cache_collector({
+    "league": league_cache,
+    "team_view": team_view_cache,
+    "final_week": final_week_cache,
+    "free_agent_index": free_agent_indexes,
+    "playoff_odds": odds_cache,
+}))
+metrics.registry.add_collector(startup.state.collect)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup.state.started = _import_started
+    startup.state.record("import", _import_finished - _import_started)
+    if WARMUP_BLOCKING:
+        await startup.warm_up()
+        warm_up = None
+    else:
+        # Serve /ready (as 503) and /metrics while leagues load
+        warm_up = asyncio.create_task(startup.warm_up())
+    if SCHEDULER_ENABLED:
+        scheduler.start()
+    yield
+    if warm_up is not None:
+        warm_up.cancel()
+    scheduler.stop()
+    # Close pooled ESPN connections and the sync worker pool
+    espn_client.shutdown()
 
-app = FastAPI(title="Fantasy GM Backend")
+app = FastAPI(title="Fantasy GM Backend", lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",   # React dev server
@@ -17,10 +66,62 @@ app.add_middleware(
     allow_headers=["*"],        
 )
 
+@app.middleware("http")
+async def instrument_requests(request: Request, call_next):
+    """
+    Records latency and response size per route template. Requests sent with
+    X-Profile: 1 (or ?profile=1) also get a Server-Timing header breaking the time
+    down into get_league, upstream, build, serialize and fetch_* spans (inclusive).
+    """
+    profile = None
+    if PROFILING_ENABLED and (request.headers.get("x-profile") == "1" or request.query_params.get("profile") == "1"):
+        profile = metrics.start_profile()
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+
+    route = request.scope.get("route")
+    path = getattr(route, "path", "unmatched")
+    labels = {"method": request.method, "route": path, "status": response.status_code}
+    metrics.request_seconds.observe(elapsed, **labels)
+    size = response.headers.get("content-length")
+    if size is not None:
+        metrics.response_bytes.observe(int(size), method=request.method, route=path)
+    if profile is not None:
+        profile["total"] = [1, elapsed]
+        response.headers["Server-Timing"] = metrics.server_timing(profile)
+    return response
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """
+    Prometheus text exposition of request, upstream and cache metrics.
+    """
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
 app.include_router(league.router, prefix="/api", tags=["League"])
 app.include_router(players.router, prefix="/api", tags=["Players"])
+app.include_router(player_index.router, prefix="/api", tags=["Player Index"])
 app.include_router(free_agents.router, prefix="/api", tags=["Free Agents"])
+app.include_router(waivers.router, prefix="/api", tags=["Waivers"])
+app.include_router(lineups.router, prefix="/api", tags=["Lineups"])
+app.include_router(simulations.router, prefix="/api", tags=["Simulations"])
+app.include_router(history.router, prefix="/api", tags=["History"])
+app.include_router(drafts.router, prefix="/api", tags=["Draft"])
+app.include_router(export.router, prefix="/api", tags=["Export"])
+app.include_router(system.router, prefix="/api", tags=["System"])
+
+@app.get("/ready", include_in_schema=False)
+def get_ready():
+    """
+    Readiness probe: 503 until the startup warm-up has finished, then 200. Both
+    report import, warm-up and per-league timings.
+    """
+    status = startup.state.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
 
 @app.get("/")
 def root():
-    return {"message": "Fantasy GM backend is running"}
\ No newline at end of file
+    return {"message": "Fantasy GM backend is running"}
+
+_import_finished = time.perf_counter()
@@ -0,0 +1,434 @@
+import threading
+import weakref
+from dataclasses import dataclass
+
+# Typed, slotted views of espn_api objects. Built once per League snapshot and
+# shared by every endpoint; large nested payloads (stats, breakdowns, schedule)
+# are referenced from the espn_api objects, not copied.
+
+
+@dataclass(slots=True)
+class PlayerRecord:
+    player_id: int
+    name: str
+    position: str
+    pos_rank: int
+    pro_team: str
+    eligible_slots: list
+    acquisition_type: str
+    lineup_slot: str
+    injury_status: str
+    active_status: str
+    percent_owned: float
+    percent_started: float
+    projected_points: float
+    total_points: float
+    avg_points: float
+    projected_total_points: float
+    projected_avg_points: float
+    stats: dict
+    projected_breakdown: dict
+    schedule: dict
+    pro_opponent: str
+    game_date: object
+    on_bye_week: bool
+
+    @classmethod
+    def from_player(cls, player) -> "PlayerRecord":
+        stats = getattr(player, "stats", {}) or {}
+        # espn_api uses scoring period 0 for season totals
+        season = stats.get(0, {})
+        return cls(
+            player_id=player.playerId,
+            name=player.name,
+            position=player.position,
+            pos_rank=getattr(player, "posRank", None),
+            pro_team=getattr(player, "proTeam", None),
+            eligible_slots=getattr(player, "eligibleSlots", []),
+            acquisition_type=getattr(player, "acquisitionType", None),
+            lineup_slot=getattr(player, "lineupSlot", None),
+            injury_status=getattr(player, "injuryStatus", None),
+            active_status=getattr(player, "active_status", None),
+            percent_owned=getattr(player, "percent_owned", None),
+            percent_started=getattr(player, "percent_started", None),
+            projected_points=getattr(player, "projected_points", None),
+            total_points=season.get("points", 0),
+            avg_points=season.get("avg_points", 0),
+            projected_total_points=season.get("projected_points", 0),
+            projected_avg_points=season.get("projected_avg_points", 0),
+            stats=stats,
+            projected_breakdown=getattr(player, "projected_breakdown", None),
+            schedule=getattr(player, "schedule", None),
+            pro_opponent=getattr(player, "pro_opponent", None),
+            game_date=getattr(player, "game_date", None),
+            on_bye_week=getattr(player, "on_bye_week", False),
+        )
+
+    def basic(self) -> dict:
+        return {"name": self.name, "playerId": self.player_id, "position": self.position}
+
+    def roster_row(self, team: "TeamRecord") -> dict:
+        return {
+            "player_id": self.player_id,
+            "name": self.name,
+            "position": self.position,
+            "pos_rank": self.pos_rank,
+            "pro_team": self.pro_team,
+            "eligible_slots": self.eligible_slots,
+            "acquisition_type": self.acquisition_type,
+            "team_id": team.team_id,
+            "team_name": team.team_name,
+        }
+
+    def detailed(self) -> dict:
+        return {
+            "name": self.name,
+            "playerId": self.player_id,
+            "position": self.position,
+            "proTeam": self.pro_team,
+            "lineupSlot": self.lineup_slot,
+            "injuryStatus": self.injury_status,
+            "acquisitionType": self.acquisition_type,
+            "eligibleSlots": self.eligible_slots,
+            "total_points": self.total_points,
+            "avg_points": self.avg_points,
+            "projected_points": self.projected_points,
+            "stats": self.stats,          # weekly or seasonal stats
+            "projected_breakdown": self.projected_breakdown,
+            "schedule": self.schedule,
+        }
+
+    def free_agent(self) -> dict:
+        season = self.stats.get(0, {})
+        # espn-python's week 3 entry, kept for response compatibility
+        week_projection = self.stats.get(3, {})
+        return {
+            "player_id": self.player_id,
+            "name": self.name,
+            "position": self.position,
+            "pos_rank": self.pos_rank,
+            "pro_team": self.pro_team,
+            "eligible_slots": self.eligible_slots,
+            "acquisition_type": self.acquisition_type,
+            "injury_status": self.injury_status,
+            "active_status": self.active_status,
+            "percent_owned": self.percent_owned,
+            "percent_started": self.percent_started,
+            "total_points": self.total_points,
+            "avg_points": self.avg_points,
+            "projected_total_points": self.projected_total_points,
+            "projected_avg_points": self.projected_avg_points,
+            "stats": {
+                "season": {
+                    "points": season.get("points", 0),
+                    "breakdown": season.get("breakdown", {}),
+                    "projected_points": season.get("projected_points", 0),
+                    "projected_breakdown": season.get("projected_breakdown", {}),
+                },
+                "week_projection": {
+                    "projected_points": week_projection.get("projected_points", 0),
+                    "projected_breakdown": week_projection.get("projected_breakdown", {}),
+                },
+            },
+            "opponent": self.pro_opponent,
+            "game_date": self.game_date,
+            "on_bye_week": self.on_bye_week,
+        }
+
+
+@dataclass(slots=True)
+class TeamRecord:
+    team_id: int
+    team_abbrev: str
+    team_name: str
+    division_id: int
+    division_name: str
+    wins: int
+    losses: int
+    ties: int
+    points_for: float
+    points_against: float
+    acquisitions: int
+    acquisition_budget_spent: int
+    drops: int
+    trades: int
+    move_to_ir: int
+    playoff_pct: float
+    draft_projected_rank: int
+    streak_length: int
+    streak_type: str
+    standing: int
+    final_standing: int
+    waiver_rank: int
+    logo_url: str
+    schedule: tuple      # (team_id, team_name) per week
+    roster: tuple        # PlayerRecord
+    scores: list
+    outcomes: list
+    mov: list
+    stats: dict
+
+    @classmethod
+    def from_team(cls, team, players: dict = None) -> "TeamRecord":
+        """
+        players: optional player_id -> PlayerRecord map, so each player is built once per league.
+        """
+        players = players if players is not None else {}
+        roster = []
+        for player in getattr(team, "roster", []):
+            record = players.get(player.playerId)
+            if record is None:
+                record = players[player.playerId] = PlayerRecord.from_player(player)
+            roster.append(record)
+        return cls(
+            team_id=team.team_id,
+            team_abbrev=getattr(team, "team_abbrev", None),
+            team_name=team.team_name,
+            division_id=getattr(team, "division_id", None),
+            division_name=getattr(team, "division_name", None),
+            wins=team.wins,
+            losses=team.losses,
+            ties=getattr(team, "ties", 0),
+            points_for=getattr(team, "points_for", 0.0),
+            points_against=getattr(team, "points_against", 0.0),
+            acquisitions=getattr(team, "acquisitions", 0),
+            acquisition_budget_spent=getattr(team, "acquisition_budget_spent", 0),
+            drops=getattr(team, "drops", 0),
+            trades=getattr(team, "trades", 0),
+            move_to_ir=getattr(team, "move_to_ir", 0),
+            playoff_pct=getattr(team, "playoff_pct", 0.0),
+            draft_projected_rank=getattr(team, "draft_projected_rank", None),
+            streak_length=getattr(team, "streak_length", 0),
+            streak_type=getattr(team, "streak_type", None),
+            standing=getattr(team, "standing", None),
+            final_standing=getattr(team, "final_standing", None),
+            waiver_rank=getattr(team, "waiver_rank", None),
+            logo_url=getattr(team, "logo_url", None),
+            schedule=tuple((t.team_id, t.team_name) for t in getattr(team, "schedule", [])),
+            roster=tuple(roster),
+            scores=getattr(team, "scores", []),
+            outcomes=getattr(team, "outcomes", []),
+            mov=getattr(team, "mov", []),
+            stats=getattr(team, "stats", {}),
+        )
+
+    def summary(self) -> dict:
+        """
+        Basic team info with roster names only.
+        """
+        return {
+            "team_name": self.team_name,
+            "team_id": self.team_id,
+            "wins": self.wins,
+            "losses": self.losses,
+            "final_standing": self.final_standing,
+            "roster": [player.name for player in self.roster],
+        }
+
+    def detailed(self) -> dict:
+        return {
+            "team_id": self.team_id,
+            "team_abbrev": self.team_abbrev,
+            "team_name": self.team_name,
+            "division_id": self.division_id,
+            "division_name": self.division_name,
+            "wins": self.wins,
+            "losses": self.losses,
+            "ties": self.ties,
+            "points_for": self.points_for,
+            "points_against": self.points_against,
+            "acquisitions": self.acquisitions,
+            "acquisition_budget_spent": self.acquisition_budget_spent,
+            "drops": self.drops,
+            "trades": self.trades,
+            "move_to_ir": self.move_to_ir,
+            "playoff_pct": self.playoff_pct,
+            "draft_projected_rank": self.draft_projected_rank,
+            "streak_length": self.streak_length,
+            "streak_type": self.streak_type,
+            "standing": self.standing,
+            "final_standing": self.final_standing,
+            "waiver_rank": self.waiver_rank,
+            "logo_url": self.logo_url,
+            "schedule": [{"team_id": team_id, "team_name": team_name} for team_id, team_name in self.schedule],
+            "roster": [player.basic() for player in self.roster],
+            "scores": self.scores,
+            "outcomes": self.outcomes,
+            "mov": self.mov,
+            "stats": self.stats,
+        }
+
+    def players(self) -> list:
+        return [player.roster_row(self) for player in self.roster]
+
+    def players_detailed(self) -> dict:
+        return {
+            "team_name": self.team_name,
+            "team_id": self.team_id,
+            "roster": [player.detailed() for player in self.roster],
+        }
+
+
+@dataclass(slots=True)
+class DraftPickRecord:
+    player_id: int
+    player_name: str
+    round: int
+    round_pick: int
+    team_id: int
+    team_name: str
+    bid_amount: int
+    keeper_status: bool
+
+    @classmethod
+    def from_pick(cls, pick) -> "DraftPickRecord":
+        team = getattr(pick, "team", None)
+        return cls(
+            player_id=getattr(pick, "playerId", None),
+            player_name=pick.playerName,
+            round=pick.round_num,
+            round_pick=pick.round_pick,
+            team_id=getattr(team, "team_id", None),
+            team_name=getattr(team, "team_name", None),
+            bid_amount=getattr(pick, "bid_amount", 0),
+            keeper_status=getattr(pick, "keeper_status", False),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "player_name": self.player_name,
+            "round": self.round,
+            "round_pick": self.round_pick,
+            "team_name": self.team_name,
+            "team_id": self.team_id,
+        }
+
+
+@dataclass(slots=True)
+class LineupRecord:
+    player_id: int
+    name: str
+    position: str
+    eligible_slots: list
+    slot_position: str
+    points: float
+    projected_points: float
+    pro_opponent: str
+    pro_pos_rank: int
+
+    @classmethod
+    def from_box_player(cls, player) -> "LineupRecord":
+        return cls(
+            player_id=player.playerId,
+            name=player.name,
+            position=player.position,
+            eligible_slots=player.eligibleSlots,
+            slot_position=player.slot_position,
+            points=player.points,
+            projected_points=player.projected_points,
+            pro_opponent=player.pro_opponent,
+            pro_pos_rank=player.pro_pos_rank,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "player_id": self.player_id,
+            "name": self.name,
+            "position": self.position,
+            "eligible_slots": self.eligible_slots,
+            "slot_position": self.slot_position,
+            "points": self.points,
+            "projected_points": self.projected_points,
+            "pro_opponent": self.pro_opponent,
+            "pro_pos_rank": self.pro_pos_rank,
+        }
+
+
+@dataclass(slots=True)
+class MatchupRecord:
+    home_team_id: int
+    home_team: str
+    home_score: float
+    away_team_id: int
+    away_team: str
+    away_score: float
+    home_lineup: tuple = ()
+    away_lineup: tuple = ()
+
+    @classmethod
+    def from_matchup(cls, matchup, lineups: bool = False) -> "MatchupRecord":
+        """
+        From an espn_api Matchup (scoreboard) or BoxScore (lineups=True).
+        """
+        return cls(
+            home_team_id=matchup.home_team.team_id,
+            home_team=matchup.home_team.team_name,
+            home_score=matchup.home_score,
+            away_team_id=matchup.away_team.team_id,
+            away_team=matchup.away_team.team_name,
+            away_score=matchup.away_score,
+            home_lineup=tuple(LineupRecord.from_box_player(p) for p in matchup.home_lineup) if lineups else (),
+            away_lineup=tuple(LineupRecord.from_box_player(p) for p in matchup.away_lineup) if lineups else (),
+        )
+
+    def scoreboard(self) -> dict:
+        return {
+            "home_team": self.home_team,
+            "home_team_id": self.home_team_id,
+            "home_score": self.home_score,
+            "away_team": self.away_team,
+            "away_team_id": self.away_team_id,
+            "away_score": self.away_score,
+        }
+
+    def box_score(self) -> dict:
+        return {
+            "home_team": self.home_team,
+            "home_team_id": self.home_team_id,
+            "home_score": self.home_score,
+            "home_lineup": [p.to_dict() for p in self.home_lineup],
+            "away_team": self.away_team,
+            "away_team_id": self.away_team_id,
+            "away_score": self.away_score,
+            "away_lineup": [p.to_dict() for p in self.away_lineup],
+        }
+
+
+class LeagueRecords:
+    """
+    Records for one League snapshot: teams in league order, every rostered
+    player by id, and the draft.
+    """
+
+    __slots__ = ("teams", "players", "_draft", "_league", "__weakref__")
+
+    def __init__(self, league):
+        self.players = {}
+        self.teams = {team.team_id: TeamRecord.from_team(team, self.players) for team in league.teams}
+        self._draft = None
+        self._league = weakref.ref(league)
+
+    @property
+    def draft(self) -> tuple:
+        # espn_api loads the draft with the league; building its records is deferred so
+        # endpoints that never read the draft don't pay for it
+        if self._draft is None:
+            league = self._league()
+            self._draft = tuple(DraftPickRecord.from_pick(pick) for pick in getattr(league, "draft", [])) if league else ()
+        return self._draft
+
+
+_records = weakref.WeakKeyDictionary()
+_records_lock = threading.Lock()
+
+
+def league_records(league) -> LeagueRecords:
+    """
+    Returns the LeagueRecords for a League object, building them once per snapshot.
+    """
+    with _records_lock:
+        records = _records.get(league)
+        if records is None:
+            records = LeagueRecords(league)
+            _records[league] = records
+        return records
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, HTTPException, Query
+from app.services.draft_analysis import (
+    fetch_draft_analysis,
+    fetch_team_draft,
+    fetch_player_draft,
+    fetch_pick_value_curve,
+)
+
+router = APIRouter()
+
+@router.get("/league/{league_id}/draft/analysis")
+def get_draft_analysis(league_id: int, year: int = 2025):
+    """
+    Draft grades for a season: value over replacement and surplus vs. the pick-value
+    curve per pick, rolled up per team and per round.
+    """
+    data = fetch_draft_analysis(league_id, year)
+    if not data["teams"]:
+        raise HTTPException(status_code=404, detail="Draft data not found")
+    return data
+
+@router.get("/league/{league_id}/draft/analysis/team/{team_id}")
+def get_team_draft_analysis(league_id: int, team_id: int, year: int = 2025):
+    """
+    One team's picks with their value over replacement and draft grade.
+    """
+    data = fetch_team_draft(league_id, team_id, year)
+    if not data:
+        raise HTTPException(status_code=404, detail="Team not found in draft")
+    return data
+
+@router.get("/league/{league_id}/draft/analysis/player/{player_id}")
+def get_player_draft_analysis(
+    league_id: int,
+    player_id: int,
+    year: int = Query(None, description="One season; default every available season")
+):
+    """
+    Where a player was drafted and how the pick paid off.
+    """
+    data = fetch_player_draft(league_id, player_id, year)
+    if not data:
+        raise HTTPException(status_code=404, detail="Player was not drafted")
+    return data
+
+@router.get("/league/{league_id}/draft/pick-value-curve")
+def get_pick_value_curve(league_id: int):
+    """
+    Pick-value curve (value over replacement vs. log of overall pick) fitted across
+    every historical season in the warehouse.
+    """
+    data = fetch_pick_value_curve(league_id)
+    if not data["curve"]["picks"]:
+        raise HTTPException(status_code=404, detail="No historical drafts ingested")
+    return data
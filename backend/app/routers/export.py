@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.services.export import FORMATS, iter_ndjson, iter_parquet, iter_rows, parse_tables, parse_years, require_parquet
+
+router = APIRouter()
+
+@router.get("/league/{league_id}/export")
+def get_league_export(
+    league_id: int,
+    format: str = Query("ndjson", description="ndjson or parquet"),
+    tables: str = Query(None, description="Comma-separated tables: teams, rosters, draft, matchups, lineups, activity (default: all; parquet takes exactly one)"),
+    years: str = Query(None, description="Up to 10 seasons from 2004 on, e.g., 2023-2025 or 2021,2023 (default: the current season)")
+):
+    """
+    Streams a league's teams, rosters, draft, matchups, box-score lineups and activity
+    as NDJSON (one row per line, tagged with its table) or one table as Parquet. Each
+    season's rows come from one shared league snapshot.
+    """
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {list(FORMATS)}")
+    try:
+        table_list = parse_tables(tables)
+        year_list = parse_years(years)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if format == "ndjson":
+        return StreamingResponse(iter_ndjson(iter_rows(league_id, year_list, table_list)), media_type="application/x-ndjson")
+
+    if len(table_list) != 1:
+        raise HTTPException(status_code=400, detail="Parquet export takes exactly one table")
+    try:
+        require_parquet()
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    table = table_list[0]
+    return StreamingResponse(
+        iter_parquet(iter_rows(league_id, year_list, table_list), table),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": f'attachment; filename="{league_id}-{table}.parquet"'},
+    )
@@ -1,16 +1,27 @@
-from fastapi import APIRouter, Query
-from app.services.espn_service import fetch_free_agents
+from fastapi import APIRouter, HTTPException, Query, Response
+from app.services.free_agent_index import fetch_free_agents, DEFAULT_SORT, MAX_PAGE_SIZE
 
 router = APIRouter()
 
 @router.get("/league/{league_id}/free-agents")
 def get_free_agents(
     league_id: int,
-    size: int = Query(20, description="Number of free agents to return"),
-    position: str = Query(None, description="Filter by position, e.g., QB, WR, RB, TE")
+    response: Response,
+    size: int = Query(20, description=f"Number of free agents to return (at most {MAX_PAGE_SIZE})"),
+    position: str = Query(None, description="Filter by position(s) or lineup slot(s), e.g., QB, RB,WR or RB/WR/TE (FLEX)"),
+    sort: str = Query(DEFAULT_SORT, description="percent_owned, projected_avg_points, avg_points, projected_total_points or total_points"),
+    cursor: str = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: str = Query(None, description="Comma-separated fields to return, e.g., name,position,avg_points"),
+    year: int = 2025
 ):
     """
-    Fetches free agents in a league, optionally filtered by position.
+    Fetches free agents in a league, optionally filtered by position and ranked server-side.
+    The next page's cursor is returned in the X-Next-Cursor header.
     """
-    data = fetch_free_agents(league_id, size=size, position=position)
+    try:
+        data, next_cursor = fetch_free_agents(league_id, size=size, position=position, sort=sort, cursor=cursor, fields=fields, year=year)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return data
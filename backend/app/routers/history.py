@@ -0,0 +1,50 @@
+from fastapi import APIRouter, HTTPException, Query
+from app.services.warehouse import get_warehouse, all_time_records, head_to_head, draft_value
+
+router = APIRouter()
+
+def _require_history(league_id: int):
+    if not get_warehouse(league_id).seasons:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No history ingested for league {league_id}; run python -m app.services.warehouse {league_id}",
+        )
+
+@router.get("/league/{league_id}/history")
+def get_history_seasons(league_id: int):
+    """
+    Lists the seasons stored in the local warehouse for a league.
+    """
+    warehouse = get_warehouse(league_id)
+    return [
+        {"year": year, "ingested_at": season.meta.get("ingested_at"), "teams": len(season.meta.get("teams", {}))}
+        for year, season in sorted(warehouse.seasons.items())
+    ]
+
+@router.get("/league/{league_id}/history/records")
+def get_all_time_records(league_id: int):
+    """
+    All-time records per team across every ingested season. Never calls ESPN.
+    """
+    _require_history(league_id)
+    return all_time_records(league_id)
+
+@router.get("/league/{league_id}/history/head-to-head")
+def get_head_to_head(
+    league_id: int,
+    team_id: int = Query(..., description="Team to report on"),
+    opponent_id: int = Query(None, description="Limit to one opponent")
+):
+    """
+    All-time head-to-head record of a team against each opponent, with every game.
+    """
+    _require_history(league_id)
+    return head_to_head(league_id, team_id, opponent_id)
+
+@router.get("/league/{league_id}/history/draft-value")
+def get_draft_value(league_id: int, year: int = Query(None, description="One season; default all ingested seasons")):
+    """
+    Every historical draft pick joined to the points its player scored that season.
+    """
+    _require_history(league_id)
+    return draft_value(league_id, year)
@@ -1,6 +1,11 @@
-from fastapi import APIRouter, HTTPException, Query
-from ff_espn_api import League 
-from app.helper import get_league
+import json
+import logging
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from app.services.espn_client import run_blocking
+from app.services.activity_log import fetch_recent_activity
+from app.services.live_scores import stream_live_scores
+from app.services.overview import afetch_league_overview
 from app.services.espn_service import (
     fetch_league_teams_detailed, 
     fetch_draft, 
@@ -8,114 +13,99 @@ from app.services.espn_service import (
     fetch_power_rankings,
     fetch_box_scores,
     fetch_scoreboard,
-    fetch_recent_activity,
     fetch_top_scorer,
     fetch_lowest_scorer,
     fetch_league_point_order,
+    fetch_standings,
+    afetch_team_by_id,
+    get_team_record,
+    league_payload,
+    week_payload,
+    parse_weeks,
+    iter_weeks,
 )
+from app.utils.responses import CachedPayload
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
-def fetch_team_by_id(league_id: int, team_id: int):
-    teams = fetch_league_teams_detailed(league_id)
-    for team in teams:
-        if team['team_id'] == team_id: 
-            return team
-    return None 
+router = APIRouter()
 
 @router.get("/league/{league_id}")
-async def get_league_info(league_id: int):
+async def get_league_info(league_id: int, request: Request):
     try:
-        data = fetch_league_teams_detailed(league_id)
-        if not data:
+        payload = await run_blocking(league_payload, league_id, "teams", lambda: fetch_league_teams_detailed(league_id))
+        if payload.empty:
             raise HTTPException(status_code=404, detail="League data not found")
-        return data
+        return payload.response(request)
+    except HTTPException:
+        raise
     except Exception as e:
-        print("ERROR in /league endpoint:", e)
+        logger.exception("Error in /league endpoint for league %s", league_id)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/league/{league_id}/overview")
+async def get_league_overview(
+    league_id: int,
+    request: Request,
+    include: str = Query(None, description="Comma-separated sections: teams, settings, scoreboard, power_rankings, top_scorer, lowest_scorer, activity (default all)"),
+    week: int = Query(None, description="Week for scoreboard and power rankings (default current week)"),
+    year: int = 2025
+):
+    """
+    Returns several league views in one response, built concurrently from one cached league.
+    Sections that fail or time out are listed under "errors" instead of failing the request.
+    """
+    try:
+        data = await afetch_league_overview(league_id, include=include, week=week, year=year)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return CachedPayload(data).response(request)
+
 @router.get("/league/{league_id}/team/{team_id}")
-def get_team(league_id: int, team_id: int):
+async def get_team_info(league_id: int, team_id: int):
     """
     Fetches specific team in the league with basic info and roster
     """
-    team = fetch_team_by_id(league_id, team_id)
+    team = await afetch_team_by_id(league_id, team_id)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
     return team 
 
 @router.get("/league/{league_id}/team/{team_id}/detailed")
-def get_team_detailed(league_id: int, team_id: int, year: int = 2025):
+def get_team_detailed(league_id: int, team_id: int, request: Request, year: int = 2025):
     """
     Fetches a specific team in a league with full stats, projections, and breakdowns.
     """
-    league = get_league(league_id, year)
-
-    # Find the team by ID
-    team = next((t for t in league.teams if t.team_id == team_id), None)
+    team = get_team_record(league_id, team_id, year)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-    
-    detailed_team = {
-        "team_id": team.team_id,
-        "team_abbrev": getattr(team, "team_abbrev", None),
-        "team_name": team.team_name,
-        "division_id": getattr(team, "division_id", None),
-        "division_name": getattr(team, "division_name", None),
-        "wins": team.wins,
-        "losses": team.losses,
-        "ties": getattr(team, "ties", 0),
-        "points_for": getattr(team, "points_for", 0.0),
-        "points_against": getattr(team, "points_against", 0.0),
-        "acquisitions": getattr(team, "acquisitions", 0),
-        "acquisition_budget_spent": getattr(team, "acquisition_budget_spent", 0),
-        "drops": getattr(team, "drops", 0),
-        "trades": getattr(team, "trades", 0),
-        "move_to_ir": getattr(team, "move_to_ir", 0),
-        "playoff_pct": getattr(team, "playoff_pct", 0.0),
-        "draft_projected_rank": getattr(team, "draft_projected_rank", None),
-        "streak_length": getattr(team, "streak_length", 0),
-        "streak_type": getattr(team, "streak_type", None),
-        "standing": getattr(team, "standing", None),
-        "final_standing": getattr(team, "final_standing", None),
-        "waiver_rank": getattr(team, "waiver_rank", None),
-        "logo_url": getattr(team, "logo_url", None),
-        # Convert schedule to dicts with only basic info
-        "schedule": [{"team_id": t.team_id, "team_name": t.team_name} for t in getattr(team, "schedule", [])],
-        # Convert roster to dicts with only basic info
-        "roster": [{"name": p.name, "playerId": p.playerId, "position": p.position} for p in getattr(team, "roster", [])],
-        "scores": getattr(team, "scores", []),
-        "outcomes": getattr(team, "outcomes", []),
-        "mov": getattr(team, "mov", []),
-        "stats": getattr(team, "stats", {}),
-    }
-
-
-    return detailed_team
+    return league_payload(league_id, ("team_detailed", team_id), team.detailed, year).response(request)
 
 @router.get("/league/{league_id}/draft")
-def get_draft(league_id: int):
+def get_draft(league_id: int, request: Request):
     """
     Returns all draft picks for a league.
     """
-    data = fetch_draft(league_id)
-    if not data:
+    payload = league_payload(league_id, "draft", lambda: fetch_draft(league_id))
+    if payload.empty:
         raise HTTPException(status_code=404, detail="Draft data not found")
-    return data
+    return payload.response(request)
 
 
 @router.get("/league/{league_id}/settings")
-async  def get_settings(league_id: int):
+async  def get_settings(league_id: int, request: Request):
     """
     Returns league settings such as team count, season length, and veto votes.
     """
     try:
-        data =  fetch_league_settings(league_id)
-        if not data:
+        payload = await run_blocking(league_payload, league_id, "settings", lambda: fetch_league_settings(league_id))
+        if payload.empty:
             raise HTTPException(status_code=404, detail="League settings not found")
-        return data
+        return payload.response(request)
+    except HTTPException:
+        raise
     except Exception as e:
-        print("Error is /settings endpoint:", e)
+        logger.exception("Error in /settings endpoint for league %s", league_id)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -130,37 +120,98 @@ def get_power_rankings(league_id: int, week: int = Query(..., description="Week
     return data
 
 @router.get("/league/{league_id}/scoreboard")
-def get_scoreboard(league_id: int, week: int = Query(..., description="Week number")):
+def get_scoreboard(league_id: int, request: Request, week: int = Query(..., description="Week number")):
     """
     Returns the scoreboard for a league for a specific week.
     """
-    data = fetch_scoreboard(league_id, week)
-    if not data:
+    payload = week_payload(league_id, week, fetch_scoreboard)
+    if payload.empty:
         raise HTTPException(status_code=404, detail="Scoreboard not found")
-    return data
+    return payload.response(request)
 
 
 @router.get("/league/{league_id}/box-scores")
-def get_box_scores(league_id: int, week: int = Query(..., description="Week number")):
+def get_box_scores(league_id: int, request: Request, week: int = Query(..., description="Week number")):
     """
     Returns detailed box scores for a league for a specific week, including player stats.
     """
-    data = fetch_box_scores(league_id, week)
-    if not data:
+    payload = week_payload(league_id, week, fetch_box_scores)
+    if payload.empty:
         raise HTTPException(status_code=404, detail="Box scores not found")
-    return data
+    return payload.response(request)
+
+@router.get("/league/{league_id}/box-scores/stream")
+async def get_box_scores_stream(
+    league_id: int,
+    week: int = Query(..., description="Week number"),
+    year: int = 2025
+):
+    """
+    Server-Sent Events stream of live scores for a week: one "snapshot" event with the
+    full box scores, then "delta" events with only changed matchup scores and player points.
+    All viewers of a league and week share a single upstream poller.
+    """
+    return StreamingResponse(
+        stream_live_scores(league_id, week, year),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+def _stream_weeks(league_id: int, weeks: str, fetch, year: int):
+    try:
+        week_list = parse_weeks(weeks)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    lines = (json.dumps(item) + "\n" for item in iter_weeks(league_id, week_list, fetch, year))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
+
+@router.get("/league/{league_id}/scoreboard/range")
+def get_scoreboard_range(
+    league_id: int,
+    weeks: str = Query(..., description="Weeks to fetch, e.g. 1-14 or 1,3,5"),
+    year: int = 2025
+):
+    """
+    Streams scoreboards for several weeks as NDJSON, one {"week", "data"} line per week.
+    """
+    return _stream_weeks(league_id, weeks, fetch_scoreboard, year)
+
+@router.get("/league/{league_id}/box-scores/range")
+def get_box_scores_range(
+    league_id: int,
+    weeks: str = Query(..., description="Weeks to fetch, e.g. 1-14 or 1,3,5"),
+    year: int = 2025
+):
+    """
+    Streams box scores for several weeks as NDJSON, one {"week", "data"} line per week.
+    Weeks are fetched concurrently and emitted in order as they become ready.
+    """
+    return _stream_weeks(league_id, weeks, fetch_box_scores, year)
 
 @router.get("/league/{league_id}/activity")
 def get_recent_activity(
     league_id: int,
+    response: Response,
     size: int = Query(25, description="Number of activity items to return"),
-    msg_type: str = Query(None, description="Filter by message type, e.g., 'TRADED'")
+    msg_type: str = Query(None, description="Filter by message type, e.g., 'TRADED'"),
+    team_id: int = Query(None, description="Only activity involving this team"),
+    player_id: int = Query(None, description="Only activity involving this player"),
+    since: int = Query(None, description="Only activity newer than this timestamp (X-Activity-Since from a previous call)"),
+    offset: int = Query(0, description="Number of matching items to skip"),
+    year: int = 2025
 ):
     """
     Returns recent activity for a league, optionally filtered by type (TRADED, DROPPED, ADDED, etc.).
-    """
-    data = fetch_recent_activity(league_id, size=size, msg_type=msg_type)
-    if not data:
+    Served from the league's local transaction log; the newest logged timestamp is
+    returned in X-Activity-Since for cheap polling.
+    """
+    data, latest = fetch_recent_activity(
+        league_id, size=size, msg_type=msg_type, team_id=team_id,
+        player_id=player_id, since=since, offset=offset, year=year,
+    )
+    response.headers["X-Activity-Since"] = str(latest)
+    if not data and since is None:
         raise HTTPException(status_code=404, detail="No recent activity found")
     return data
 
@@ -183,4 +234,11 @@ def get_league_point_order(league_id: int, year: int = 2025):
     """
     Returns all teams in the league sorted from highest to lowest points
     """
-    return fetch_league_point_order(league_id, year)
\ No newline at end of file
+    return fetch_league_point_order(league_id, year)
+
+@router.get("/league/{league_id}/standings")
+def get_standings(league_id: int, request: Request, year: int = 2025):
+    """
+    Returns standings with all-play records, luck index, strength of schedule and power rankings.
+    """
+    return league_payload(league_id, "standings", lambda: fetch_standings(league_id, year), year).response(request)
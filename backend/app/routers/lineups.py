@@ -0,0 +1,45 @@
+from fastapi import APIRouter, HTTPException, Query
+from app.services.espn_service import parse_weeks
+from app.services.lineup import fetch_optimal_lineup, fetch_optimal_lineups
+
+router = APIRouter()
+
+METRICS = {"points", "projected_points"}
+
+@router.get("/league/{league_id}/team/{team_id}/optimal-lineup")
+def get_optimal_lineup(
+    league_id: int,
+    team_id: int,
+    week: int = Query(None, description="Week number, defaults to the current week"),
+    metric: str = Query("projected_points", description="Optimize on 'projected_points' or actual 'points'"),
+    year: int = 2025
+):
+    """
+    Returns the best legal lineup for a team and week (FLEX and superflex included)
+    next to what the team actually started.
+    """
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"metric must be one of {sorted(METRICS)}")
+    data = fetch_optimal_lineup(league_id, team_id, week, metric, year)
+    if not data:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return data
+
+@router.get("/league/{league_id}/optimal-lineups")
+def get_optimal_lineups(
+    league_id: int,
+    weeks: str = Query(..., description="Weeks to optimize, e.g. 1-14"),
+    metric: str = Query("points", description="Optimize on actual 'points' or 'projected_points'"),
+    year: int = 2025
+):
+    """
+    Optimizes every team for every requested week and returns points left on bench per team.
+    Weeks that failed to load are listed under "errors" and left out of the totals.
+    """
+    if metric not in METRICS:
+        raise HTTPException(status_code=400, detail=f"metric must be one of {sorted(METRICS)}")
+    try:
+        week_list = parse_weeks(weeks)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return fetch_optimal_lineups(league_id, week_list, metric, year)
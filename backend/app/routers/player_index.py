@@ -0,0 +1,53 @@
+from fastapi import APIRouter, HTTPException, Query
+from app.services.player_index import fetch_player, fetch_player_comparison, fetch_player_rolling
+
+router = APIRouter()
+
+MAX_COMPARE = 25
+
+@router.get("/players/compare")
+def compare_players(
+    ids: str = Query(..., description="Comma-separated player ids"),
+    league_id: int = Query(None, description="League whose scoring to use (default each player's first indexed league)"),
+    last: int = Query(4, ge=0, description="Weeks in the recent-form average"),
+    year: int = 2025
+):
+    """
+    Weekly points, season averages and recent form for several players side by side.
+    """
+    try:
+        player_ids = [int(x) for x in ids.split(",") if x.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not player_ids or len(player_ids) > MAX_COMPARE:
+        raise HTTPException(status_code=400, detail=f"Compare between 1 and {MAX_COMPARE} players")
+    return fetch_player_comparison(player_ids, league_id=league_id, year=year, last=last)
+
+@router.get("/players/{player_id}")
+def get_player(
+    player_id: int,
+    league_id: int = Query(None, description="Make sure this league is indexed first"),
+    year: int = 2025
+):
+    """
+    Who owns a player in each cached league, with weekly points and projections per league.
+    """
+    data = fetch_player(player_id, league_id=league_id, year=year)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Player not found in any cached league")
+    return data
+
+@router.get("/players/{player_id}/rolling")
+def get_player_rolling(
+    player_id: int,
+    window: int = Query(3, ge=1, le=18, description="Weeks per rolling average"),
+    league_id: int = Query(None, description="League whose scoring to use (default the first indexed league)"),
+    year: int = 2025
+):
+    """
+    Rolling averages of a player's weekly points and projections.
+    """
+    data = fetch_player_rolling(player_id, window=window, league_id=league_id, year=year)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Player not found in any cached league")
+    return data
@@ -1,6 +1,5 @@
-from fastapi import APIRouter, HTTPException
-from app.services.espn_service import fetch_players_by_team
-from app.helper import get_league
+from fastapi import APIRouter, HTTPException, Request
+from app.services.espn_service import fetch_players_by_team, get_team_record, league_payload
 
 router = APIRouter()
 
@@ -15,40 +14,11 @@ def get_team_players(league_id: int, team_id: int):
     return data
 
 @router.get("/league/{league_id}/team/{team_id}/players/detailed")
-def get_team_players_detailed(league_id: int, team_id: int, year: int = 2025):
+def get_team_players_detailed(league_id: int, team_id: int, request: Request, year: int = 2025):
     """
     Fetches all players for a specific team in a league with full stats, projections, and breakdowns.
     """
-    league = get_league(league_id, year)
-
-    # Find the team by ID
-    team = next((t for t in league.teams if t.team_id == team_id), None)
+    team = get_team_record(league_id, team_id, year)
     if not team:
         raise HTTPException(status_code=404, detail="Team not found")
-
-    detailed_roster = []
-    for player in team.roster:
-        player_data = {
-            "name": player.name,
-            "playerId": player.playerId,
-            "position": player.position,
-            "proTeam": player.proTeam,
-            "lineupSlot": getattr(player, "lineupSlot", None),
-            "injuryStatus": getattr(player, "injuryStatus", None),
-            "acquisitionType": player.acquisitionType,
-            "eligibleSlots": player.eligibleSlots,
-            "total_points": getattr(player, "total_points", None),
-            "avg_points": getattr(player, "avg_points", None),
-            "projected_points": getattr(player, "projected_points", None),
-            "stats": getattr(player, "stats", None),          # weekly or seasonal stats
-            "projected_breakdown": getattr(player, "projected_breakdown", None),
-            "schedule": getattr(player, "schedule", None),
-        }
-        detailed_roster.append(player_data)
-
-    return {
-        "team_name": team.team_name,
-        "team_id": team.team_id,
-        "roster": detailed_roster
-    }
-
+    return league_payload(league_id, ("players_detailed", team_id), team.players_detailed, year).response(request)
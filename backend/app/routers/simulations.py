@@ -0,0 +1,76 @@
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+from app.services.scenarios import fetch_what_if
+from app.services.simulator import fetch_playoff_odds
+from app.services.trade import simulate_trade
+
+router = APIRouter()
+
+class TradeProposal(BaseModel):
+    team_id: int
+    partner_team_id: int
+    send: List[int]        # player ids leaving team_id
+    receive: List[int]     # player ids coming from partner_team_id
+
+class MatchupOverride(BaseModel):
+    week: int
+    team_id: int
+    result: Optional[str] = None            # "W", "L" or "T" for team_id
+    score: Optional[float] = None           # team_id's score; overrides result when given
+    opponent_score: Optional[float] = None
+
+class WhatIfScenario(BaseModel):
+    overrides: List[MatchupOverride]
+    week: Optional[int] = None              # power rankings through this week
+
+@router.get("/league/{league_id}/playoff-odds")
+def get_playoff_odds(
+    league_id: int,
+    sims: int = Query(100_000, description="Number of simulated seasons"),
+    seed: int = Query(0, description="RNG seed; the same seed and scores give the same odds"),
+    year: int = 2025
+):
+    """
+    Returns playoff, first-round bye and seed probabilities per team from a Monte Carlo
+    simulation of the remaining regular-season schedule.
+    """
+    return fetch_playoff_odds(league_id, sims=sims, seed=seed, year=year)
+
+@router.post("/league/{league_id}/trade-simulation")
+def post_trade_simulation(league_id: int, proposal: TradeProposal, year: int = 2025):
+    """
+    Simulates a trade's impact on both teams' optimal weekly lineups and
+    rest-of-season projected points.
+    """
+    try:
+        return simulate_trade(
+            league_id,
+            proposal.team_id,
+            proposal.partner_team_id,
+            proposal.send,
+            proposal.receive,
+            year,
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/league/{league_id}/what-if")
+def post_what_if(league_id: int, scenario: WhatIfScenario, year: int = 2025):
+    """
+    Recomputes standings, tiebreakers and power rankings with hypothetical results
+    or scores for some matchups, from the league's cached season arrays.
+    """
+    try:
+        return fetch_what_if(
+            league_id,
+            [override.model_dump() for override in scenario.overrides],
+            scenario.week,
+            year,
+        )
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+from app.helper import league_cache
+from app.services.espn_client import rate_limiter
+from app.services.scheduler import scheduler
+from app.services.snapshots import list_snapshots
+
+router = APIRouter()
+
+@router.get("/cache/stats")
+def get_cache_stats():
+    """
+    Returns hit/miss/eviction counters for the shared league cache.
+    """
+    return {"league_cache": league_cache.stats()}
+
+@router.get("/snapshots/{league_id}")
+def get_snapshots(league_id: int, year: int = 2025):
+    """
+    Lists the raw ESPN payloads recorded for a league season.
+    """
+    return list_snapshots(league_id, year)
+
+@router.get("/scheduler")
+def get_scheduler_status():
+    """
+    Returns the refresh schedule for active leagues and the upstream rate limiter state.
+    """
+    return {"scheduler": scheduler.status(), "rate_limiter": rate_limiter.stats()}
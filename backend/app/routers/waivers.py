@@ -0,0 +1,33 @@
+from fastapi import APIRouter, HTTPException, Query
+from app.services.waivers import fetch_waiver_targets, fetch_all_waiver_targets
+
+router = APIRouter()
+
+@router.get("/league/{league_id}/team/{team_id}/waiver-targets")
+def get_waiver_targets(
+    league_id: int,
+    team_id: int,
+    limit: int = Query(10, ge=1, le=100, description="Number of targets to return"),
+    position: str = Query(None, description="Only these position(s), e.g., RB or RB,WR"),
+    year: int = 2025
+):
+    """
+    Free agents ranked by projected starting-lineup gain for a team, with value over
+    the league's replacement level and the team's weakest bench player to drop.
+    """
+    data = fetch_waiver_targets(league_id, team_id, limit=limit, position=position, year=year)
+    if data is None:
+        raise HTTPException(status_code=404, detail="Team not found")
+    return data
+
+@router.get("/league/{league_id}/waiver-targets")
+def get_all_waiver_targets(
+    league_id: int,
+    limit: int = Query(5, ge=1, le=50, description="Number of targets per team"),
+    position: str = Query(None, description="Only these position(s), e.g., RB or RB,WR"),
+    year: int = 2025
+):
+    """
+    Waiver targets for every team in the league, computed in one pass.
+    """
+    return fetch_all_waiver_targets(league_id, limit=limit, position=position, year=year)
@@ -0,0 +1,308 @@
+import json
+import logging
+import threading
+import time
+import weakref
+from bisect import bisect_right
+from pathlib import Path
+
+from app.config import (
+    ACTIVITY_LOG_DIR,
+    ACTIVITY_POLL_SECONDS,
+    ACTIVITY_PAGE_SIZE,
+    ACTIVITY_BACKFILL_MAX,
+    ACTIVITY_IDLE_SECONDS,
+)
+from app.helper import get_league
+from app.utils.metrics import traced
+
+logger = logging.getLogger(__name__)
+
+# Action -> the type filters it can be found under (ESPN's own FA/WAIVER/TRADED plus ADDED)
+TYPE_GROUPS = {
+    "FA ADDED": ("FA ADDED", "FA", "ADDED"),
+    "WAIVER ADDED": ("WAIVER ADDED", "WAIVER", "ADDED"),
+    "DROPPED": ("DROPPED",),
+    "TRADE_SENT": ("TRADE_SENT", "TRADED"),
+    "TRADE_RECEIVED": ("TRADE_RECEIVED", "TRADED"),
+    "TRADED": ("TRADED",),
+}
+
+
+def _action_row(team, action: str, player, bid_amount=0) -> dict:
+    return {
+        "team_name": getattr(team, "team_name", None),
+        "team_id": getattr(team, "team_id", None),
+        "action": action,
+        "player_name": getattr(player, "name", player if isinstance(player, str) else None),
+        "player_id": getattr(player, "playerId", player if isinstance(player, int) else None),
+        "bid_amount": bid_amount or 0,
+    }
+
+
+def serialize_actions(actions: list) -> list:
+    """
+    Flattens espn_api activity tuples: (team, action, player[, bid]) and the older
+    (team1, 'TRADED', player1, team2, player2) trade form.
+    """
+    rows = []
+    for action in actions:
+        if len(action) == 5:
+            team1, act_type, player1, team2, player2 = action
+            rows.append(_action_row(team1, act_type, player1))
+            rows.append(_action_row(team2, act_type, player2))
+        elif len(action) in (3, 4):
+            rows.append(_action_row(*action))
+        else:
+            # fallback for unexpected structure
+            rows.append({"raw_action": str(action)})
+    return rows
+
+
+def serialize_activity(activity) -> dict:
+    actions = serialize_actions(activity.actions)
+    date = getattr(activity, "date", None) or 0
+    kinds = [a.get("action") for a in actions]
+    return {
+        "date": date,
+        "timestamp": date,
+        "type": next((TYPE_GROUPS[k][-1] for k in kinds if k in TYPE_GROUPS), None),
+        "actions": actions,
+    }
+
+
+def entry_key(entry: dict) -> tuple:
+    """
+    Dedup key: the activity's timestamp plus every (team, action, player) in it.
+    """
+    return (entry["date"], tuple(
+        (a.get("team_id"), a.get("action"), a.get("player_id") or a.get("player_name") or a.get("raw_action"))
+        for a in entry["actions"]
+    ))
+
+
+class ActivityLog:
+    """
+    Append-only transaction log for one league season, persisted as NDJSON and
+    indexed by type, team and player. Entries are kept in date order.
+    """
+
+    def __init__(self, league_id: int, year: int, root: str = ACTIVITY_LOG_DIR):
+        self.league_id = league_id
+        self.year = year
+        self.path = Path(root) / str(league_id) / f"{year}.ndjson"
+        self.entries = []
+        self._seen = set()
+        self._by_type = {}
+        self._by_team = {}
+        self._by_player = {}
+        self._listeners = []
+        self._lock = threading.RLock()
+        self._poll_lock = threading.Lock()
+        self._poller = None
+        self.polled_at = None
+        self.queried_at = time.monotonic()
+        self._load()
+
+    @property
+    def latest_date(self) -> int:
+        return self.entries[-1]["date"] if self.entries else 0
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._index(json.loads(line))
+                    except ValueError:
+                        continue  # torn last line from a crash mid-append
+        except FileNotFoundError:
+            pass
+
+    def _index(self, entry: dict) -> bool:
+        key = entry_key(entry)
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        position = len(self.entries)
+        entry["id"] = position
+        self.entries.append(entry)
+
+        types, teams, players = set(), set(), set()
+        for action in entry["actions"]:
+            types.update(TYPE_GROUPS.get(action.get("action"), (action.get("action"),)))
+            teams.add(action.get("team_id"))
+            players.add(action.get("player_id"))
+        for index, values in ((self._by_type, types), (self._by_team, teams), (self._by_player, players)):
+            for value in values - {None}:
+                index.setdefault(value, []).append(position)
+        return True
+
+    def append(self, activities: list) -> list:
+        """
+        Appends activities (oldest first) that aren't already logged and returns the new ones.
+        """
+        new = []
+        with self._lock:
+            lines = []
+            for activity in activities:
+                entry = serialize_activity(activity)
+                if entry["date"] < self.latest_date:
+                    continue  # the log only grows forward in time
+                if self._index(entry):
+                    new.append(activity)
+                    lines.append(json.dumps(entry, separators=(",", ":"), default=str))
+            if lines:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+        return new
+
+    def add_listener(self, callback):
+        """
+        Calls callback(new_activities) after each poll that found something.
+        Bound methods are held weakly so a discarded owner stops listening.
+        """
+        ref = weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda: callback)
+        with self._lock:
+            self._listeners.append(ref)
+
+    def poll(self) -> list:
+        """
+        Pages through ESPN's recent activity until it reaches what is already logged
+        (or ACTIVITY_BACKFILL_MAX items on a fresh log) and appends the new items.
+        """
+        with self._poll_lock:
+            league = get_league(self.league_id, self.year)
+            latest = self.latest_date
+            batch, offset = [], 0
+            while offset < ACTIVITY_BACKFILL_MAX:
+                page = league.recent_activity(size=ACTIVITY_PAGE_SIZE, offset=offset)
+                batch.extend(page)
+                if len(page) < ACTIVITY_PAGE_SIZE or any((getattr(a, "date", 0) or 0) < latest for a in page):
+                    break
+                if latest and all(entry_key(serialize_activity(a)) in self._seen for a in page):
+                    break
+                offset += len(page)
+
+            batch.sort(key=lambda a: getattr(a, "date", 0) or 0)
+            new = self.append(batch)
+            self.polled_at = time.monotonic()
+
+        if new:
+            with self._lock:
+                listeners = [ref() for ref in self._listeners]
+                self._listeners = [ref for ref, fn in zip(self._listeners, listeners) if fn is not None]
+            for fn in listeners:
+                if fn is None:
+                    continue
+                try:
+                    fn(new)
+                except Exception as e:
+                    logger.warning("Activity listener failed for league %s: %s", self.league_id, e)
+        return new
+
+    def ensure_polling(self, wait: bool = True):
+        """
+        Marks the log as in use and starts its background poller if it isn't running.
+        With wait, a log that has never been polled is polled synchronously first.
+        """
+        self.queried_at = time.monotonic()
+        if wait and self.polled_at is None and not self.entries:
+            self.poll()
+
+        with self._lock:
+            if self._poller is not None and self._poller.is_alive():
+                return
+            self._poller = threading.Thread(target=self._run, name=f"activity-{self.league_id}-{self.year}", daemon=True)
+            self._poller.start()
+
+    def idle(self) -> bool:
+        """
+        True once nothing needs the log in memory: no poller, no live listeners and no recent queries.
+        """
+        with self._lock:
+            if self._poller is not None and self._poller.is_alive():
+                return False
+            if any(ref() is not None for ref in self._listeners):
+                return False
+        return time.monotonic() - self.queried_at >= ACTIVITY_IDLE_SECONDS
+
+    def _run(self):
+        while time.monotonic() - self.queried_at < ACTIVITY_IDLE_SECONDS:
+            if self.polled_at is None or time.monotonic() - self.polled_at >= ACTIVITY_POLL_SECONDS:
+                try:
+                    self.poll()
+                except Exception as e:
+                    logger.warning("Activity poll failed for league %s (%s): %s", self.league_id, self.year, e)
+                    self.polled_at = time.monotonic()
+            time.sleep(min(ACTIVITY_POLL_SECONDS, 5.0))
+
+    def query(self, msg_type: str = None, team_id: int = None, player_id: int = None, since: int = None, size: int = 25, offset: int = 0) -> list:
+        """
+        Newest-first page of entries matching every given filter. With a single filter
+        (or none) this only touches the entries it returns.
+        """
+        with self._lock:
+            candidates = [
+                index.get(value, [])
+                for index, value in ((self._by_type, msg_type.upper() if msg_type else None), (self._by_team, team_id), (self._by_player, player_id))
+                if value is not None
+            ]
+            positions = min(candidates, key=len) if candidates else range(len(self.entries))
+            others = [set(c) for c in candidates if c is not positions]
+
+            start = bisect_right(positions, since, key=lambda p: self.entries[p]["date"]) if since is not None else 0
+            page = []
+            skipped = 0
+            for i in range(len(positions) - 1, start - 1, -1):
+                position = positions[i]
+                if any(position not in other for other in others):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                page.append(self.entries[position])
+                if len(page) >= size:
+                    break
+            return page
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def get_activity_log(league_id: int, year: int = 2025) -> ActivityLog:
+    """
+    The league season's shared log. Idle logs are dropped when a new one is created;
+    they are on disk, so the next request just reloads them.
+    """
+    with _logs_lock:
+        log = _logs.get((league_id, year))
+        if log is None:
+            for key in [key for key, other in _logs.items() if other.idle()]:
+                del _logs[key]
+            log = ActivityLog(league_id, year)
+            _logs[(league_id, year)] = log
+        return log
+
+
+@traced()
+def fetch_recent_activity(
+    league_id: int,
+    size: int = 25,
+    msg_type: str = None,
+    team_id: int = None,
+    player_id: int = None,
+    since: int = None,
+    offset: int = 0,
+    year: int = 2025,
+) -> tuple:
+    """
+    Returns (recent activity newest first, latest logged timestamp) from the league's
+    activity log. Pass the timestamp back as `since` to get only newer items.
+    """
+    log = get_activity_log(league_id, year)
+    log.ensure_polling()
+    items = log.query(msg_type=msg_type, team_id=team_id, player_id=player_id, since=since, size=max(0, size), offset=max(0, offset))
+    return items, log.latest_date
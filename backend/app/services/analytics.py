@@ -0,0 +1,173 @@
+import threading
+import weakref
+
+import numpy as np
+
+from app.helper import get_league
+
+OUTCOME_CODES = {"W": 1, "L": -1, "T": 0}
+UNDECIDED = 2
+
+
+class SeasonArrays:
+    """
+    Columnar view of one league season: teams x weeks arrays of scores, margins,
+    outcomes and opponents, plus bulk-computed standings metrics.
+    Built once per League snapshot and shared by every analytics endpoint.
+    """
+
+    def __init__(self, league):
+        teams = list(league.teams)
+        self.teams = teams
+        self.team_ids = np.array([t.team_id for t in teams], dtype=np.int64)
+        self.team_names = [t.team_name for t in teams]
+        self.current_week = int(getattr(league, "current_week", 0) or 0)
+        self.reg_season_count = int(getattr(league.settings, "reg_season_count", 0) or 0)
+        self.playoff_team_count = int(getattr(league.settings, "playoff_team_count", 0) or 0)
+
+        n_weeks = max((len(getattr(t, "scores", []) or []) for t in teams), default=0)
+        position = {team_id: i for i, team_id in enumerate(self.team_ids.tolist())}
+
+        self.scores = np.zeros((len(teams), n_weeks))
+        self.mov = np.zeros((len(teams), n_weeks))
+        self.outcomes = np.full((len(teams), n_weeks), UNDECIDED, dtype=np.int8)
+        self.opponents = np.full((len(teams), n_weeks), -1, dtype=np.int64)
+
+        for i, team in enumerate(teams):
+            scores = getattr(team, "scores", []) or []
+            mov = getattr(team, "mov", []) or []
+            outcomes = getattr(team, "outcomes", []) or []
+            schedule = getattr(team, "schedule", []) or []
+            self.scores[i, :len(scores)] = scores
+            self.mov[i, :len(mov)] = mov
+            self.outcomes[i, :len(outcomes)] = [OUTCOME_CODES.get(o, UNDECIDED) for o in outcomes]
+            self.opponents[i, :len(schedule)] = [position.get(getattr(opp, "team_id", None), -1) for opp in schedule]
+
+        self.wins = np.array([t.wins for t in teams], dtype=np.int64)
+        self.losses = np.array([t.losses for t in teams], dtype=np.int64)
+        self.ties = np.array([getattr(t, "ties", 0) for t in teams], dtype=np.int64)
+        self.points_for = np.array([t.points_for for t in teams], dtype=np.float64)
+        self.points_against = np.array([getattr(t, "points_against", 0.0) for t in teams], dtype=np.float64)
+
+        self._power = {}
+        self._compute_season_metrics()
+
+    def _compute_season_metrics(self):
+        n_teams = len(self.teams)
+        decided = self.outcomes != UNDECIDED                   # (T, W)
+        played_weeks = decided.any(axis=0)                     # (W,)
+        scores = self.scores[:, played_weeks]                  # (T, Wp)
+
+        # All-play: every team's score against every other team's score, each played week
+        diff = scores[:, None, :] - scores[None, :, :]         # (T, T, Wp)
+        self.all_play_wins = (diff > 0).sum(axis=(1, 2))
+        self.all_play_losses = (diff < 0).sum(axis=(1, 2))
+        self.all_play_ties = (diff == 0).sum(axis=(1, 2)) - scores.shape[1]  # exclude self
+
+        opponents_per_week = max(n_teams - 1, 1)
+        self.expected_wins = self.all_play_wins / opponents_per_week
+        self.luck = (self.wins + 0.5 * self.ties) - (self.expected_wins + 0.5 * self.all_play_ties / opponents_per_week)
+
+        # Strength of schedule: average win percentage of the opponents actually faced
+        games = self.wins + self.losses + self.ties
+        win_pct = np.divide(self.wins + 0.5 * self.ties, games, out=np.zeros(n_teams), where=games > 0)
+        faced = decided & (self.opponents >= 0)
+        opponent_pct = np.where(faced, win_pct[np.clip(self.opponents, 0, None)], 0.0)
+        faced_count = faced.sum(axis=1)
+        self.win_pct = win_pct
+        self.sos = np.divide(opponent_pct.sum(axis=1), faced_count, out=np.zeros(n_teams), where=faced_count > 0)
+
+        # Points-for ordering (stable, so ties keep league order like sorted(reverse=True))
+        self.points_order = np.argsort(-self.points_for, kind="stable")
+        # Standings: win percentage, then points for
+        self.standings_order = np.lexsort((-self.points_for, -win_pct))
+
+    def power_scores(self, week: int = None) -> np.ndarray:
+        """
+        ESPN's two-step dominance power score per team, vectorized.
+        Matches espn_api's League.power_rankings formula.
+        """
+        if not week or week <= 0 or week > self.current_week:
+            week = self.current_week
+        week = max(week, 1)
+
+        cached = self._power.get(week)
+        if cached is not None:
+            return cached
+
+        n_teams = len(self.teams)
+        opponents = self.opponents[:, :week]
+        beat = (self.mov[:, :week] > 0) & (opponents >= 0)
+        rows = np.broadcast_to(np.arange(n_teams)[:, None], opponents.shape)
+
+        win_matrix = np.zeros((n_teams, n_teams))
+        np.add.at(win_matrix, (rows[beat], opponents[beat]), 1)
+        dominance = win_matrix @ win_matrix + win_matrix
+
+        # Round the summed points so float drift can't move trunc across an integer
+        avg_score = np.round(self.scores[:, :week].sum(axis=1), 2) / week
+        avg_mov = self.mov[:, :week].sum(axis=1) / week
+        power = dominance.sum(axis=1).astype(np.int64) * 0.8 + np.trunc(avg_score) * 0.15 + np.trunc(avg_mov) * 0.05
+        power = np.round(power, 2)
+        self._power[week] = power
+        return power
+
+    def power_order(self, week: int = None) -> tuple:
+        """
+        Returns (indices sorted by power score desc, power scores). Ties keep team_id order.
+        """
+        power = self.power_scores(week)
+        by_team_id = np.argsort(self.team_ids, kind="stable")
+        return by_team_id[np.argsort(-power[by_team_id], kind="stable")], power
+
+
+_arrays = weakref.WeakKeyDictionary()
+_arrays_lock = threading.Lock()
+
+
+def season_arrays(league) -> SeasonArrays:
+    """
+    Returns the SeasonArrays for a League object, building them once per snapshot.
+    """
+    with _arrays_lock:
+        arrays = _arrays.get(league)
+        if arrays is None:
+            arrays = SeasonArrays(league)
+            _arrays[league] = arrays
+        return arrays
+
+
+def get_season_arrays(league_id: int, year: int = 2025) -> SeasonArrays:
+    return season_arrays(get_league(league_id, year))
+
+
+def standings_table(arrays: SeasonArrays) -> list:
+    """
+    Standings with all-play record, luck index and strength of schedule for every team.
+    """
+    power_idx, power = arrays.power_order()
+    power_rank = np.empty(len(arrays.teams), dtype=np.int64)
+    power_rank[power_idx] = np.arange(1, len(arrays.teams) + 1)
+
+    rows = []
+    for rank, i in enumerate(arrays.standings_order.tolist(), start=1):
+        rows.append({
+            "rank": rank,
+            "team_id": int(arrays.team_ids[i]),
+            "team_name": arrays.team_names[i],
+            "wins": int(arrays.wins[i]),
+            "losses": int(arrays.losses[i]),
+            "ties": int(arrays.ties[i]),
+            "win_pct": round(float(arrays.win_pct[i]), 4),
+            "points_for": float(arrays.points_for[i]),
+            "points_against": float(arrays.points_against[i]),
+            "all_play_wins": int(arrays.all_play_wins[i]),
+            "all_play_losses": int(arrays.all_play_losses[i]),
+            "all_play_ties": int(arrays.all_play_ties[i]),
+            "expected_wins": round(float(arrays.expected_wins[i]), 3),
+            "luck": round(float(arrays.luck[i]), 3),
+            "strength_of_schedule": round(float(arrays.sos[i]), 4),
+            "power_score": float(power[i]),
+            "power_rank": int(power_rank[i]),
+        })
+    return rows
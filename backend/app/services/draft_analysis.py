@@ -0,0 +1,349 @@
+import json
+import logging
+import threading
+import weakref
+
+import numpy as np
+
+from app.config import CURRENT_SEASON
+from app.helper import get_league
+from app.models.records import league_records
+from app.services.espn_service import fetch_box_scores, iter_weeks
+from app.services.warehouse import get_warehouse, season_player_points, lookup
+from app.utils.metrics import traced
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored analysis layout changes
+ANALYSIS_VERSION = 2
+
+# Box scores (which season points are scored from) only exist from 2019 on
+FIRST_BOX_SCORE_YEAR = 2019
+# Starters per team when league settings aren't available (seasons ingested without them)
+DEFAULT_STARTERS = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "K": 1, "D/ST": 1}
+# How flex slots are usually filled, for turning slot counts into per-position starters
+FLEX_SHARES = {
+    "RB/WR/TE": {"RB": 0.4, "WR": 0.5, "TE": 0.1},
+    "RB/WR": {"RB": 0.5, "WR": 0.5},
+    "WR/TE": {"WR": 0.7, "TE": 0.3},
+    "OP": {"QB": 0.8, "RB": 0.1, "WR": 0.1},
+}
+
+
+def starters_per_position(position_slot_counts: dict) -> dict:
+    """
+    Expected starters per team at each position, splitting flex slots by FLEX_SHARES.
+    """
+    if not position_slot_counts:
+        return dict(DEFAULT_STARTERS)
+    starters = {}
+    for slot, count in position_slot_counts.items():
+        if not count:
+            continue
+        for position, share in FLEX_SHARES.get(slot, {slot: 1.0}).items():
+            starters[position] = starters.get(position, 0.0) + share * count
+    return starters
+
+
+def replacement_levels(positions: np.ndarray, points: np.ndarray, team_count: int, starters: dict) -> dict:
+    """
+    Replacement points per position: what the (team_count * starters)-th best drafted
+    player at that position scored, or the worst one if fewer were drafted.
+    """
+    levels = {}
+    for position in np.unique(positions).tolist():
+        scored = np.sort(points[positions == position])[::-1]
+        rank = int(round(team_count * starters.get(position, 1)))
+        levels[position] = float(scored[min(max(rank, 1), len(scored)) - 1]) if len(scored) else 0.0
+    return levels
+
+
+def fit_pick_curve(overall: np.ndarray, vor: np.ndarray) -> dict:
+    """
+    Least-squares fit of value over replacement against log(pick): vor ~ a + b*ln(pick).
+    """
+    if len(overall) < 2:
+        return {"intercept": float(vor.mean()) if len(vor) else 0.0, "slope": 0.0, "picks": int(len(overall))}
+    slope, intercept = np.polyfit(np.log(overall), vor, 1)
+    return {"intercept": round(float(intercept), 4), "slope": round(float(slope), 4), "picks": int(len(overall))}
+
+
+def curve_value(curve: dict, overall) -> np.ndarray:
+    return curve["intercept"] + curve["slope"] * np.log(np.asarray(overall, dtype=np.float64))
+
+
+class DraftAnalysis:
+    """
+    Value over replacement and surplus vs. the pick-value curve for every pick of one
+    draft, with per-team and per-round rollups and team/player indexes.
+    """
+
+    def __init__(self, year: int, picks: list, team_names: dict, starters: dict, curve: dict = None):
+        self.year = year
+        self.team_names = team_names
+        self.starters = starters
+        n = len(picks)
+        overall = np.array([p["overall"] for p in picks], dtype=np.float64)
+        points = np.array([p["season_points"] for p in picks], dtype=np.float64)
+        positions = np.array([p["position"] or "" for p in picks], dtype=object)
+
+        levels = replacement_levels(positions, points, max(len(team_names), 1), starters)
+        replacement = np.array([levels.get(p, 0.0) for p in positions.tolist()])
+        vor = points - replacement
+        self.curve = curve or fit_pick_curve(overall, vor)
+        expected = curve_value(self.curve, overall) if n else np.zeros(0)
+        surplus = vor - expected
+
+        self.replacement = {k: round(v, 2) for k, v in levels.items()}
+        self.picks = []
+        for i, pick in enumerate(picks):
+            self.picks.append({
+                **pick,
+                "team_name": team_names.get(pick["team_id"]),
+                "season_points": round(float(points[i]), 2),
+                "vor": round(float(vor[i]), 2),
+                "expected_vor": round(float(expected[i]), 2),
+                "surplus": round(float(surplus[i]), 2),
+            })
+        self.by_team = {}
+        self.by_player = {}
+        for i, pick in enumerate(self.picks):
+            self.by_team.setdefault(pick["team_id"], []).append(i)
+            self.by_player[pick["player_id"]] = i
+
+        self.teams = self._rollup("team_id", vor, surplus)
+        self.rounds = self._rollup("round", vor, surplus)
+        self._grade_teams()
+
+    def _rollup(self, field: str, vor: np.ndarray, surplus: np.ndarray) -> list:
+        groups = {}
+        for i, pick in enumerate(self.picks):
+            groups.setdefault(pick[field], []).append(i)
+        rows = []
+        for key, idx in sorted(groups.items()):
+            rows.append({
+                field: key,
+                "picks": len(idx),
+                "total_vor": round(float(vor[idx].sum()), 2),
+                "avg_vor": round(float(vor[idx].mean()), 2),
+                "total_surplus": round(float(surplus[idx].sum()), 2),
+                "hit_rate": round(float((vor[idx] > 0).mean()), 4),
+            })
+        return rows
+
+    def _grade_teams(self):
+        """
+        Letter grades from each team's total surplus, as a z-score within the draft.
+        """
+        totals = np.array([t["total_surplus"] for t in self.teams])
+        spread = totals.std() or 1.0
+        for team, z in zip(self.teams, (totals - totals.mean()) / spread):
+            team["team_name"] = self.team_names.get(team["team_id"])
+            team["grade"] = "A" if z >= 1 else "B" if z >= 0.33 else "C" if z > -0.33 else "D" if z > -1 else "F"
+        self.teams.sort(key=lambda t: t["total_surplus"], reverse=True)
+
+    def summary(self) -> dict:
+        return {
+            "year": self.year,
+            "curve": self.curve,
+            "replacement_points": self.replacement,
+            "teams": self.teams,
+            "rounds": self.rounds,
+            "best_picks": sorted(self.picks, key=lambda p: p["surplus"], reverse=True)[:10],
+            "worst_picks": sorted(self.picks, key=lambda p: p["surplus"])[:10],
+        }
+
+    def team(self, team_id: int) -> dict:
+        idx = self.by_team.get(team_id)
+        if idx is None:
+            return None
+        rollup = next(t for t in self.teams if t["team_id"] == team_id)
+        return {"year": self.year, **rollup, "picks": [self.picks[i] for i in idx]}
+
+    def player(self, player_id: int) -> dict:
+        i = self.by_player.get(player_id)
+        return {"year": self.year, **self.picks[i]} if i is not None else None
+
+    def to_json(self) -> dict:
+        return {
+            "version": ANALYSIS_VERSION, "year": self.year, "picks": self.picks,
+            "team_names": self.team_names, "starters": self.starters, "curve": self.curve,
+        }
+
+
+def _live_season_points(league_id: int, year: int, league) -> tuple:
+    """
+    ({player_id: fantasy points}, {player_id: position}) from the league's box scores
+    so far: the same "points scored while rostered" the warehouse derives for past
+    seasons, so pick values compare across years. Finished weeks come from final_week_cache.
+    """
+    points, positions = {}, {}
+    if year < FIRST_BOX_SCORE_YEAR:
+        return points, positions
+    weeks = list(range(1, int(getattr(league, "current_week", 0) or 0) + 1))
+    for item in iter_weeks(league_id, weeks, fetch_box_scores, year):
+        if "error" in item:
+            logger.warning("Skipping box scores for league %s (%s) week %s: %s", league_id, year, item["week"], item["error"])
+            continue
+        for box in item["data"]:
+            for player in box["home_lineup"] + box["away_lineup"]:
+                points[player["player_id"]] = points.get(player["player_id"], 0.0) + (player["points"] or 0.0)
+                positions.setdefault(player["player_id"], player["position"])
+    return points, positions
+
+
+def _league_inputs(league_id: int, year: int, league) -> tuple:
+    """
+    Picks with season points from a live League, scored from its box scores. Positions
+    come from the league records or lineups, plus one batched player_info call for
+    drafted players never seen in either.
+    """
+    records = league_records(league)
+    players = records.players
+    season_points, positions = _live_season_points(league_id, year, league)
+    missing = [
+        p.player_id for p in records.draft
+        if p.player_id is not None and p.player_id not in players and p.player_id not in positions
+    ]
+    if missing:
+        try:
+            found = league.player_info(playerId=missing)
+            for player in (found if isinstance(found, list) else [found] if found else []):
+                positions[player.playerId] = getattr(player, "position", None)
+        except Exception as e:
+            logger.warning("Could not load %s undrafted-roster players: %s", len(missing), e)
+
+    picks = []
+    for overall, pick in enumerate(records.draft, start=1):
+        record = players.get(pick.player_id)
+        picks.append({
+            "overall": overall,
+            "round": pick.round,
+            "round_pick": pick.round_pick,
+            "team_id": pick.team_id,
+            "player_id": pick.player_id,
+            "player_name": pick.player_name,
+            "position": record.position if record else positions.get(pick.player_id),
+            "season_points": season_points.get(pick.player_id, 0.0),
+        })
+    team_names = {team_id: team.team_name for team_id, team in records.teams.items()}
+    starters = starters_per_position(getattr(league.settings, "position_slot_counts", {}))
+    return picks, team_names, starters
+
+
+def _warehouse_inputs(season) -> tuple:
+    draft = season.table("draft")
+    player_ids, points = season_player_points(season)
+    pick_points = lookup(player_ids, points, draft["player_id"])
+    picks = []
+    for i in range(len(draft["overall"])):
+        name, position = season.player(int(draft["player_id"][i]))
+        picks.append({
+            "overall": int(draft["overall"][i]),
+            "round": int(draft["round"][i]),
+            "round_pick": int(draft["round_pick"][i]),
+            "team_id": int(draft["team_id"][i]),
+            "player_id": int(draft["player_id"][i]),
+            "player_name": name,
+            "position": position,
+            "season_points": float(pick_points[i]),
+        })
+    team_names = {int(k): v for k, v in season.meta.get("teams", {}).items()}
+    # The league's own lineup, so replacement levels match the live season's
+    return picks, team_names, starters_per_position(season.meta.get("position_slot_counts"))
+
+
+_live = weakref.WeakKeyDictionary()
+_stored = {}
+_lock = threading.Lock()
+
+
+def analyze_season(league_id: int, year: int = 2025) -> DraftAnalysis:
+    """
+    Draft analysis for one season. Warehouse seasons are computed once and stored next
+    to the season's columns; other seasons are computed once per cached League object.
+    """
+    season = get_warehouse(league_id).seasons.get(year)
+    if season is not None and year < CURRENT_SEASON:
+        key = (league_id, year, season.meta.get("ingested_at"))
+        with _lock:
+            analysis = _stored.get(key)
+        if analysis is not None:
+            return analysis
+
+        path = season.path / "draft_analysis.json"
+        try:
+            stored = json.loads(path.read_text())
+            if stored.get("version") != ANALYSIS_VERSION:
+                raise ValueError("stale analysis")
+            team_names = {int(k): v for k, v in stored["team_names"].items()}
+            base = [{k: p[k] for k in ("overall", "round", "round_pick", "team_id", "player_id", "player_name", "position", "season_points")} for p in stored["picks"]]
+            analysis = DraftAnalysis(year, base, team_names, stored["starters"], stored["curve"])
+        except (OSError, ValueError, KeyError):
+            analysis = DraftAnalysis(year, *_warehouse_inputs(season))
+            path.write_text(json.dumps(analysis.to_json(), separators=(",", ":")))
+        with _lock:
+            _stored[key] = analysis
+        return analysis
+
+    league = get_league(league_id, year)
+    with _lock:
+        analysis = _live.get(league)
+    if analysis is None:
+        analysis = DraftAnalysis(year, *_league_inputs(league_id, year, league))
+        with _lock:
+            _live[league] = analysis
+    return analysis
+
+
+@traced()
+def fetch_draft_analysis(league_id: int, year: int = 2025) -> dict:
+    return analyze_season(league_id, year).summary()
+
+
+@traced()
+def fetch_team_draft(league_id: int, team_id: int, year: int = 2025) -> dict:
+    return analyze_season(league_id, year).team(team_id)
+
+
+@traced()
+def fetch_player_draft(league_id: int, player_id: int, year: int = None) -> list:
+    """
+    Where and by whom a player was drafted, and how it paid off, in one season or
+    every season available.
+    """
+    years = [year] if year is not None else sorted(set(get_warehouse(league_id).years()) | {CURRENT_SEASON})
+    results = []
+    for season_year in years:
+        try:
+            pick = analyze_season(league_id, season_year).player(player_id)
+        except Exception as e:
+            logger.warning("Draft analysis unavailable for league %s (%s): %s", league_id, season_year, e)
+            continue
+        if pick is not None:
+            results.append(pick)
+    return results
+
+
+@traced()
+def fetch_pick_value_curve(league_id: int) -> dict:
+    """
+    One pick-value curve fitted across every historical season in the warehouse, plus
+    the per-season curves and the expected value of each of the first 200 picks.
+    """
+    overall, vor, seasons = [], [], []
+    for year in get_warehouse(league_id).years():
+        if year >= CURRENT_SEASON:
+            continue
+        analysis = analyze_season(league_id, year)
+        overall.extend(p["overall"] for p in analysis.picks)
+        vor.extend(p["vor"] for p in analysis.picks)
+        seasons.append({"year": year, "curve": analysis.curve})
+
+    curve = fit_pick_curve(np.array(overall, dtype=np.float64), np.array(vor, dtype=np.float64))
+    picks = np.arange(1, min(max(overall, default=0), 200) + 1)
+    return {
+        "curve": curve,
+        "seasons": seasons,
+        "expected_vor": [{"overall": int(p), "vor": round(float(v), 2)} for p, v in zip(picks, curve_value(curve, picks))],
+    }
@@ -0,0 +1,166 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import httpx
+from app.config import (
+    ESPN_MAX_CONNECTIONS,
+    ESPN_MAX_PER_HOST,
+    ESPN_TIMEOUT,
+    ESPN_RETRIES,
+    ESPN_BACKOFF_BASE,
+    ESPN_BACKOFF_MAX,
+    ESPN_SYNC_WORKERS,
+    ESPN_RATE_LIMIT,
+    ESPN_RATE_BURST,
+)
+from app.utils.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# One budget for every upstream call, whichever path or league it comes from
+rate_limiter = TokenBucket(ESPN_RATE_LIMIT, ESPN_RATE_BURST)
+
+
+class EspnClient:
+    """
+    Pooled asyncio HTTP/1.1 client for ESPN.
+
+    The client runs on its own event loop thread, so async handlers can await it
+    and espn_api's synchronous code (running in worker threads) can share the
+    same keep-alive connection pool through get_sync().
+    """
+
+    def __init__(
+        self,
+        max_connections: int = ESPN_MAX_CONNECTIONS,
+        max_per_host: int = ESPN_MAX_PER_HOST,
+        timeout: float = ESPN_TIMEOUT,
+        retries: int = ESPN_RETRIES,
+        backoff_base: float = ESPN_BACKOFF_BASE,
+        backoff_max: float = ESPN_BACKOFF_MAX,
+    ):
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._loop = None
+        self._thread = None
+        self._client = None
+        self._semaphores = {}
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._loop is not None:
+            return
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="espn-client", daemon=True)
+            thread.start()
+            asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+            self._thread = thread
+            self._loop = loop
+
+    async def _open(self):
+        self._client = httpx.AsyncClient(
+            http2=False,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            timeout=httpx.Timeout(self.timeout),
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": spread retries so workers don't hammer ESPN in lockstep
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    async def _request(self, url: str, params: dict = None, headers: dict = None, cookies: dict = None) -> httpx.Response:
+        host = urlsplit(url).netloc
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self.max_per_host)
+
+        headers = dict(headers or {})
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{name}={value}" for name, value in cookies.items())
+
+        for attempt in range(self.retries + 1):
+            try:
+                await rate_limiter.aacquire()
+                async with semaphore:
+                    response = await self._client.get(url, params=params, headers=headers)
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                if response.status_code == 429:
+                    # Throttled: hold back every caller, not just this retry
+                    rate_limiter.pause(self._backoff(attempt + 1))
+                logger.info("ESPN returned %s for %s, retrying", response.status_code, url)
+            except httpx.TransportError as e:
+                if attempt == self.retries:
+                    raise
+                logger.info("ESPN request to %s failed (%s), retrying", url, e)
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def get(self, url: str, params: dict = None, headers: dict = None, cookies: dict = None) -> httpx.Response:
+        """
+        Awaitable GET usable from any event loop.
+        """
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._request(url, params, headers, cookies), self._loop)
+        return await asyncio.wrap_future(future)
+
+    def get_sync(self, url: str, params: dict = None, headers: dict = None, cookies: dict = None) -> httpx.Response:
+        """
+        Blocking GET for synchronous callers; must not be called from an event loop thread.
+        """
+        self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(self._request(url, params, headers, cookies), self._loop)
+        return future.result()
+
+    def close(self):
+        """
+        Closes pooled connections and stops the client loop.
+        """
+        with self._start_lock:
+            loop, self._loop = self._loop, None
+            if loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=5)
+            self._client = None
+            self._semaphores = {}
+
+
+espn_client = EspnClient()
+
+# Bounded pool for espn_api calls that are still synchronous
+_sync_executor = ThreadPoolExecutor(max_workers=ESPN_SYNC_WORKERS, thread_name_prefix="espn-sync")
+
+
+async def run_blocking(fn, *args, **kwargs):
+    """
+    Runs a blocking function in the bounded ESPN thread pool without blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    # Carry context variables (e.g. the request's profile) into the worker thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(_sync_executor, context.run, functools.partial(fn, *args, **kwargs))
+
+
+def shutdown():
+    espn_client.close()
+    _sync_executor.shutdown(wait=False)
@@ -1,133 +1,115 @@
-from espn_api.football import League
-from app.config import ESPNS2, SWID
-from app.helper import get_league
-
+from concurrent.futures import ThreadPoolExecutor
+from app.config import CURRENT_SEASON, LEAGUE_CACHE_TTL, FINAL_WEEK_CACHE_MAX_ENTRIES, WEEK_FETCH_WORKERS
+from app.helper import get_league, is_league_warm
+from app.models.records import MatchupRecord, PlayerRecord, league_records
+from app.services.analytics import get_season_arrays, standings_table
+from app.services.snapshots import afetch_league_get
+from app.utils.cache import TTLCache
+from app.utils.metrics import traced
+from app.utils.responses import CachedPayload, snapshot_payload
+
+# Raw single-team view payloads, for lookups that don't need a full League
+team_view_cache = TTLCache(default_ttl=LEAGUE_CACHE_TTL, max_entries=256)
+
+# Serialized scoreboards/box scores for finished weeks; their scores never change
+final_week_cache = TTLCache(default_ttl=float("inf"), max_entries=FINAL_WEEK_CACHE_MAX_ENTRIES)
+
+# Shared, bounded pool for multi-week fetches
+_week_executor = ThreadPoolExecutor(max_workers=WEEK_FETCH_WORKERS, thread_name_prefix="week-fetch")
+MAX_WEEKS_PER_REQUEST = 25
+
+@traced()
 def fetch_league_teams_detailed(league_id: int, year: int = 2025):
     """
     Fetches teams with basic info and roster
     """
-    league = get_league(league_id, year)
+    return [team.summary() for team in league_records(get_league(league_id, year)).teams.values()]
 
-    teams_data = []
-    for team in league.teams:
-        team_info = {
-            "team_name": team.team_name,
-            "team_id": team.team_id,
-            "wins": team.wins,
-            "losses": team.losses,
-            "final_standing": team.final_standing,
-            "roster": [player.name for player in team.roster],  # just names
-        }
-        teams_data.append(team_info)
+def get_team_record(league_id: int, team_id: int, year: int = 2025):
+    """
+    Returns the TeamRecord for one team of the cached league, or None if it doesn't exist.
+    """
+    return league_records(get_league(league_id, year)).teams.get(team_id)
 
-    return teams_data
+def _team_summary_from_raw(team: dict):
+    """
+    Same shape as TeamRecord.summary, built from a raw mTeam + mRoster payload.
+    """
+    name = team.get("name") or f"{team.get('location', '')} {team.get('nickname', '')}".strip()
+    record = team.get("record", {}).get("overall", {})
+    entries = team.get("roster", {}).get("entries", [])
+    return {
+        "team_name": name,
+        "team_id": team["id"],
+        "wins": record.get("wins", 0),
+        "losses": record.get("losses", 0),
+        "final_standing": team.get("rankFinal") or team.get("rankCalculatedFinal", 0),
+        "roster": [entry["playerPoolEntry"]["player"]["fullName"] for entry in entries],
+    }
+
+@traced()
+def fetch_team_by_id(league_id: int, team_id: int, year: int = 2025):
+    """
+    Returns basic info for one team via the cached league's team index.
+    """
+    team = get_team_record(league_id, team_id, year)
+    return team.summary() if team else None
+
+@traced()
+async def afetch_team_by_id(league_id: int, team_id: int, year: int = 2025):
+    """
+    Returns basic info for one team. Warm leagues answer from the team index;
+    cold ones make a single mTeam + mRoster request scoped to that team
+    instead of hydrating the whole league.
+    """
+    if is_league_warm(league_id, year):
+        return fetch_team_by_id(league_id, team_id, year)
+
+    key = (league_id, year, team_id)
+    summary = team_view_cache.get(key)
+    if summary is None:
+        data = await afetch_league_views(league_id, ["mTeam", "mRoster"], year, params={"rosterForTeamId": team_id})
+        team = next((t for t in data.get("teams", []) if t.get("id") == team_id), None)
+        if team is None:
+            return None
+        summary = _team_summary_from_raw(team)
+        team_view_cache.set(key, summary)
+    return summary
+
+@traced()
+async def afetch_league_views(league_id: int, views: list, year: int = 2025, params: dict = None):
+    """
+    Awaits the raw ESPN JSON for only the requested views (e.g. ["mTeam", "mRoster"]).
+    """
+    query = {"view": list(views)}
+    query.update(params or {})
+    return await afetch_league_get(league_id, year, params=query)
 
+@traced()
 def fetch_players_by_team(league_id: int, team_id: int, year: int = 2025):
     """
     Returns detailed player info for a specific team in a league.
     """
-    league = get_league(league_id, year)
-
-    # Find the team by ID
-    team = next((t for t in league.teams if t.team_id == team_id), None)
+    team = get_team_record(league_id, team_id, year)
     if not team:
         return []  # or raise HTTPException in router
+    return team.players()
 
-    players_data = []
-    for player in team.roster:
-        player_info = {
-            "player_id": player.playerId,
-            "name": player.name,
-            "position": player.position,
-            "pos_rank": player.posRank,
-            "pro_team": player.proTeam,
-            "eligible_slots": player.eligibleSlots,
-            "acquisition_type": player.acquisitionType,
-            "team_id": team.team_id,
-            "team_name": team.team_name
-        }
-        players_data.append(player_info)
-
-    return players_data
-
-def fetch_free_agents(league_id: int, size: int = 20, position: str = None, year: int = 2025):
+def serialize_free_agent(player):
     """
-    Returns free agents for a league optionally filtered by position and limited by size.
-    Includes projected points, stats, and additional player metadata.
+    Full free agent record: projected points, stats, and additional player metadata.
     """
-    league = get_league(league_id, year)
-
-    # Fetch free agents
-    if position:
-        agents = league.free_agents(size=size, position=position)
-    else:
-        agents = league.free_agents(size=size)
-
-    free_agents_data = []
-    for player in agents:
-        # Extract stats safely
-        stats = getattr(player, "stats", {}) or {}
-
-        # Most recent / season-level stats (espn-python uses 0 for season totals, 3 for current week projections)
-        season_stats = stats.get(0, {})
-        week_projection = stats.get(3, {})
-
-        player_info = {
-            "player_id": player.playerId,
-            "name": player.name,
-            "position": player.position,
-            "pos_rank": player.posRank,
-            "pro_team": player.proTeam,
-            "eligible_slots": player.eligibleSlots,
-            "acquisition_type": player.acquisitionType,
-            "injury_status": getattr(player, "injuryStatus", None),
-            "active_status": getattr(player, "active_status", None),
-            "percent_owned": getattr(player, "percent_owned", None),
-            "percent_started": getattr(player, "percent_started", None),
-            "total_points": season_stats.get("points", 0),
-            "avg_points": season_stats.get("avg_points", 0),
-            "projected_total_points": season_stats.get("projected_points", 0),
-            "projected_avg_points": season_stats.get("projected_avg_points", 0),
-            "stats": {
-                "season": {
-                    "points": season_stats.get("points", 0),
-                    "breakdown": season_stats.get("breakdown", {}),
-                    "projected_points": season_stats.get("projected_points", 0),
-                    "projected_breakdown": season_stats.get("projected_breakdown", {}),
-                },
-                "week_projection": {
-                    "projected_points": week_projection.get("projected_points", 0),
-                    "projected_breakdown": week_projection.get("projected_breakdown", {}),
-                },
-            },
-            "opponent": getattr(player, "pro_opponent", None),
-            "game_date": getattr(player, "game_date", None),
-            "on_bye_week": getattr(player, "on_bye_week", False),
-        }
-
-        free_agents_data.append(player_info)
-
-    return free_agents_data
+    return PlayerRecord.from_player(player).free_agent()
 
 
+@traced()
 def fetch_draft(league_id: int, year: int = 2025):
     """
     Returns draft picks for the league.
     """
-    league = get_league(league_id, year)
-
-    draft_data = []
-    for pick in league.draft:
-        draft_data.append({
-            "player_name": pick.playerName,
-            "round": pick.round_num,
-            "round_pick": pick.round_pick,
-            "team_name": pick.team.team_name,
-            "team_id": pick.team.team_id
-        })
-    
-    return draft_data
+    return [pick.to_dict() for pick in league_records(get_league(league_id, year)).draft]
 
+@traced()
 def fetch_league_settings(league_id: int, year: int = 2025):
     """
     Returns league settings like number of teams, season length, veto votes,
@@ -162,150 +144,126 @@ def fetch_league_settings(league_id: int, year: int = 2025):
     }
 
 
+@traced()
 def fetch_power_rankings(league_id: int, week: int, year: int = 2025):
     """
     Returns power rankings for a league for a given week.
     """
-    league = get_league(league_id, year)
-    rankings = league.power_rankings(week=week)
+    arrays = get_season_arrays(league_id, year)
+    order, power = arrays.power_order(week)
 
     rankings_data = []
-    for score, team in rankings:
+    for i in order.tolist():
         rankings_data.append({
-            "team_name": team.team_name,
-            "team_id": team.team_id,
-            "score": float(score)
+            "team_name": arrays.team_names[i],
+            "team_id": int(arrays.team_ids[i]),
+            "score": float(power[i])
         })
     
     return rankings_data
 
+def is_week_final(league, week: int, year: int = 2025) -> bool:
+    """
+    A week's scores are final once the league has moved past it (or the season is over).
+    """
+    return year < CURRENT_SEASON or week < league.current_week
+
+def _fetch_week(league_id: int, week: int, year: int, kind: str, build):
+    """
+    Builds one week of data, keeping finished weeks in final_week_cache forever.
+    """
+    league = get_league(league_id, year)
+    if not is_week_final(league, week, year):
+        return build(league)
+    return final_week_cache.get_or_load((kind, league_id, year, week), lambda: build(league))
+
+def serialize_scoreboard(matchups):
+    return [MatchupRecord.from_matchup(matchup).scoreboard() for matchup in matchups]
+
+def serialize_box_scores(box_scores):
+    return [MatchupRecord.from_matchup(matchup, lineups=True).box_score() for matchup in box_scores]
+
+@traced()
 def fetch_scoreboard(league_id: int, week: int, year: int = 2025):
     """
     Returns matchups for a given week with socres
     """
-    league = get_league(league_id, year)
-    matchups = league.scoreboard(week)
-
-    data = []
-    for matchup in matchups:
-        data.append({
-            "home_team": matchup.home_team.team_name,
-            "home_team_id": matchup.home_team.team_id,
-            "home_score": matchup.home_score,
-            "away_team": matchup.away_team.team_name,
-            "away_team_id": matchup.away_team.team_id,
-            "away_score": matchup.away_score
-        })
-    return data
+    return _fetch_week(league_id, week, year, "scoreboard", lambda league: serialize_scoreboard(league.scoreboard(week)))
 
 
+@traced()
 def fetch_box_scores(league_id: int, week: int, year: int = 2025):
     """
     Returns detailed box scores for a given week, including player stats.
     """
-    league = get_league(league_id, year)
-    box_scores = league.box_scores(week)
-    
-    data = []
-    for matchup in box_scores:
-        def serialize_lineup(lineup):
-            return [
-                {
-                    "name": player.name,
-                    "position": player.position,
-                    "slot_position": player.slot_position,
-                    "points": player.points,
-                    "projected_points": player.projected_points,
-                    "pro_opponent": player.pro_opponent,
-                    "pro_pos_rank": player.pro_pos_rank
-                }
-                for player in lineup
-            ]
-        
-        data.append({
-            "home_team": matchup.home_team.team_name,
-            "home_team_id": matchup.home_team.team_id,
-            "home_score": matchup.home_score,
-            "home_lineup": serialize_lineup(matchup.home_lineup),
-            "away_team": matchup.away_team.team_name,
-            "away_team_id": matchup.away_team.team_id,
-            "away_score": matchup.away_score,
-            "away_lineup": serialize_lineup(matchup.away_lineup)
-        })
-    
-    return data
+    return _fetch_week(league_id, week, year, "box_scores", lambda league: serialize_box_scores(league.box_scores(week)))
 
-def fetch_recent_activity(league_id: int, size: int = 25, msg_type: str = None, year: int = 2025):
+def parse_weeks(spec: str) -> list:
     """
-    Returns recent activity for a league, optionally filtered by message type.
+    Parses a week selection like "1-14", "3" or "1,3,5-7" into a sorted list of weeks.
     """
-    league = get_league(league_id, year)
-    
-    activity_list = league.recent_activity(msg_type=msg_type) if msg_type else league.recent_activity()
-    activity_list = activity_list[:size]
-
-    serialized_activity = []
-
-    for activity in activity_list:
-        actions_data = []
-
-        for action in activity.actions:
-            if len(action) == 3:
-                team, act_type, player_name = action
-                actions_data.append({
-                    "team_name": team.team_name,
-                    "team_id": team.team_id,
-                    "action": act_type,
-                    "player_name": player_name
-                })
-            elif len(action) == 5:
-                # TRADED: (team1, 'TRADED', player1, team2, player2)
-                team1, act_type, player1, team2, player2 = action
-                actions_data.append({
-                    "team_name": team1.team_name,
-                    "team_id": team1.team_id,
-                    "action": act_type,
-                    "player_name": player1
-                })
-                actions_data.append({
-                    "team_name": team2.team_name,
-                    "team_id": team2.team_id,
-                    "action": act_type,
-                    "player_name": player2
-                })
-            else:
-                # fallback for unexpected structure
-                actions_data.append({"raw_action": str(action)})
-
-        serialized_activity.append({
-            "timestamp": getattr(activity, "timestamp", None),
-            "type": getattr(activity, "type", None),
-            "actions": actions_data
-        })
-
-    return serialized_activity
-
+    weeks = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(x) for x in part.split("-", 1))
+        else:
+            start = end = int(part)
+        if start > end or start < 1:
+            raise ValueError(f"Invalid week range: {part}")
+        # Check sizes before expanding, so a huge range is rejected without being built
+        if end - start + 1 > MAX_WEEKS_PER_REQUEST:
+            raise ValueError(f"At most {MAX_WEEKS_PER_REQUEST} weeks per request")
+        weeks.update(range(start, end + 1))
+        if len(weeks) > MAX_WEEKS_PER_REQUEST:
+            raise ValueError(f"At most {MAX_WEEKS_PER_REQUEST} weeks per request")
+    if not weeks:
+        raise ValueError(f"Invalid weeks: {spec}")
+    return sorted(weeks)
+
+def iter_weeks(league_id: int, weeks: list, fetch, year: int = 2025):
+    """
+    Fetches weeks concurrently on the bounded week pool and yields
+    {"week", "data"} (or {"week", "error"}) in week order as each becomes ready.
+    """
+    # Hydrate once up front so the workers share a warm league
+    get_league(league_id, year)
+    futures = [(week, _week_executor.submit(fetch, league_id, week, year)) for week in weeks]
+    try:
+        for week, future in futures:
+            try:
+                yield {"week": week, "data": future.result()}
+            except Exception as e:
+                yield {"week": week, "error": str(e)}
+    finally:
+        for _, future in futures:
+            future.cancel()
+
+@traced()
 def fetch_top_scorer(league_id: int, year: int = 2025):
     """
     Returns the team with the highest total points in the league.
     """
-    league = get_league(league_id, year)
+    arrays = get_season_arrays(league_id, year)
 
     # Find the team with the maximum points
-    top_team = max(league.teams, key=lambda t: t.points_for)
+    top_team = arrays.teams[int(arrays.points_for.argmax())]
     
     return {
         "team_name": top_team.team_name,
         "points": top_team.points_for
     }
 
+@traced()
 def fetch_lowest_scorer(league_id: int, year: int = 2025):
     """
     Returns the team with the lowest total points in the league.
     """
-    league = get_league(league_id, year)
+    arrays = get_season_arrays(league_id, year)
     
-    lowest_team = min(league.teams, key=lambda t: t.points_for)
+    lowest_team = arrays.teams[int(arrays.points_for.argmin())]
     
     return {
         "team_name": lowest_team.team_name,
@@ -314,22 +272,41 @@ def fetch_lowest_scorer(league_id: int, year: int = 2025):
         "losses": lowest_team.losses
     }
 
+@traced()
 def fetch_league_point_order(league_id: int, year: int = 2025):
     """
     Returns all teams in the league, sorted from most to least points.
     """
-    league = League(
-        league_id=league_id,
-        year=year,
-        espn_s2=ESPNS2,
-        swid=SWID,
-        debug=False
-    )
+    arrays = get_season_arrays(league_id, year)
     
-    # Sort teams by points_for descending
-    sorted_teams = sorted(league.teams, key=lambda t: t.points_for, reverse=True)
+    # Teams by points_for descending, precomputed per snapshot
+    sorted_teams = [arrays.teams[i] for i in arrays.points_order.tolist()]
     
     return [
         {"team_name": team.team_name, "points": team.points_for, "wins": team.wins, "losses": team.losses}
         for team in sorted_teams
-    ]
\ No newline at end of file
+    ]
+
+@traced()
+def fetch_standings(league_id: int, year: int = 2025):
+    """
+    Returns standings with all-play records, luck index, strength of schedule and power scores.
+    """
+    return standings_table(get_season_arrays(league_id, year))
+
+def league_payload(league_id: int, key, build, year: int = 2025) -> CachedPayload:
+    """
+    Serialized, ETag-tagged response for data derived from the cached league,
+    built once per league snapshot.
+    """
+    return snapshot_payload(get_league(league_id, year), key, build)
+
+def week_payload(league_id: int, week: int, fetch, year: int = 2025) -> CachedPayload:
+    """
+    Like league_payload for one week of fetch(league_id, week, year); weeks still in
+    progress are re-serialized on every call but still get an ETag.
+    """
+    league = get_league(league_id, year)
+    if is_week_final(league, week, year):
+        return snapshot_payload(league, (fetch.__name__, week), lambda: fetch(league_id, week, year))
+    return CachedPayload(fetch(league_id, week, year))
@@ -0,0 +1,360 @@
+import argparse
+import json
+import logging
+from pathlib import Path
+
+from app.config import CURRENT_SEASON, EXPORT_DIR, EXPORT_ROW_GROUP_SIZE
+from app.helper import get_league
+from app.models.records import MatchupRecord, league_records
+from app.services.activity_log import get_activity_log
+from app.services.espn_service import final_week_cache
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional: NDJSON only
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("ndjson", "parquet")
+# ESPN fantasy football's first season; every exported year is one full league hydrate
+FIRST_SEASON = 2004
+# Per HTTP export; the CLI has no limit
+MAX_YEARS_PER_REQUEST = 10
+# Box scores (and so lineups) only exist from 2019 on
+FIRST_BOX_SCORE_YEAR = 2019
+
+# Column name -> type for each exported table; every row also carries league_id and year
+KEY_COLUMNS = {"league_id": "int64", "year": "int64"}
+TABLES = {
+    "teams": {
+        "team_id": "int64", "team_abbrev": "string", "team_name": "string", "division_id": "int64",
+        "wins": "int64", "losses": "int64", "ties": "int64", "points_for": "float64", "points_against": "float64",
+        "acquisitions": "int64", "trades": "int64", "standing": "int64", "final_standing": "int64",
+    },
+    "rosters": {
+        "team_id": "int64", "player_id": "int64", "name": "string", "position": "string", "pro_team": "string",
+        "lineup_slot": "string", "acquisition_type": "string", "injury_status": "string",
+        "total_points": "float64", "avg_points": "float64",
+        "projected_total_points": "float64", "projected_avg_points": "float64",
+    },
+    "draft": {
+        "overall": "int64", "round": "int64", "round_pick": "int64", "team_id": "int64",
+        "player_id": "int64", "player_name": "string", "bid_amount": "float64", "keeper": "bool",
+    },
+    "matchups": {
+        "week": "int64", "team_id": "int64", "opponent_id": "int64",
+        "team_score": "float64", "opponent_score": "float64", "playoff": "bool",
+    },
+    "lineups": {
+        "week": "int64", "team_id": "int64", "player_id": "int64", "name": "string", "position": "string",
+        "slot_position": "string", "points": "float64", "projected_points": "float64",
+    },
+    "activity": {
+        "date": "int64", "team_id": "int64", "team_name": "string", "action": "string",
+        "player_id": "int64", "player_name": "string", "bid_amount": "float64",
+    },
+}
+
+
+def parse_tables(spec: str = None) -> list:
+    """
+    Parses tables="teams,draft" into table names in TABLES order; None means every table.
+    """
+    if not spec:
+        return list(TABLES)
+    names = {name.strip() for name in spec.split(",") if name.strip()}
+    unknown = sorted(names - set(TABLES))
+    if unknown:
+        raise ValueError(f"Unknown tables {unknown}; choose from {', '.join(TABLES)}")
+    return [name for name in TABLES if name in names]
+
+
+def parse_years(spec: str = None, max_years: int = MAX_YEARS_PER_REQUEST) -> list:
+    """
+    Parses "2021-2024" or "2021,2023" into a sorted list; None means the current season.
+    Raises ValueError outside FIRST_SEASON..CURRENT_SEASON or for more than max_years.
+    """
+    if not spec:
+        return [CURRENT_SEASON]
+    years = set()
+    try:
+        for part in spec.split(","):
+            if part.strip():
+                start, _, end = part.strip().partition("-")
+                start, end = int(start), int(end or start)
+                if start > end or start < FIRST_SEASON or end > CURRENT_SEASON:
+                    raise ValueError
+                years.update(range(start, end + 1))
+    except ValueError:
+        raise ValueError(f"Invalid years: {spec}; seasons run {FIRST_SEASON}-{CURRENT_SEASON}")
+    if not years:
+        raise ValueError(f"Invalid years: {spec}")
+    if max_years is not None and len(years) > max_years:
+        raise ValueError(f"At most {max_years} years per export")
+    return sorted(years)
+
+
+def _teams(league):
+    for team in league_records(league).teams.values():
+        yield {
+            "team_id": team.team_id, "team_abbrev": team.team_abbrev, "team_name": team.team_name,
+            "division_id": team.division_id, "wins": team.wins, "losses": team.losses, "ties": team.ties,
+            "points_for": team.points_for, "points_against": team.points_against,
+            "acquisitions": team.acquisitions, "trades": team.trades,
+            "standing": team.standing, "final_standing": team.final_standing,
+        }
+
+
+def _rosters(league):
+    for team in league_records(league).teams.values():
+        for player in team.roster:
+            yield {
+                "team_id": team.team_id, "player_id": player.player_id, "name": player.name,
+                "position": player.position, "pro_team": player.pro_team, "lineup_slot": player.lineup_slot,
+                "acquisition_type": player.acquisition_type, "injury_status": player.injury_status,
+                "total_points": player.total_points, "avg_points": player.avg_points,
+                "projected_total_points": player.projected_total_points,
+                "projected_avg_points": player.projected_avg_points,
+            }
+
+
+def _draft(league):
+    for overall, pick in enumerate(league_records(league).draft, start=1):
+        yield {
+            "overall": overall, "round": pick.round, "round_pick": pick.round_pick, "team_id": pick.team_id,
+            "player_id": pick.player_id, "player_name": pick.player_name,
+            "bid_amount": pick.bid_amount or 0, "keeper": bool(pick.keeper_status),
+        }
+
+
+def _matchups(league):
+    """
+    Every scheduled game once, from the teams' schedules and weekly scores. Schedules
+    don't say which side was home, so sides are team and opponent (team first in league order).
+    """
+    reg_season = int(getattr(league.settings, "reg_season_count", 0) or 0)
+    teams = league_records(league).teams
+    seen = set()
+    for team in teams.values():
+        for week, (opponent_id, _) in enumerate(team.schedule, start=1):
+            pair = (week, *sorted((team.team_id, opponent_id)))
+            opponent = teams.get(opponent_id)
+            if pair in seen or opponent is None or opponent_id == team.team_id or week > len(team.scores):
+                continue
+            seen.add(pair)
+            yield {
+                "week": week, "team_id": team.team_id, "opponent_id": opponent_id,
+                "team_score": team.scores[week - 1],
+                "opponent_score": opponent.scores[week - 1] if week <= len(opponent.scores) else 0.0,
+                "playoff": bool(reg_season and week > reg_season),
+            }
+
+
+def _box_scores(league_id: int, year: int, league, week: int) -> list:
+    # Reuse a final week the API already serialized; otherwise build it without caching
+    cached = final_week_cache.peek(("box_scores", league_id, year, week))
+    if cached is not None:
+        return cached
+    return [MatchupRecord.from_matchup(box, lineups=True).box_score() for box in league.box_scores(week)]
+
+
+def _lineups(league, league_id: int, year: int):
+    if year < FIRST_BOX_SCORE_YEAR:
+        return
+    for week in range(1, int(getattr(league, "current_week", 0) or 0) + 1):
+        try:
+            box_scores = _box_scores(league_id, year, league, week)
+        except Exception as e:
+            logger.warning("Skipping box scores for league %s (%s) week %s: %s", league_id, year, week, e)
+            continue
+        for box in box_scores:
+            for side in ("home", "away"):
+                team_id = box[f"{side}_team_id"]
+                for player in box[f"{side}_lineup"]:
+                    yield {
+                        "week": week, "team_id": team_id, "player_id": player["player_id"], "name": player["name"],
+                        "position": player["position"], "slot_position": player["slot_position"],
+                        "points": player["points"] or 0.0, "projected_points": player["projected_points"] or 0.0,
+                    }
+
+
+def _activity(league_id: int, year: int):
+    log = get_activity_log(league_id, year)
+    if log.polled_at is None and not log.entries:
+        try:
+            log.poll()
+        except Exception as e:
+            logger.warning("Skipping activity for league %s (%s): %s", league_id, year, e)
+    # The log only appends, so this is a consistent prefix even while it's polled
+    for entry in log.entries[:len(log.entries)]:
+        for action in entry["actions"]:
+            if "action" not in action:
+                continue
+            yield {
+                "date": entry["date"], "team_id": action["team_id"], "team_name": action["team_name"],
+                "action": action["action"], "player_id": action["player_id"], "player_name": action["player_name"],
+                "bid_amount": action["bid_amount"],
+            }
+
+
+def iter_rows(league_id: int, years: list, tables: list):
+    """
+    Yields (table, row) for each season in turn, every table built from that
+    season's one cached League snapshot. Nothing is collected per table, so
+    memory doesn't grow with the number of seasons or rows.
+    """
+    for year in years:
+        league = get_league(league_id, year)
+        sources = {
+            "teams": lambda: _teams(league),
+            "rosters": lambda: _rosters(league),
+            "draft": lambda: _draft(league),
+            "matchups": lambda: _matchups(league),
+            "lineups": lambda: _lineups(league, league_id, year),
+            "activity": lambda: _activity(league_id, year),
+        }
+        for table in tables:
+            for row in sources[table]():
+                yield table, {"league_id": league_id, "year": year, **row}
+
+
+def ndjson_line(table: str, row: dict) -> bytes:
+    """
+    One JSON object per line, tagged with its table.
+    """
+    return (json.dumps({"table": table, **row}) + "\n").encode()
+
+
+def iter_ndjson(rows):
+    for table, row in rows:
+        yield ndjson_line(table, row)
+
+
+def require_parquet():
+    if pyarrow is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+
+def _schema(table: str):
+    types = {"int64": pyarrow.int64(), "float64": pyarrow.float64(), "string": pyarrow.string(), "bool": pyarrow.bool_()}
+    return pyarrow.schema([(name, types[kind]) for name, kind in {**KEY_COLUMNS, **TABLES[table]}.items()])
+
+
+class _ChunkSink:
+    """
+    Write-only file object that hands back whatever was written since the last drain.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+class ParquetTableWriter:
+    """
+    Buffers one table's rows and writes them out a row group at a time.
+    """
+
+    def __init__(self, sink, table: str, row_group_size: int = EXPORT_ROW_GROUP_SIZE):
+        require_parquet()
+        self.schema = _schema(table)
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._buffer = []
+        self._writer = pyarrow.parquet.ParquetWriter(sink, self.schema)
+
+    def add(self, row: dict) -> bool:
+        """
+        Buffers a row; returns True when that completed a row group.
+        """
+        self._buffer.append(row)
+        self.rows += 1
+        if len(self._buffer) < self.row_group_size:
+            return False
+        self.flush()
+        return True
+
+    def flush(self):
+        if self._buffer:
+            self._writer.write_table(pyarrow.Table.from_pylist(self._buffer, schema=self.schema))
+            self._buffer = []
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+
+def iter_parquet(rows, table: str):
+    """
+    Streams one table as a Parquet file, yielding bytes after each row group.
+    """
+    sink = _ChunkSink()
+    writer = ParquetTableWriter(sink, table)
+    for row_table, row in rows:
+        if row_table == table and writer.add(row):
+            yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def export_to_dir(league_ids: list, years: list, tables: list, fmt: str, root: str = EXPORT_DIR) -> dict:
+    """
+    Exports leagues to root/: one <table>.parquet per table, or one export.ndjson.
+    Returns the row count per table.
+    """
+    out = Path(root)
+    out.mkdir(parents=True, exist_ok=True)
+    counts = dict.fromkeys(tables, 0)
+    if fmt == "ndjson":
+        with open(out / "export.ndjson", "wb") as f:
+            for league_id in league_ids:
+                for table, row in iter_rows(league_id, years, tables):
+                    f.write(ndjson_line(table, row))
+                    counts[table] += 1
+        return counts
+
+    writers = {table: ParquetTableWriter(str(out / f"{table}.parquet"), table) for table in tables}
+    try:
+        for league_id in league_ids:
+            for table, row in iter_rows(league_id, years, tables):
+                writers[table].add(row)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return {table: writer.rows for table, writer in writers.items()}
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Export league teams, rosters, draft, matchups, lineups and activity.")
+    parser.add_argument("league_ids", type=int, nargs="+")
+    parser.add_argument("--years", help="Seasons to export, e.g. 2019-2024 or 2021,2023 (default: the current season)")
+    parser.add_argument("--tables", help=f"Comma-separated subset of {','.join(TABLES)} (default: all)")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--out", default=EXPORT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet":
+        require_parquet()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    counts = export_to_dir(args.league_ids, parse_years(args.years, max_years=None), parse_tables(args.tables), args.format, args.out)
+    print(json.dumps({"out": args.out, "format": args.format, "rows": counts}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import base64
+import heapq
+import itertools
+import json
+import threading
+import time
+from bisect import bisect_right, insort
+
+from app.config import FREE_AGENT_POOL_SIZE, FREE_AGENT_FULL_REFRESH_SECONDS
+from app.helper import get_league
+from app.services.activity_log import get_activity_log
+from app.services.espn_service import serialize_free_agent
+from app.services.player_index import player_index
+from app.utils.cache import TTLCache
+from app.utils.metrics import traced
+
+SORT_KEYS = ("percent_owned", "projected_avg_points", "avg_points", "projected_total_points", "total_points")
+DEFAULT_SORT = "percent_owned"  # ESPN's own free agent order
+MAX_PAGE_SIZE = 200
+ALL_POSITIONS = "ALL"
+# Every free agent is eligible for these, so they aren't filters
+UNFILTERED_SLOTS = {"BE", "IR"}
+# ESPN football positions and lineup slots; valid filters even when no free agent has them
+KNOWN_GROUPS = {
+    "QB", "TQB", "RB", "WR", "TE", "K", "P", "D/ST", "HC", "DT", "DE", "LB", "DL", "CB", "S", "DB", "DP",
+    "RB/WR", "WR/TE", "RB/WR/TE", "OP",
+}
+# Common names for ESPN lineup slots
+SLOT_ALIASES = {"FLEX": "RB/WR/TE", "SUPERFLEX": "OP"}
+
+# Activity actions that take a player out of the free agent pool / put one back
+ADDED_ACTIONS = {"FA ADDED", "WAIVER ADDED"}
+DROPPED_ACTIONS = {"DROPPED"}
+
+
+def encode_cursor(sort: str, key: tuple) -> str:
+    raw = json.dumps({"s": sort, "k": list(key)}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    """
+    Returns the (-value, player_id) key to resume after. Raises ValueError if invalid.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        key = (float(data["k"][0]), int(data["k"][1]))
+    except (ValueError, KeyError, IndexError, TypeError):
+        raise ValueError("Invalid cursor")
+    if data.get("s") != sort:
+        raise ValueError("Cursor was issued for a different sort")
+    return key
+
+
+class FreeAgentIndex:
+    """
+    In-memory free agent pool for one league: full records by player id plus
+    lists kept sorted by each sort key, for keyset pagination. There is one list per
+    position and per lineup slot (RB/WR/TE, OP...) a player is eligible for.
+    """
+
+    def __init__(self, league_id: int, year: int):
+        self.league_id = league_id
+        self.year = year
+        self.rows = {}
+        self._sorted = {}               # (position, sort key) -> sorted [(-value, player_id)]
+        self._lock = threading.RLock()
+        self.activity_watermark = 0     # ms timestamp of the newest activity applied
+        self.version = 0                # bumped on every add/remove
+
+    @staticmethod
+    def _sort_value(row: dict, sort: str) -> float:
+        return -float(row.get(sort) or 0.0)
+
+    @staticmethod
+    def _groups(row: dict) -> set:
+        return ({row["position"], ALL_POSITIONS} | set(row.get("eligible_slots") or ())) - UNFILTERED_SLOTS
+
+    def has_group(self, name: str) -> bool:
+        with self._lock:
+            return (name, DEFAULT_SORT) in self._sorted
+
+    def add(self, row: dict):
+        with self._lock:
+            self.remove(row["player_id"])
+            self.rows[row["player_id"]] = row
+            self.version += 1
+            for sort in SORT_KEYS:
+                key = (self._sort_value(row, sort), row["player_id"])
+                for position in self._groups(row):
+                    insort(self._sorted.setdefault((position, sort), []), key)
+
+    def remove(self, player_id: int) -> bool:
+        with self._lock:
+            row = self.rows.pop(player_id, None)
+            if row is None:
+                return False
+            self.version += 1
+            for sort in SORT_KEYS:
+                key = (self._sort_value(row, sort), player_id)
+                for position in self._groups(row):
+                    entries = self._sorted.get((position, sort), [])
+                    i = bisect_right(entries, key) - 1
+                    if i >= 0 and entries[i] == key:
+                        del entries[i]
+            return True
+
+    def load(self, players):
+        with self._lock:
+            for player in players:
+                self.add(serialize_free_agent(player))
+
+    def snapshot(self) -> tuple:
+        """
+        (version, rows) taken under the lock, for consumers that cache derived data.
+        """
+        with self._lock:
+            return self.version, list(self.rows.values())
+
+    def apply_activity(self, activities) -> int:
+        """
+        Applies adds/drops newer than the watermark. Returns how many actions changed the pool.
+        """
+        changed = 0
+        newest = self.activity_watermark
+        for activity in sorted(activities, key=lambda a: getattr(a, "date", 0)):
+            date = getattr(activity, "date", 0)
+            if date <= self.activity_watermark:
+                continue
+            newest = max(newest, date)
+            for action in activity.actions:
+                if len(action) < 3:
+                    continue
+                kind, player = action[1], action[2]
+                player_id = getattr(player, "playerId", player if isinstance(player, int) else None)
+                if player_id is None:
+                    continue
+                if kind in ADDED_ACTIONS:
+                    changed += self.remove(player_id)
+                elif kind in DROPPED_ACTIONS and hasattr(player, "stats"):
+                    self.add(serialize_free_agent(player))
+                    changed += 1
+        self.activity_watermark = newest
+        return changed
+
+    def query(self, positions: list = None, sort: str = DEFAULT_SORT, size: int = 20, cursor: str = None, fields: list = None) -> tuple:
+        """
+        Returns (rows, next_cursor). Positions are merged from their sorted lists,
+        so a page costs O(size + log n) regardless of pool size.
+        """
+        after = decode_cursor(cursor, sort) if cursor else None
+        with self._lock:
+            lists = [self._sorted.get((p, sort), []) for p in (positions or [ALL_POSITIONS])]
+            iterators = [itertools.islice(entries, bisect_right(entries, after) if after else 0, None) for entries in lists]
+            # Overlapping lists (RB and RB/WR/TE...) hold the same player; keep one of each
+            merged = (key for key, _ in itertools.groupby(heapq.merge(*iterators)))
+            page = list(itertools.islice(merged, size + 1))
+            rows = [self.rows[player_id] for _, player_id in page[:size]]
+
+        next_cursor = encode_cursor(sort, page[size - 1]) if len(page) > size and size > 0 else None
+        if fields:
+            wanted = set(fields) | {"player_id"}
+            rows = [{k: v for k, v in row.items() if k in wanted} for row in rows]
+        return rows, next_cursor
+
+
+def _build_index(league_id: int, year: int) -> FreeAgentIndex:
+    index = FreeAgentIndex(league_id, year)
+    index.activity_watermark = int(time.time() * 1000)
+    players = get_league(league_id, year).free_agents(size=FREE_AGENT_POOL_SIZE)
+    index.load(players)
+    player_index.add_free_agents(league_id, year, players)
+    # Adds/drops picked up by the league's activity poller patch the pool in place
+    get_activity_log(league_id, year).add_listener(index.apply_activity)
+    return index
+
+
+# Full rebuilds happen when an index expires; in between it is patched from the activity log
+free_agent_indexes = TTLCache(default_ttl=FREE_AGENT_FULL_REFRESH_SECONDS, max_entries=64)
+
+
+def get_free_agent_index(league_id: int, year: int = 2025) -> FreeAgentIndex:
+    index = free_agent_indexes.get_or_load((league_id, year), lambda: _build_index(league_id, year))
+    get_activity_log(league_id, year).ensure_polling(wait=False)
+    return index
+
+
+@traced()
+def fetch_free_agents(
+    league_id: int,
+    size: int = 20,
+    position: str = None,
+    sort: str = DEFAULT_SORT,
+    cursor: str = None,
+    fields: str = None,
+    year: int = 2025,
+) -> tuple:
+    """
+    Returns (free agents, next_cursor) from the league's free agent index.
+    position and fields are comma-separated lists, e.g. position="RB,WR". Positions
+    may also be lineup slots such as RB/WR/TE (or FLEX) and OP.
+    Raises ValueError for an unknown sort key, position or a bad cursor.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort must be one of {list(SORT_KEYS)}")
+    size = max(0, min(size, MAX_PAGE_SIZE))
+    positions = None
+    if position:
+        names = (p.strip().upper() for p in position.split(",") if p.strip())
+        positions = list(dict.fromkeys(SLOT_ALIASES.get(name, name) for name in names)) or None
+        if positions and ALL_POSITIONS in positions:
+            positions = [ALL_POSITIONS]
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+
+    index = get_free_agent_index(league_id, year)
+    unknown = [p for p in positions or () if p != ALL_POSITIONS and p not in KNOWN_GROUPS and not index.has_group(p)]
+    if unknown:
+        raise ValueError(f"Unknown position or slot {unknown}")
+    return index.query(positions, sort, size, cursor, field_list)
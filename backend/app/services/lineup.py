@@ -0,0 +1,255 @@
+import logging
+
+import numpy as np
+
+from app.helper import get_league
+from app.services.espn_service import fetch_box_scores, final_week_cache, is_week_final, iter_weeks
+from app.utils.metrics import traced
+
+logger = logging.getLogger(__name__)
+
+# Lineup slots that don't score
+BENCH_SLOTS = {"BE", "IR", ""}
+
+# Costs for the assignment problem: leaving a slot empty is always worse than
+# starting any eligible player, and an ineligible player can never be chosen
+_EMPTY_COST = 1e6
+_INELIGIBLE_COST = 1e9
+
+
+def starter_slots(position_slot_counts: dict) -> list:
+    """
+    Expands {"QB": 1, "RB": 2, "RB/WR/TE": 1, "BE": 7, ...} into one entry per starting slot.
+    """
+    slots = []
+    for slot, count in position_slot_counts.items():
+        if slot in BENCH_SLOTS or not count:
+            continue
+        slots.extend([slot] * int(count))
+    return slots
+
+
+def solve_assignment(cost: np.ndarray) -> np.ndarray:
+    """
+    Exact minimum-cost assignment of rows to distinct columns (Hungarian method,
+    shortest augmenting paths with the column scan vectorized in NumPy).
+    cost is (n, m) with n <= m. Returns the column chosen for each row.
+    """
+    n, m = cost.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)    # p[j]: row matched to column j (1-based, 0 = free)
+    way = np.zeros(m + 1, dtype=np.int64)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+
+            improve = free & (reduced < minv[1:])
+            minv[1:][improve] = reduced[improve]
+            way[1:][improve] = j0
+
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+
+            used_cols = np.flatnonzero(used)
+            u[p[used_cols]] += delta
+            v[used_cols] -= delta
+            minv[1:][free] -= delta
+
+            j0 = j1
+            if p[j0] == 0:
+                break
+
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    assignment = np.full(n, -1, dtype=np.int64)
+    matched = np.flatnonzero(p[1:])
+    assignment[p[matched + 1] - 1] = matched
+    return assignment
+
+
+def eligibility_matrix(players: list, slots: list) -> np.ndarray:
+    """
+    (n_slots, n_players) boolean matrix of which player may fill which slot.
+    """
+    matrix = np.zeros((len(slots), len(players)), dtype=bool)
+    for j, player in enumerate(players):
+        eligible = set(player.get("eligible_slots") or [])
+        for i, slot in enumerate(slots):
+            matrix[i, j] = slot in eligible
+    return matrix
+
+
+def best_assignment(eligible: np.ndarray, values: np.ndarray) -> tuple:
+    """
+    Maximizes total value over the starting slots. Returns (player index per slot,
+    -1 for an empty slot; total points).
+    """
+    n_slots, n_players = eligible.shape
+    if not n_slots:
+        return np.zeros(0, dtype=np.int64), 0.0
+
+    # Real players first, then one "empty" column per slot so every slot can be filled
+    cost = np.full((n_slots, n_players + n_slots), _EMPTY_COST)
+    cost[:, :n_players] = np.where(eligible, -values[None, :], _INELIGIBLE_COST)
+
+    assignment = solve_assignment(cost)
+    filled = (assignment < n_players) & (cost[np.arange(n_slots), assignment] < _EMPTY_COST)
+    assignment = np.where(filled, assignment, -1)
+    return assignment, float(values[assignment[filled]].sum())
+
+
+def optimal_lineup(players: list, slots: list, key: str = "projected_points") -> dict:
+    """
+    Picks the legal lineup that maximizes players' `key` points over the given
+    starting slots, honoring each player's eligible_slots (FLEX, OP, etc. included).
+    """
+    values = np.array([float(p.get(key) or 0.0) for p in players])
+    assignment, points = best_assignment(eligibility_matrix(players, slots), values)
+
+    lineup = []
+    for slot, column in zip(slots, assignment.tolist()):
+        if column >= 0:
+            lineup.append({"slot": slot, **players[column]})
+        else:
+            lineup.append({"slot": slot, "name": None, key: 0.0})
+
+    started = set(assignment.tolist())
+    return {
+        "points": round(points, 2),
+        "lineup": lineup,
+        "bench": [player for i, player in enumerate(players) if i not in started],
+    }
+
+
+def _lineup_players(lineup: list) -> list:
+    return [
+        {
+            "player_id": p.get("player_id"),
+            "name": p["name"],
+            "position": p["position"],
+            "eligible_slots": p.get("eligible_slots", []),
+            "slot_position": p["slot_position"],
+            "points": p["points"],
+            "projected_points": p["projected_points"],
+        }
+        for p in lineup
+    ]
+
+
+def _team_lineups(box_scores: list) -> dict:
+    """
+    team_id -> (team_name, serialized lineup) for one week of box scores.
+    """
+    teams = {}
+    for matchup in box_scores:
+        for side in ("home", "away"):
+            teams[matchup[f"{side}_team_id"]] = (matchup[f"{side}_team"], matchup[f"{side}_lineup"])
+    return teams
+
+
+def evaluate_week(lineup: list, slots: list, metric: str = "points") -> dict:
+    """
+    Compares what a team started with its best possible lineup for one week.
+    """
+    players = _lineup_players(lineup)
+    best = optimal_lineup(players, slots, key=metric)
+    started = round(sum(p[metric] or 0.0 for p in players if p["slot_position"] not in BENCH_SLOTS), 2)
+    return {
+        "started_points": started,
+        "optimal_points": best["points"],
+        "points_left_on_bench": round(best["points"] - started, 2),
+        "optimal_lineup": best["lineup"],
+    }
+
+
+@traced()
+def fetch_optimal_lineup(league_id: int, team_id: int, week: int = None, metric: str = "projected_points", year: int = 2025):
+    """
+    Returns the optimal lineup for one team and week, alongside what was actually started.
+    """
+    league = get_league(league_id, year)
+    week = week or league.current_week
+    slots = starter_slots(getattr(league.settings, "position_slot_counts", {}))
+
+    team = _team_lineups(fetch_box_scores(league_id, week, year)).get(team_id)
+    if team is None:
+        return None
+
+    team_name, lineup = team
+    return {"team_id": team_id, "team_name": team_name, "week": week, "metric": metric, **evaluate_week(lineup, slots, metric)}
+
+
+def _week_summary(league_id: int, week: int, year: int, slots: list, metric: str) -> dict:
+    """
+    team_id -> week evaluation (without lineups) for every team, cached for finished weeks.
+    """
+    def build():
+        summary = {}
+        for team_id, (team_name, lineup) in _team_lineups(fetch_box_scores(league_id, week, year)).items():
+            result = evaluate_week(lineup, slots, metric)
+            result.pop("optimal_lineup")
+            summary[team_id] = {"team_name": team_name, **result}
+        return summary
+
+    league = get_league(league_id, year)
+    if not is_week_final(league, week, year):
+        return build()
+    return final_week_cache.get_or_load(("lineups", metric, league_id, year, week), build)
+
+
+@traced()
+def fetch_optimal_lineups(league_id: int, weeks: list, metric: str = "points", year: int = 2025):
+    """
+    Optimizes every team for every requested week and totals points left on bench.
+    Weeks that couldn't be fetched are left out of the totals and reported under
+    "errors"; "weeks" lists the weeks the totals cover.
+    """
+    league = get_league(league_id, year)
+    slots = starter_slots(getattr(league.settings, "position_slot_counts", {}))
+    fetch = lambda lid, week, yr: _week_summary(lid, week, yr, slots, metric)
+
+    teams, covered, errors = {}, [], {}
+    for item in iter_weeks(league_id, weeks, fetch, year):
+        if "error" in item:
+            logger.warning("Optimal lineups for league %s week %s failed: %s", league_id, item["week"], item["error"])
+            errors[item["week"]] = item["error"]
+            continue
+        covered.append(item["week"])
+        for team_id, result in item["data"].items():
+            team = teams.setdefault(team_id, {
+                "team_id": team_id,
+                "team_name": result["team_name"],
+                "started_points": 0.0,
+                "optimal_points": 0.0,
+                "points_left_on_bench": 0.0,
+                "weeks": [],
+            })
+            team["started_points"] += result["started_points"]
+            team["optimal_points"] += result["optimal_points"]
+            team["points_left_on_bench"] += result["points_left_on_bench"]
+            team["weeks"].append({
+                "week": item["week"],
+                "started_points": result["started_points"],
+                "optimal_points": result["optimal_points"],
+                "points_left_on_bench": result["points_left_on_bench"],
+            })
+
+    results = sorted(teams.values(), key=lambda t: t["points_left_on_bench"], reverse=True)
+    for team in results:
+        for field in ("started_points", "optimal_points", "points_left_on_bench"):
+            team[field] = round(team[field], 2)
+    return {"metric": metric, "weeks": covered, "teams": results, "errors": errors}
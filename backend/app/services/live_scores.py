@@ -0,0 +1,170 @@
+import asyncio
+import json
+import logging
+
+from app.config import LIVE_SCORES_POLL_SECONDS, LIVE_SCORES_KEEPALIVE_SECONDS, LIVE_SCORES_QUEUE_SIZE
+from app.services.espn_client import run_blocking
+from app.services.espn_service import fetch_box_scores
+
+logger = logging.getLogger(__name__)
+
+# Player fields pushed in deltas; everything else in a lineup row is static for the week
+PLAYER_FIELDS = ("points", "projected_points", "slot_position")
+
+
+def score_state(box_scores: list) -> tuple:
+    """
+    Flattens box scores into ({matchup index: scores}, {(team_id, player_id): live fields}).
+    """
+    matchups, players = {}, {}
+    for i, matchup in enumerate(box_scores):
+        matchups[i] = {
+            "matchup": i,
+            "home_team_id": matchup["home_team_id"],
+            "home_score": matchup["home_score"],
+            "away_team_id": matchup["away_team_id"],
+            "away_score": matchup["away_score"],
+        }
+        for side in ("home", "away"):
+            team_id = matchup[f"{side}_team_id"]
+            for player in matchup[f"{side}_lineup"]:
+                players[(team_id, player["player_id"])] = {field: player.get(field) for field in PLAYER_FIELDS}
+    return matchups, players
+
+
+def diff_state(before: tuple, after: tuple) -> dict:
+    """
+    Changed matchup scores and player rows between two score states, or None if nothing changed.
+    """
+    old_matchups, old_players = before
+    new_matchups, new_players = after
+
+    matchups = [m for i, m in new_matchups.items() if old_matchups.get(i) != m]
+    players = [
+        {"team_id": team_id, "player_id": player_id, **fields}
+        for (team_id, player_id), fields in new_players.items()
+        if old_players.get((team_id, player_id)) != fields
+    ]
+    players += [
+        {"team_id": team_id, "player_id": player_id, "removed": True}
+        for (team_id, player_id) in old_players.keys() - new_players.keys()
+    ]
+    if not matchups and not players:
+        return None
+    return {"matchups": matchups, "players": players}
+
+
+def sse_event(event: str, data, event_id: int = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, separators=(",", ":")))
+    return "\n".join(lines) + "\n\n"
+
+
+class LiveScoreFeed:
+    """
+    One upstream poller per (league, week, year) fanning out score deltas to every
+    subscriber's queue. The poller runs only while someone is subscribed.
+    """
+
+    def __init__(self, league_id: int, week: int, year: int, interval: float = LIVE_SCORES_POLL_SECONDS):
+        self.league_id = league_id
+        self.week = week
+        self.year = year
+        self.interval = interval
+        self.subscribers = set()
+        self.box_scores = None
+        self.state = None
+        self.seq = 0
+        self._task = None
+        self._ready = asyncio.Event()
+
+    def _snapshot_event(self) -> str:
+        return sse_event("snapshot", {"week": self.week, "box_scores": self.box_scores}, self.seq)
+
+    def _push(self, queue: asyncio.Queue, message: str):
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # A slow client skips the backlog and resyncs from a full snapshot
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(self._snapshot_event())
+
+    async def poll_once(self):
+        box_scores = await run_blocking(fetch_box_scores, self.league_id, self.week, self.year)
+        state = score_state(box_scores)
+        first = self.state is None
+        delta = diff_state(self.state, state) if not first else None
+        self.box_scores, self.state = box_scores, state
+
+        if first:
+            # Subscribers that joined before any poll succeeded get their snapshot now
+            self.seq += 1
+            message = self._snapshot_event()
+        elif delta is not None:
+            self.seq += 1
+            message = sse_event("delta", {"week": self.week, **delta}, self.seq)
+        else:
+            message = None
+        if message is not None:
+            for queue in list(self.subscribers):
+                self._push(queue, message)
+        self._ready.set()
+
+    async def _run(self):
+        while self.subscribers:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Live score poll failed for league %s week %s: %s", self.league_id, self.week, e)
+                self._ready.set()
+            await asyncio.sleep(self.interval)
+
+    async def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=LIVE_SCORES_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self.box_scores is not None:
+            # Joining a feed that already has scores; otherwise the first good poll sends it
+            queue.put_nowait(self._snapshot_event())
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self.subscribers.discard(queue)
+        if not self.subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+_feeds = {}
+
+
+async def stream_live_scores(league_id: int, week: int, year: int = 2025):
+    """
+    Yields SSE messages: a full "snapshot" first, then "delta" events with only the
+    matchup scores and player rows that changed since the previous poll.
+    """
+    key = (league_id, week, year)
+    feed = _feeds.get(key)
+    if feed is None:
+        feed = _feeds[key] = LiveScoreFeed(league_id, week, year)
+
+    queue = await feed.subscribe()
+    try:
+        if feed.box_scores is None:
+            yield sse_event("error", {"detail": "Box scores not available"})
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=LIVE_SCORES_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                message = ": keepalive\n\n"
+            yield message
+    finally:
+        feed.unsubscribe(queue)
+        if not feed.subscribers and _feeds.get(key) is feed:
+            del _feeds[key]
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+
+from app.config import OVERVIEW_SECTION_TIMEOUT
+from app.helper import aget_league
+from app.services.activity_log import fetch_recent_activity
+from app.services.espn_client import run_blocking
+from app.services.espn_service import (
+    fetch_league_teams_detailed,
+    fetch_league_settings,
+    fetch_scoreboard,
+    fetch_power_rankings,
+    fetch_top_scorer,
+    fetch_lowest_scorer,
+)
+from app.utils.metrics import traced
+
+logger = logging.getLogger(__name__)
+
+# Section name -> builder(league_id, week, year); each runs on the ESPN pool against the shared league
+SECTIONS = {
+    "teams": lambda league_id, week, year: fetch_league_teams_detailed(league_id, year),
+    "settings": lambda league_id, week, year: fetch_league_settings(league_id, year),
+    "scoreboard": lambda league_id, week, year: fetch_scoreboard(league_id, week, year),
+    "power_rankings": lambda league_id, week, year: fetch_power_rankings(league_id, week, year),
+    "top_scorer": lambda league_id, week, year: fetch_top_scorer(league_id, year),
+    "lowest_scorer": lambda league_id, week, year: fetch_lowest_scorer(league_id, year),
+    "activity": lambda league_id, week, year: fetch_recent_activity(league_id, size=10, year=year)[0],
+}
+
+
+def parse_include(include: str = None) -> list:
+    """
+    Parses include="teams,scoreboard" into section names; None means every section.
+    """
+    if not include:
+        return list(SECTIONS)
+    names = [name.strip() for name in include.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown sections {unknown}; choose from {', '.join(SECTIONS)}")
+    return list(dict.fromkeys(names))
+
+
+async def _section(name: str, league_id: int, week: int, year: int, timeout: float):
+    try:
+        return await asyncio.wait_for(run_blocking(SECTIONS[name], league_id, week, year), timeout)
+    except asyncio.TimeoutError:
+        # The worker keeps running and warms the caches for the next request
+        logger.warning("Overview section %s timed out for league %s after %ss", name, league_id, timeout)
+        raise TimeoutError(f"timed out after {timeout}s")
+
+
+@traced()
+async def afetch_league_overview(league_id: int, include: str = None, week: int = None, year: int = 2025, timeout: float = None) -> dict:
+    """
+    Builds the requested overview sections concurrently from one league snapshot.
+    A section that fails or exceeds its timeout is reported under "errors" and
+    doesn't hold back the others.
+    """
+    names = parse_include(include)
+    timeout = timeout or OVERVIEW_SECTION_TIMEOUT
+    # Hydrate once so every section shares the same cached league
+    league = await aget_league(league_id, year)
+    week = week or league.current_week
+
+    results = await asyncio.gather(
+        *(_section(name, league_id, week, year, timeout) for name in names),
+        return_exceptions=True,
+    )
+    sections, errors = {}, {}
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            if not isinstance(result, TimeoutError):
+                logger.warning("Overview section %s failed for league %s: %s", name, league_id, result)
+            errors[name] = str(result) or type(result).__name__
+        else:
+            sections[name] = result
+    return {"league_id": league_id, "year": year, "week": week, "sections": sections, "errors": errors}
@@ -0,0 +1,272 @@
+import threading
+import weakref
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from app.helper import get_league, league_cache
+from app.models.records import PlayerRecord, league_records
+from app.utils.metrics import traced
+
+# Scoring periods kept per series (NFL regular season + playoffs)
+SERIES_WEEKS = 18
+
+
+def weekly_series(stats: dict) -> tuple:
+    """
+    (points, projected points) for weeks 1..SERIES_WEEKS as float32 arrays, NaN where
+    espn_api has no entry for the week. Scoring period 0 (season totals) is skipped.
+    """
+    points = np.full(SERIES_WEEKS, np.nan, dtype=np.float32)
+    projected = np.full(SERIES_WEEKS, np.nan, dtype=np.float32)
+    for week, entry in (stats or {}).items():
+        if isinstance(week, int) and 1 <= week <= SERIES_WEEKS:
+            if "points" in entry:
+                points[week - 1] = entry["points"]
+            if "projected_points" in entry:
+                projected[week - 1] = entry["projected_points"]
+    return points, projected
+
+
+def _to_list(values: np.ndarray) -> list:
+    return [None if np.isnan(v) else round(float(v), 2) for v in values]
+
+
+@dataclass(slots=True)
+class LeagueSeries:
+    team_id: int          # None when the player is a free agent in that league
+    team_name: str
+    points: np.ndarray
+    projected: np.ndarray
+
+
+@dataclass(slots=True)
+class PlayerEntry:
+    player_id: int
+    name: str
+    position: str
+    pro_team: str
+    # (league_id, year) -> LeagueSeries; fantasy points depend on each league's scoring
+    leagues: dict = field(default_factory=dict)
+
+    def ownership(self) -> list:
+        return [
+            {"league_id": league_id, "year": year, "team_id": s.team_id, "team_name": s.team_name}
+            for (league_id, year), s in sorted(self.leagues.items())
+        ]
+
+    def series(self, league_id: int = None, year: int = None) -> LeagueSeries:
+        """
+        The series for one league, or the first one indexed when no league is given.
+        """
+        if league_id is not None:
+            return self.leagues.get((league_id, year))
+        return next(iter(self.leagues.values()), None)
+
+
+class PlayerIndex:
+    """
+    Every player seen in a cached league roster or free agent pool, by playerId, with
+    compact weekly points/projection arrays per league and an ownership map.
+    Leagues are indexed once per cached League snapshot.
+    """
+
+    def __init__(self):
+        self.players = {}
+        self._rostered = {}                      # (league_id, year) -> player ids on a roster
+        self._members = {}                       # (league_id, year) -> every player id indexed for it
+        self._indexed = weakref.WeakKeyDictionary()
+        self._lock = threading.RLock()
+
+    def _entry(self, record: PlayerRecord) -> PlayerEntry:
+        entry = self.players.get(record.player_id)
+        if entry is None:
+            entry = self.players[record.player_id] = PlayerEntry(record.player_id, record.name, record.position, record.pro_team)
+        else:
+            entry.pro_team = record.pro_team or entry.pro_team
+        return entry
+
+    def index_league(self, league_id: int, year: int, league):
+        """
+        Indexes every rostered player of a League snapshot. Players rostered in the
+        previous snapshot but not this one are kept as free agents of the league.
+        """
+        key = (league_id, year)
+        with self._lock:
+            if league in self._indexed:
+                return
+            rostered = set()
+            for team in league_records(league).teams.values():
+                for record in team.roster:
+                    points, projected = weekly_series(record.stats)
+                    self._entry(record).leagues[key] = LeagueSeries(team.team_id, team.team_name, points, projected)
+                    rostered.add(record.player_id)
+            for player_id in self._rostered.get(key, set()) - rostered:
+                series = self.players[player_id].leagues.get(key)
+                if series is not None:
+                    series.team_id = series.team_name = None
+            self._rostered[key] = rostered
+            self._members.setdefault(key, set()).update(rostered)
+            self._indexed[league] = key
+
+    def add_free_agents(self, league_id: int, year: int, players: list):
+        """
+        Indexes a league's free agent pool (espn_api Player objects).
+        """
+        key = (league_id, year)
+        with self._lock:
+            rostered = self._rostered.get(key, set())
+            for player in players:
+                if player.playerId in rostered:
+                    continue
+                record = PlayerRecord.from_player(player)
+                points, projected = weekly_series(record.stats)
+                self._entry(record).leagues[key] = LeagueSeries(None, None, points, projected)
+                self._members.setdefault(key, set()).add(record.player_id)
+
+    def drop_league(self, key: tuple):
+        with self._lock:
+            for player_id in self._members.pop(key, ()):
+                entry = self.players.get(player_id)
+                if entry is not None:
+                    entry.leagues.pop(key, None)
+                    if not entry.leagues:
+                        del self.players[player_id]
+            self._rostered.pop(key, None)
+
+    def sync(self):
+        """
+        Indexes any League in the shared league cache that hasn't been seen yet, and
+        forgets leagues that have left the cache.
+        """
+        cached = set()
+        for cache_key in league_cache.keys():
+            league = league_cache.peek(cache_key)
+            if league is None:
+                continue
+            cached.add((cache_key[0], cache_key[1]))
+            if league not in self._indexed:
+                self.index_league(cache_key[0], cache_key[1], league)
+        for key in set(self._members) - cached:
+            self.drop_league(key)
+
+    def get(self, player_id: int) -> PlayerEntry:
+        return self.players.get(player_id)
+
+
+player_index = PlayerIndex()
+
+
+def _index_for(league_id: int = None, year: int = 2025) -> PlayerIndex:
+    """
+    Brings the index up to date with the league cache, hydrating league_id first if given.
+    """
+    if league_id is not None:
+        player_index.index_league(league_id, year, get_league(league_id, year))
+    player_index.sync()
+    return player_index
+
+
+def _summary(series: LeagueSeries) -> dict:
+    played = series.points[~np.isnan(series.points)]
+    return {
+        "total_points": round(float(played.sum()), 2),
+        "avg_points": round(float(played.mean()), 2) if len(played) else 0.0,
+        "weeks_played": int(len(played)),
+    }
+
+
+@traced()
+def fetch_player(player_id: int, league_id: int = None, year: int = 2025) -> dict:
+    """
+    One player's ownership across indexed leagues and weekly points/projections per league.
+    """
+    entry = _index_for(league_id, year).get(player_id)
+    if entry is None:
+        return None
+    return {
+        "player_id": entry.player_id,
+        "name": entry.name,
+        "position": entry.position,
+        "pro_team": entry.pro_team,
+        "ownership": entry.ownership(),
+        "weekly": [
+            {
+                "league_id": key[0],
+                "year": key[1],
+                "points": _to_list(series.points),
+                "projected_points": _to_list(series.projected),
+                **_summary(series),
+            }
+            for key, series in sorted(entry.leagues.items())
+        ],
+    }
+
+
+@traced()
+def fetch_player_comparison(player_ids: list, league_id: int = None, year: int = 2025, last: int = 4) -> list:
+    """
+    Side-by-side weekly points for several players, scored in one league (or each
+    player's first indexed league), with season and last-N-week averages.
+    """
+    index = _index_for(league_id, year)
+    results = []
+    for player_id in player_ids:
+        entry = index.get(player_id)
+        series = entry.series(league_id, year) if entry else None
+        if series is None:
+            results.append({"player_id": player_id, "error": "Player not found"})
+            continue
+        played = series.points[~np.isnan(series.points)]
+        recent = played[-last:] if last > 0 else played[:0]
+        results.append({
+            "player_id": entry.player_id,
+            "name": entry.name,
+            "position": entry.position,
+            "pro_team": entry.pro_team,
+            "team_id": series.team_id,
+            "team_name": series.team_name,
+            **_summary(series),
+            "recent_weeks": len(recent),
+            "recent_avg": round(float(recent.mean()), 2) if len(recent) else 0.0,
+            "points": _to_list(series.points),
+            "projected_points": _to_list(series.projected),
+        })
+    return results
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Mean of the last `window` played weeks at each week; weeks without a score are
+    skipped and stay NaN.
+    """
+    played = ~np.isnan(values)
+    sums = np.cumsum(np.where(played, values, 0.0))
+    counts = np.cumsum(played)
+    # Index of each week's value within the played weeks, and where its window starts
+    ranks = counts - 1
+    played_sums = np.concatenate(([0.0], sums[played]))
+    start = np.maximum(ranks - window + 1, 0)
+    window_sums = played_sums[ranks + 1] - played_sums[start]
+    result = window_sums / np.minimum(counts, window).clip(min=1)
+    result[~played] = np.nan
+    return result
+
+
+@traced()
+def fetch_player_rolling(player_id: int, window: int = 3, league_id: int = None, year: int = 2025) -> dict:
+    """
+    Rolling averages of a player's weekly points and projections in one league.
+    """
+    entry = _index_for(league_id, year).get(player_id)
+    series = entry.series(league_id, year) if entry else None
+    if series is None:
+        return None
+    return {
+        "player_id": entry.player_id,
+        "name": entry.name,
+        "window": window,
+        "points": _to_list(series.points),
+        "rolling_points": _to_list(rolling_mean(series.points, window)),
+        "rolling_projected_points": _to_list(rolling_mean(series.projected, window)),
+    }
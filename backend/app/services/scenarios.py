@@ -0,0 +1,224 @@
+import numpy as np
+
+from app.services.analytics import OUTCOME_CODES, UNDECIDED, SeasonArrays, get_season_arrays
+from app.utils.metrics import traced
+
+# Margin given to a result-only override whose recorded margin disagrees with it,
+# so power rankings (which count wins by margin) see the hypothetical winner
+RESULT_ONLY_MARGIN = 0.01
+
+
+def _all_play(scores: np.ndarray) -> tuple:
+    """
+    All-play (wins, losses, ties) per team over the given (T, weeks) score columns.
+    """
+    diff = scores[:, None, :] - scores[None, :, :]
+    return (diff > 0).sum(axis=(1, 2)), (diff < 0).sum(axis=(1, 2)), (diff == 0).sum(axis=(1, 2)) - scores.shape[1]
+
+
+class Scenario:
+    """
+    A season with hypothetical results for some matchups, computed as deltas on the
+    cached SeasonArrays. Only the overridden weeks' columns are copied; records,
+    points and all-play totals are adjusted by the difference those columns make.
+
+    An unplayed week counts toward all-play records (and so expected wins and luck)
+    only once every team in it has a hypothetical score, since all-play compares scores.
+    """
+
+    def __init__(self, arrays: SeasonArrays, overrides: list):
+        self.base = arrays
+        n_teams, n_weeks = arrays.scores.shape
+        position = {team_id: i for i, team_id in enumerate(arrays.team_ids.tolist())}
+
+        weeks = sorted({o["week"] for o in overrides})
+        for week in weeks:
+            if not 1 <= week <= n_weeks:
+                raise ValueError(f"Week {week} is outside the schedule (1-{n_weeks})")
+        self.weeks = weeks
+        self.cols = np.array(weeks, dtype=np.int64) - 1
+        col = {week: c for c, week in enumerate(weeks)}
+
+        self.scores = arrays.scores[:, self.cols].copy()
+        self.mov = arrays.mov[:, self.cols].copy()
+        self.outcomes = arrays.outcomes[:, self.cols].copy()
+        opponents = arrays.opponents[:, self.cols]
+        # Teams whose score in each overridden week is known (played, on bye or given)
+        self.scored = (self.outcomes != UNDECIDED).any(axis=0)[None, :] | (opponents < 0)
+
+        seen = {}
+        for override in overrides:
+            i = position.get(override["team_id"])
+            if i is None:
+                raise LookupError(f"Team {override['team_id']} not found")
+            c = col[override["week"]]
+            j = int(opponents[i, c])
+            if j < 0:
+                raise ValueError(f"Team {override['team_id']} has no matchup in week {override['week']}")
+            matchup = (override["week"], min(i, j))
+            if matchup in seen:
+                raise ValueError(f"Matchup of team {override['team_id']} in week {override['week']} is overridden twice")
+            seen[matchup] = override
+            self._apply(i, j, c, override)
+
+        self._compute(n_teams)
+
+    def _apply(self, i: int, j: int, c: int, override: dict):
+        score, opponent_score = override.get("score"), override.get("opponent_score")
+        if score is not None and opponent_score is not None:
+            self.scores[i, c], self.scores[j, c] = score, opponent_score
+            self.mov[i, c], self.mov[j, c] = score - opponent_score, opponent_score - score
+            self.scored[i, c] = self.scored[j, c] = True
+            outcome = np.sign(score - opponent_score)
+        elif override.get("result") in OUTCOME_CODES:
+            outcome = OUTCOME_CODES[override["result"]]
+            if np.sign(self.mov[i, c]) != outcome:
+                margin = outcome * max(abs(self.mov[i, c]), RESULT_ONLY_MARGIN)
+                self.mov[i, c], self.mov[j, c] = margin, -margin
+        else:
+            raise ValueError("Each override needs a result (W, L or T) or both score and opponent_score")
+        self.outcomes[i, c], self.outcomes[j, c] = outcome, -outcome
+
+    def _compute(self, n_teams: int):
+        base = self.base
+        old_outcomes = base.outcomes[:, self.cols]
+        old_scores = base.scores[:, self.cols]
+        opponents = base.opponents[:, self.cols]
+
+        # Records and points: base totals plus what the overridden columns change
+        self.wins = base.wins + (self.outcomes == 1).sum(axis=1) - (old_outcomes == 1).sum(axis=1)
+        self.losses = base.losses + (self.outcomes == -1).sum(axis=1) - (old_outcomes == -1).sum(axis=1)
+        self.ties = base.ties + (self.outcomes == 0).sum(axis=1) - (old_outcomes == 0).sum(axis=1)
+        # Rounded to the scores' own precision so float drift can't reorder ties
+        score_delta = self.scores - old_scores
+        self.points_for = np.round(base.points_for + score_delta.sum(axis=1), 2)
+        has_opponent = opponents >= 0
+        opponent_delta = np.where(has_opponent, score_delta[np.clip(opponents, 0, None), np.arange(len(self.cols))[None, :]], 0.0)
+        self.points_against = np.round(base.points_against + opponent_delta.sum(axis=1), 2)
+
+        # All-play: swap the overridden weeks' old contribution for the new one
+        old_counted = (old_outcomes != UNDECIDED).any(axis=0)
+        new_counted = self.scored.all(axis=0)
+        old_ap = _all_play(old_scores[:, old_counted])
+        new_ap = _all_play(self.scores[:, new_counted])
+        self.all_play_wins = base.all_play_wins - old_ap[0] + new_ap[0]
+        self.all_play_losses = base.all_play_losses - old_ap[1] + new_ap[1]
+        self.all_play_ties = base.all_play_ties - old_ap[2] + new_ap[2]
+
+        opponents_per_week = max(n_teams - 1, 1)
+        self.expected_wins = self.all_play_wins / opponents_per_week
+        self.luck = (self.wins + 0.5 * self.ties) - (self.expected_wins + 0.5 * self.all_play_ties / opponents_per_week)
+
+        games = self.wins + self.losses + self.ties
+        self.win_pct = np.divide(self.wins + 0.5 * self.ties, games, out=np.zeros(n_teams), where=games > 0)
+        outcomes = base.outcomes.copy()
+        outcomes[:, self.cols] = self.outcomes
+        faced = (outcomes != UNDECIDED) & (base.opponents >= 0)
+        opponent_pct = np.where(faced, self.win_pct[np.clip(base.opponents, 0, None)], 0.0)
+        faced_count = faced.sum(axis=1)
+        self.sos = np.divide(opponent_pct.sum(axis=1), faced_count, out=np.zeros(n_teams), where=faced_count > 0)
+        self.standings_order = np.lexsort((-self.points_for, -self.win_pct))
+
+    def power_scores(self, week: int) -> np.ndarray:
+        """
+        SeasonArrays.power_scores through `week`, with the overridden columns swapped in.
+        """
+        base = self.base
+        n_teams = len(base.teams)
+        week = max(min(week, base.scores.shape[1]), 1)
+        inside = self.cols < week
+        cols = self.cols[inside]
+
+        mov = base.mov[:, :week].copy()
+        mov[:, cols] = self.mov[:, inside]
+        scores = base.scores[:, :week].copy()
+        scores[:, cols] = self.scores[:, inside]
+        opponents = base.opponents[:, :week]
+        beat = (mov > 0) & (opponents >= 0)
+        rows = np.broadcast_to(np.arange(n_teams)[:, None], opponents.shape)
+        win_matrix = np.zeros((n_teams, n_teams))
+        np.add.at(win_matrix, (rows[beat], opponents[beat]), 1)
+        dominance = win_matrix @ win_matrix + win_matrix
+
+        # Summed from the swapped-in columns and rounded like SeasonArrays.power_scores
+        avg_score = np.round(scores.sum(axis=1), 2) / week
+        avg_mov = mov.sum(axis=1) / week
+        power = dominance.sum(axis=1).astype(np.int64) * 0.8 + np.trunc(avg_score) * 0.15 + np.trunc(avg_mov) * 0.05
+        return np.round(power, 2)
+
+    def power_order(self, week: int) -> tuple:
+        power = self.power_scores(week)
+        by_team_id = np.argsort(self.base.team_ids, kind="stable")
+        return by_team_id[np.argsort(-power[by_team_id], kind="stable")], power
+
+
+def _tiebreaker(scenario: Scenario, i: int, other: int) -> str:
+    """
+    What separates team i from the team ranked right below it.
+    """
+    if other is None:
+        return None
+    if scenario.win_pct[i] != scenario.win_pct[other]:
+        return "win_pct"
+    if scenario.points_for[i] != scenario.points_for[other]:
+        return "points_for"
+    return "league_order"
+
+
+def scenario_table(scenario: Scenario, week: int) -> list:
+    """
+    standings_table for a scenario, with rank changes against the real standings.
+    """
+    base = scenario.base
+    n_teams = len(base.teams)
+    base_rank = np.empty(n_teams, dtype=np.int64)
+    base_rank[base.standings_order] = np.arange(1, n_teams + 1)
+    power_idx, power = scenario.power_order(week)
+    power_rank = np.empty(n_teams, dtype=np.int64)
+    power_rank[power_idx] = np.arange(1, n_teams + 1)
+
+    order = scenario.standings_order.tolist()
+    rows = []
+    for rank, i in enumerate(order, start=1):
+        below = order[rank] if rank < len(order) else None
+        rows.append({
+            "rank": rank,
+            "rank_change": int(base_rank[i] - rank),
+            "team_id": int(base.team_ids[i]),
+            "team_name": base.team_names[i],
+            "wins": int(scenario.wins[i]),
+            "losses": int(scenario.losses[i]),
+            "ties": int(scenario.ties[i]),
+            "win_pct": round(float(scenario.win_pct[i]), 4),
+            "points_for": round(float(scenario.points_for[i]), 2),
+            "points_against": round(float(scenario.points_against[i]), 2),
+            "all_play_wins": int(scenario.all_play_wins[i]),
+            "all_play_losses": int(scenario.all_play_losses[i]),
+            "all_play_ties": int(scenario.all_play_ties[i]),
+            "expected_wins": round(float(scenario.expected_wins[i]), 3),
+            "luck": round(float(scenario.luck[i]), 3),
+            "strength_of_schedule": round(float(scenario.sos[i]), 4),
+            "power_score": float(power[i]),
+            "power_rank": int(power_rank[i]),
+            "tiebreaker": _tiebreaker(scenario, i, below),
+            "in_playoffs": rank <= base.playoff_team_count,
+        })
+    return rows
+
+
+@traced()
+def fetch_what_if(league_id: int, overrides: list, week: int = None, year: int = 2025) -> dict:
+    """
+    Standings and power rankings with hypothetical results for some matchups.
+    overrides: [{"week", "team_id", "result" (W/L/T) or "score" and "opponent_score"}].
+    Power rankings run through `week`, by default the latest overridden or current week.
+    Raises LookupError for unknown teams and ValueError for invalid overrides.
+    """
+    arrays = get_season_arrays(league_id, year)
+    scenario = Scenario(arrays, overrides)
+    week = week or max(scenario.weeks + [arrays.current_week])
+    return {
+        "week": week,
+        "overrides": len(overrides),
+        "standings": scenario_table(scenario, week),
+    }
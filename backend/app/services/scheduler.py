@@ -0,0 +1,204 @@
+import heapq
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from app.config import (
+    CURRENT_SEASON,
+    LEAGUE_CACHE_TTL,
+    SCHEDULER_LEAGUES,
+    SCHEDULER_WORKERS,
+    SCHEDULER_GAME_INTERVAL,
+    SCHEDULER_IDLE_INTERVAL,
+    SCHEDULER_MAX_BACKOFF,
+    SCHEDULER_INACTIVE_SECONDS,
+)
+from app.helper import league_access, refresh_league
+
+logger = logging.getLogger(__name__)
+
+NFL_TZ = ZoneInfo("America/New_York")
+# weekday (Mon=0) -> (start hour, end hour) in US Eastern when NFL games are live
+GAME_WINDOWS = {
+    0: (19, 24),   # Monday night
+    3: (19, 24),   # Thursday night
+    6: (9, 24),    # Sunday, from the international morning games
+}
+
+
+def in_game_window(now: datetime = None) -> bool:
+    now = (now or datetime.now(NFL_TZ)).astimezone(NFL_TZ)
+    window = GAME_WINDOWS.get(now.weekday())
+    return window is not None and window[0] <= now.hour < window[1]
+
+
+def refresh_interval(now: datetime = None) -> float:
+    return SCHEDULER_GAME_INTERVAL if in_game_window(now) else SCHEDULER_IDLE_INTERVAL
+
+
+class ScheduledLeague:
+    __slots__ = ("league_id", "year", "due", "failures", "last_refresh", "last_error", "running")
+
+    def __init__(self, league_id: int, year: int, due: float):
+        self.league_id = league_id
+        self.year = year
+        self.due = due
+        self.failures = 0
+        self.last_refresh = None
+        self.last_error = None
+        self.running = False
+
+
+class RefreshScheduler:
+    """
+    Keeps active leagues warm in the league cache. Leagues sit in a heap ordered by
+    next refresh time; a dispatcher hands due ones to a bounded worker pool. Refreshes
+    come often during NFL game windows, rarely otherwise, and back off exponentially
+    while ESPN is failing. Upstream calls also go through the global rate limiter.
+    """
+
+    def __init__(self, refresh=refresh_league, workers: int = SCHEDULER_WORKERS, interval=refresh_interval):
+        self.refresh = refresh
+        self.workers = workers
+        self.interval = interval
+        self._leagues = {}
+        self._heap = []                 # (due, league_id, year)
+        self._cond = threading.Condition()
+        self._slots = threading.Semaphore(workers)
+        self._executor = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def track(self, league_id: int, year: int = CURRENT_SEASON, due: float = None):
+        """
+        Adds a league to the schedule (no-op if already tracked). Past seasons don't change and are skipped.
+        """
+        if year < CURRENT_SEASON:
+            return
+        with self._cond:
+            if (league_id, year) in self._leagues:
+                return
+            due = due if due is not None else time.monotonic() + self.interval()
+            self._leagues[(league_id, year)] = ScheduledLeague(league_id, year, due)
+            heapq.heappush(self._heap, (due, league_id, year))
+            self._cond.notify()
+
+    def untrack(self, league_id: int, year: int):
+        with self._cond:
+            self._leagues.pop((league_id, year), None)
+
+    def _sync_active(self):
+        """
+        Picks up leagues requests have loaded since the last pass and drops ones nobody uses.
+        """
+        now = time.monotonic()
+        for key, accessed in list(league_access.items()):
+            league_id, year, _ = key
+            if now - accessed > SCHEDULER_INACTIVE_SECONDS:
+                if league_id not in SCHEDULER_LEAGUES:
+                    self.untrack(league_id, year)
+                # Forget it unless a request touched it since the scan started
+                if league_access.get(key) == accessed:
+                    league_access.pop(key, None)
+            else:
+                self.track(league_id, year)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._sync_active()
+            with self._cond:
+                timeout = 1.0
+                if self._heap:
+                    timeout = min(timeout, max(0.0, self._heap[0][0] - time.monotonic()))
+                if timeout > 0:
+                    self._cond.wait(timeout)
+                if self._stopped.is_set():
+                    return
+                due = []
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    _, league_id, year = heapq.heappop(self._heap)
+                    entry = self._leagues.get((league_id, year))
+                    # Skip untracked leagues and stale heap entries superseded by a reschedule
+                    if entry is not None and not entry.running and entry.due <= now:
+                        entry.running = True
+                        due.append(entry)
+
+            for entry in due:
+                self._slots.acquire()
+                if self._stopped.is_set():
+                    return
+                self._executor.submit(self._refresh, entry)
+
+    def _refresh(self, entry: ScheduledLeague):
+        interval = self.interval()
+        try:
+            # Keep the refreshed league cached until well past the next scheduled refresh
+            self.refresh(entry.league_id, entry.year, ttl=max(LEAGUE_CACHE_TTL, 2 * interval))
+            entry.failures = 0
+            entry.last_error = None
+            entry.last_refresh = time.time()
+            delay = interval
+        except Exception as e:
+            entry.failures += 1
+            entry.last_error = str(e)
+            delay = min(interval * 2 ** entry.failures, SCHEDULER_MAX_BACKOFF)
+            logger.warning("Scheduled refresh failed for league %s (%s), retrying in %.0fs: %s", entry.league_id, entry.year, delay, e)
+        finally:
+            self._slots.release()
+
+        # Jitter so leagues added together don't stay in lockstep
+        with self._cond:
+            entry.running = False
+            entry.due = time.monotonic() + delay * random.uniform(0.9, 1.1)
+            if (entry.league_id, entry.year) in self._leagues:
+                heapq.heappush(self._heap, (entry.due, entry.league_id, entry.year))
+                self._cond.notify()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="league-refresh")
+        for league_id in SCHEDULER_LEAGUES:
+            self.track(league_id, CURRENT_SEASON, due=time.monotonic())
+        self._thread = threading.Thread(target=self._run, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._slots.release()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._thread = None
+
+    def status(self) -> dict:
+        now = time.monotonic()
+        with self._cond:
+            leagues = [
+                {
+                    "league_id": e.league_id,
+                    "year": e.year,
+                    "next_refresh_in": round(max(0.0, e.due - now), 1),
+                    "last_refresh": e.last_refresh,
+                    "failures": e.failures,
+                    "last_error": e.last_error,
+                    "running": e.running,
+                }
+                for e in self._leagues.values()
+            ]
+        return {
+            "running": self._thread is not None,
+            "game_window": in_game_window(),
+            "interval": self.interval(),
+            "leagues": sorted(leagues, key=lambda l: l["next_refresh_in"]),
+        }
+
+
+scheduler = RefreshScheduler()
@@ -0,0 +1,162 @@
+import hashlib
+import math
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.config import SIM_WORKERS, SIM_SHARD_SIZE, SIM_MAX_SIMULATIONS
+from app.services.analytics import UNDECIDED, get_season_arrays
+from app.utils.cache import TTLCache
+from app.utils.metrics import traced
+
+# Results stay valid until the league's scores change, which changes the cache key
+odds_cache = TTLCache(default_ttl=24 * 3600, max_entries=64)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: workers must not inherit the parent's HTTP client threads
+            _pool = ProcessPoolExecutor(max_workers=SIM_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def bye_count(playoff_teams: int) -> int:
+    """
+    Top seeds that skip the first round in a single-elimination bracket.
+    """
+    if playoff_teams < 2:
+        return 0
+    return 2 ** math.ceil(math.log2(playoff_teams)) - playoff_teams
+
+
+def simulate_shard(inputs: dict, n_sims: int, seed) -> dict:
+    """
+    Simulates n_sims rest-of-season outcomes and returns summed playoff, bye,
+    seed and win counts. Pure NumPy so it can run in a worker process.
+    """
+    rng = np.random.default_rng(seed)
+    mu, sigma = inputs["mu"], inputs["sigma"]
+    opponents = inputs["opponents"]                          # (T, R), -1 = no game
+    n_teams, n_remaining = opponents.shape
+
+    # Sampled scores for every sim, team and remaining week: (S, T, R)
+    scores = rng.standard_normal(size=(n_sims, n_teams, n_remaining), dtype=np.float32)
+    scores = scores * sigma.astype(np.float32)[None, :, None] + mu.astype(np.float32)[None, :, None]
+    has_game = opponents >= 0
+    opp_scores = scores[:, np.clip(opponents, 0, None), np.arange(n_remaining)[None, :]]
+
+    wins = inputs["wins"][None, :] + ((scores > opp_scores) & has_game).sum(axis=2) \
+        + 0.5 * ((scores == opp_scores) & has_game).sum(axis=2)
+    points = inputs["points_for"][None, :] + (scores * has_game).sum(axis=2)
+
+    # Seed order: wins, then points for (ESPN's head-to-head tiebreaks are not modelled)
+    order = np.lexsort((-points, -wins), axis=-1)
+    seeds = np.argsort(order, axis=1)                         # (S, T): 0 = first seed
+
+    return {
+        "sims": n_sims,
+        "playoffs": (seeds < inputs["playoff_teams"]).sum(axis=0),
+        "byes": (seeds < inputs["byes"]).sum(axis=0),
+        "seeds": np.bincount((seeds + np.arange(n_teams) * n_teams).ravel(), minlength=n_teams * n_teams).reshape(n_teams, n_teams),
+        "wins": wins.sum(axis=0),
+    }
+
+
+def _simulation_inputs(arrays) -> dict:
+    reg_weeks = arrays.reg_season_count or arrays.scores.shape[1]
+    decided = arrays.outcomes != UNDECIDED
+    remaining = [w for w in range(min(reg_weeks, arrays.scores.shape[1])) if not decided[:, w].any()]
+
+    # Score model: each team's mean and spread over the games already played
+    played = np.where(decided, arrays.scores, np.nan)
+    games = decided.sum(axis=1)
+    league_mu = float(np.nanmean(played)) if decided.any() else 100.0
+    league_sigma = float(np.nanstd(played)) if decided.sum() > 1 else 25.0
+    with np.errstate(invalid="ignore"):
+        mu = np.where(games > 0, np.nanmean(played, axis=1), league_mu)
+        sigma = np.where(games > 1, np.nanstd(played, axis=1), league_sigma)
+    sigma = np.maximum(sigma, 1.0)
+
+    playoff_teams = int(getattr(arrays, "playoff_team_count", 0) or 0) or len(arrays.teams)
+    return {
+        "mu": mu,
+        "sigma": sigma,
+        "opponents": arrays.opponents[:, remaining],
+        "wins": (arrays.wins + 0.5 * arrays.ties).astype(np.float64),
+        "points_for": arrays.points_for,
+        "playoff_teams": playoff_teams,
+        "byes": bye_count(playoff_teams),
+        "remaining_weeks": [w + 1 for w in remaining],
+    }
+
+
+def run_simulation(inputs: dict, n_sims: int, seed: int = 0) -> dict:
+    """
+    Splits n_sims into fixed-size shards with independent seeded streams, so the
+    result depends only on (inputs, n_sims, seed), not on how many workers ran it.
+    """
+    shard_sizes = [SIM_SHARD_SIZE] * (n_sims // SIM_SHARD_SIZE)
+    if n_sims % SIM_SHARD_SIZE:
+        shard_sizes.append(n_sims % SIM_SHARD_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(shard_sizes))
+
+    if SIM_WORKERS > 1 and len(shard_sizes) > 1:
+        pool = _get_pool()
+        results = list(pool.map(simulate_shard, [inputs] * len(shard_sizes), shard_sizes, seeds))
+    else:
+        results = [simulate_shard(inputs, size, s) for size, s in zip(shard_sizes, seeds)]
+
+    total = {key: sum(r[key] for r in results) for key in ("sims", "playoffs", "byes", "seeds", "wins")}
+    return total
+
+
+def _scores_fingerprint(arrays) -> str:
+    digest = hashlib.sha1()
+    for array in (arrays.scores, arrays.outcomes, arrays.opponents):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+@traced()
+def fetch_playoff_odds(league_id: int, sims: int = 100_000, seed: int = 0, year: int = 2025):
+    """
+    Returns playoff, bye and seed probabilities per team from a seeded Monte Carlo
+    simulation of the remaining regular season.
+    """
+    sims = max(1, min(sims, SIM_MAX_SIMULATIONS))
+    arrays = get_season_arrays(league_id, year)
+    key = (league_id, year, _scores_fingerprint(arrays), sims, seed)
+
+    def build():
+        inputs = _simulation_inputs(arrays)
+        totals = run_simulation(inputs, sims, seed)
+        teams = []
+        for i, team_name in enumerate(arrays.team_names):
+            teams.append({
+                "team_id": int(arrays.team_ids[i]),
+                "team_name": team_name,
+                "wins": int(arrays.wins[i]),
+                "losses": int(arrays.losses[i]),
+                "projected_wins": round(float(totals["wins"][i]) / totals["sims"], 2),
+                "playoff_pct": round(float(totals["playoffs"][i]) / totals["sims"], 4),
+                "bye_pct": round(float(totals["byes"][i]) / totals["sims"], 4),
+                "seed_pct": [round(float(c) / totals["sims"], 4) for c in totals["seeds"][i]],
+            })
+        teams.sort(key=lambda t: (t["playoff_pct"], t["projected_wins"]), reverse=True)
+        return {
+            "simulations": totals["sims"],
+            "seed": seed,
+            "playoff_team_count": inputs["playoff_teams"],
+            "bye_count": inputs["byes"],
+            "remaining_weeks": inputs["remaining_weeks"],
+            "teams": teams,
+        }
+
+    return odds_cache.get_or_load(key, build)
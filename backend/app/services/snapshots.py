@@ -0,0 +1,153 @@
+import logging
+from typing import TYPE_CHECKING
+
+from app.config import ESPNS2, SWID, SNAPSHOT_BACKEND, SNAPSHOT_DIR, SNAPSHOT_MODE, ESPN_ASYNC_CLIENT
+from app.services.espn_client import espn_client, rate_limiter
+from app.utils.metrics import upstream_call
+from app.utils.file_utils import open_snapshot_store, snapshot_key
+
+if TYPE_CHECKING:
+    from espn_api.football import League
+
+logger = logging.getLogger(__name__)
+
+# Snapshot modes for SnapshotRequests
+LIVE = "live"        # always call ESPN, record every payload
+PREFER = "prefer"    # serve recorded payloads, fall back to ESPN on a miss
+REPLAY = "replay"    # recorded payloads only, never call ESPN
+
+snapshot_store = open_snapshot_store(SNAPSHOT_BACKEND, SNAPSHOT_DIR)
+
+
+class SnapshotMiss(Exception):
+    """
+    Raised in replay mode when a request has no recorded payload.
+    """
+
+
+class SnapshotRequests:
+    """
+    Mixin over espn_api's EspnFantasyRequests that records every raw JSON payload
+    in the snapshot store and can answer requests from it instead of calling ESPN.
+    The concrete class is composed with the wrapped object's own type, so espn_api
+    (and the requests library under it) is only imported once a League is built.
+    """
+
+    _classes = {}
+
+    @classmethod
+    def wrap(cls, inner, league_id: int, year: int, mode: str = LIVE, store=None):
+        base = type(inner)
+        combined = cls._classes.get(base)
+        if combined is None:
+            combined = cls._classes.setdefault(base, type(f"Snapshot{base.__name__}", (cls, base), {}))
+        wrapped = combined.__new__(combined)
+        wrapped.__dict__.update(inner.__dict__)
+        wrapped.snapshot_league_id = league_id
+        wrapped.snapshot_year = year
+        wrapped.mode = mode
+        wrapped.store = store if store is not None else snapshot_store
+        return wrapped
+
+    def league_get(self, params: dict = None, headers: dict = None, extend: str = ""):
+        return self._fetch("league", params, headers, extend, self._upstream_league_get)
+
+    def get(self, params: dict = None, headers: dict = None, extend: str = ""):
+        return self._fetch("base", params, headers, extend, self._upstream_get)
+
+    def _upstream_league_get(self, params=None, headers=None, extend=""):
+        if not ESPN_ASYNC_CLIENT:
+            rate_limiter.acquire()
+            return super().league_get(params=params, headers=headers, extend=extend)
+        response = espn_client.get_sync(self.LEAGUE_ENDPOINT + extend, params=params, headers=headers, cookies=self.cookies)
+        # checkRequestStatus may retry on espn_api's alternate endpoint and hand back that payload
+        alternate = self.checkRequestStatus(response.status_code, extend=extend, params=params, headers=headers)
+        data = alternate if alternate else response.json()
+        return data[0] if isinstance(data, list) else data
+
+    def _upstream_get(self, params=None, headers=None, extend=""):
+        if not ESPN_ASYNC_CLIENT:
+            rate_limiter.acquire()
+            return super().get(params=params, headers=headers, extend=extend)
+        response = espn_client.get_sync(self.ENDPOINT + extend, params=params, headers=headers, cookies=self.cookies)
+        if response.status_code == 404:
+            return self.checkRequestStatus(response.status_code, extend=extend)
+        self.checkRequestStatus(response.status_code)
+        return response.json()
+
+    def _fetch(self, kind: str, params, headers, extend: str, upstream):
+        request = {"kind": kind, "extend": extend, "params": params or {}, "headers": headers or {}}
+        key = snapshot_key(request)
+
+        if self.mode in (PREFER, REPLAY):
+            payload = self.store.load(self.snapshot_league_id, self.snapshot_year, key)
+            if payload is not None:
+                return payload
+            if self.mode == REPLAY:
+                raise SnapshotMiss(f"No snapshot for league {self.snapshot_league_id} ({self.snapshot_year}): {request}")
+
+        with upstream_call(kind):
+            payload = upstream(params=params, headers=headers, extend=extend)
+        try:
+            self.store.save(self.snapshot_league_id, self.snapshot_year, key, request, payload)
+        except Exception as e:
+            # A failed write must never fail the request that fetched the data
+            logger.warning("Could not save snapshot for league %s: %s", self.snapshot_league_id, e)
+        return payload
+
+
+async def afetch_league_get(league_id: int, year: int = 2025, params: dict = None, headers: dict = None, extend: str = ""):
+    """
+    Async equivalent of SnapshotRequests.league_get in live mode: awaits the pooled
+    client directly and records the payload under the same snapshot key. With
+    SNAPSHOT_MODE=replay it only serves recorded payloads.
+    """
+    request = {"kind": "league", "extend": extend, "params": params or {}, "headers": headers or {}}
+    if SNAPSHOT_MODE == REPLAY:
+        payload = snapshot_store.load(league_id, year, snapshot_key(request))
+        if payload is None:
+            raise SnapshotMiss(f"No snapshot for league {league_id} ({year}): {request}")
+        return payload
+
+    from espn_api.requests.espn_requests import EspnFantasyRequests
+
+    cookies = {"espn_s2": ESPNS2, "SWID": SWID} if ESPNS2 and SWID else None
+    requests = EspnFantasyRequests(sport="nfl", year=year, league_id=league_id, cookies=cookies)
+
+    with upstream_call("league"):
+        response = await espn_client.get(requests.LEAGUE_ENDPOINT + extend, params=params, headers=headers, cookies=cookies)
+        alternate = requests.checkRequestStatus(response.status_code, extend=extend, params=params, headers=headers)
+        data = alternate if alternate else response.json()
+    payload = data[0] if isinstance(data, list) else data
+
+    try:
+        snapshot_store.save(league_id, year, snapshot_key(request), request, payload)
+    except Exception as e:
+        logger.warning("Could not save snapshot for league %s: %s", league_id, e)
+    return payload
+
+
+def build_league(league_id: int, year: int = 2025, mode: str = LIVE, debug: bool = False) -> "League":
+    """
+    Hydrates a League whose upstream requests go through the snapshot store.
+    """
+    from espn_api.football import League
+
+    league = League(
+        league_id=league_id,
+        year=year,
+        espn_s2=ESPNS2,
+        swid=SWID,
+        fetch_league=False,
+        debug=debug
+    )
+    league.espn_request = SnapshotRequests.wrap(league.espn_request, league_id, year, mode=mode)
+    league.fetch_league()
+    return league
+
+
+def list_snapshots(league_id: int, year: int = 2025) -> list:
+    """
+    Returns metadata for every recorded payload of a league season.
+    """
+    return snapshot_store.entries(league_id, year)
@@ -0,0 +1,103 @@
+import asyncio
+import importlib
+import logging
+import time
+from contextlib import contextmanager
+
+from app.config import WARMUP_LEAGUES, WARMUP_TIMEOUT
+from app.helper import aget_league
+from app.services.analytics import season_arrays
+from app.services.espn_client import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Modules kept out of app import (see helper.get_league and snapshots.build_league);
+# the warm-up loads them so the first request doesn't pay for it
+DEFERRED_IMPORTS = ("espn_api.requests.espn_requests", "espn_api.football")
+
+
+class StartupState:
+    """
+    Startup phase timings and warm-up results, reported by /ready.
+    Times are measured from `started`, which app.main sets before its imports.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = {}           # phase -> seconds
+        self.leagues = {}          # "league_id:year" -> {"seconds", "error"}
+        self.ready = False
+        self.ready_seconds = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - start
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = seconds
+
+    def mark_ready(self):
+        self.ready_seconds = time.perf_counter() - self.started
+        self.ready = True
+        logger.info("Ready after %.2fs (%s)", self.ready_seconds, ", ".join(f"{k} {v:.2f}s" for k, v in self.phases.items()))
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready,
+            "uptime_seconds": round(time.perf_counter() - self.started, 3),
+            "ready_seconds": round(self.ready_seconds, 3) if self.ready_seconds is not None else None,
+            "phases": {name: round(seconds, 3) for name, seconds in self.phases.items()},
+            "leagues": self.leagues,
+        }
+
+    def collect(self) -> list:
+        """
+        Metrics collector: readiness and phase timings as gauges.
+        """
+        return [
+            ("startup_ready", "gauge", "1 once startup warm-up has finished", [({}, int(self.ready))]),
+            ("startup_phase_seconds", "gauge", "Seconds spent in each startup phase", [({"phase": k}, round(v, 4)) for k, v in self.phases.items()]),
+        ]
+
+
+state = StartupState()
+
+
+def _import_deferred():
+    for name in DEFERRED_IMPORTS:
+        importlib.import_module(name)
+
+
+async def _warm_league(league_id: int, year: int, timeout: float):
+    start = time.perf_counter()
+    error = None
+    try:
+        league = await asyncio.wait_for(aget_league(league_id, year), timeout)
+        # Analytics endpoints share these arrays; build them before the first request does
+        await run_blocking(season_arrays, league)
+    except Exception as e:
+        # An unreachable league shouldn't keep the worker out of rotation
+        error = str(e) or type(e).__name__
+        logger.warning("Warm-up failed for league %s (%s): %s", league_id, year, error)
+    state.leagues[f"{league_id}:{year}"] = {"seconds": round(time.perf_counter() - start, 3), "error": error}
+
+
+async def warm_up(leagues: list = None, timeout: float = None):
+    """
+    Loads the deferred imports, then every configured league (from its snapshot
+    when one exists, otherwise from ESPN) concurrently, and marks the app ready.
+    """
+    leagues = WARMUP_LEAGUES if leagues is None else leagues
+    timeout = timeout or WARMUP_TIMEOUT
+    try:
+        with state.phase("deferred_imports"):
+            await run_blocking(_import_deferred)
+        with state.phase("warmup"):
+            await asyncio.gather(*(_warm_league(league_id, year, timeout) for league_id, year in leagues))
+    except Exception:
+        logger.exception("Startup warm-up failed")
+    state.mark_ready()
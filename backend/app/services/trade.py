@@ -0,0 +1,155 @@
+import threading
+import weakref
+
+import numpy as np
+
+from app.helper import get_league
+from app.services.lineup import best_assignment, eligibility_matrix, starter_slots
+
+# Players ruled out this week project zero for it
+OUT_STATUSES = {"OUT", "INJURY_RESERVE", "SUSPENSION"}
+
+
+def weekly_projections(player, weeks: list, current_week: int) -> np.ndarray:
+    """
+    Projected points per remaining week: ESPN's weekly projection when available,
+    otherwise the season projected (or actual) average, and zero on bye weeks.
+    """
+    stats = getattr(player, "stats", {}) or {}
+    schedule = getattr(player, "schedule", {}) or {}
+    fallback = getattr(player, "projected_avg_points", 0) or getattr(player, "avg_points", 0) or 0.0
+
+    values = np.zeros(len(weeks))
+    for i, week in enumerate(weeks):
+        if schedule and week not in schedule and str(week) not in schedule:
+            continue  # bye week
+        if week == current_week and getattr(player, "injuryStatus", None) in OUT_STATUSES:
+            continue
+        values[i] = stats.get(week, {}).get("projected_points", fallback)
+    return values
+
+
+class TeamState:
+    """
+    One team's roster with per-week projections and its optimal weekly lineup points.
+    """
+
+    def __init__(self, team_id: int, team_name: str, players: list, slots: list):
+        self.team_id = team_id
+        self.team_name = team_name
+        self.players = players
+        self.eligible = eligibility_matrix(players, slots)
+        projections = [p["projections"] for p in players]
+        self.projections = np.vstack(projections) if projections else np.zeros((0, 0))
+        self.weekly_points = np.array([
+            best_assignment(self.eligible, self.projections[:, w])[1] if players else 0.0
+            for w in range(self.projections.shape[1] if players else 0)
+        ])
+
+    def with_roster(self, players: list, slots: list) -> "TeamState":
+        return TeamState(self.team_id, self.team_name, players, slots)
+
+    def summary(self, weeks: list) -> dict:
+        weekly = self.weekly_points if len(self.weekly_points) else np.zeros(len(weeks))
+        return {
+            "rest_of_season_points": round(float(weekly.sum()), 2),
+            "weekly_points": [{"week": w, "points": round(float(p), 2)} for w, p in zip(weeks, weekly)],
+        }
+
+
+class LeagueProjections:
+    """
+    Rest-of-season projection state for every team of one League snapshot.
+    Team states are built lazily and reused, so a trade only re-solves the two rosters it touches.
+    """
+
+    def __init__(self, league):
+        self.league = league
+        settings = league.settings
+        self.slots = starter_slots(getattr(settings, "position_slot_counts", {}))
+        current_week = league.current_week
+        last_week = getattr(settings, "reg_season_count", 0) or current_week
+        self.current_week = current_week
+        self.weeks = list(range(current_week, last_week + 1))
+        self._teams = {team.team_id: team for team in league.teams}
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def _player_row(self, player) -> dict:
+        return {
+            "player_id": player.playerId,
+            "name": player.name,
+            "position": player.position,
+            "eligible_slots": player.eligibleSlots,
+            "projections": weekly_projections(player, self.weeks, self.current_week),
+        }
+
+    def team_state(self, team_id: int):
+        with self._lock:
+            state = self._states.get(team_id)
+        if state is not None:
+            return state
+
+        team = self._teams.get(team_id)
+        if team is None:
+            return None
+        players = [self._player_row(p) for p in team.roster]
+        state = TeamState(team.team_id, team.team_name, players, self.slots)
+        with self._lock:
+            self._states.setdefault(team_id, state)
+        return state
+
+
+_projections = weakref.WeakKeyDictionary()
+_projections_lock = threading.Lock()
+
+
+def league_projections(league) -> LeagueProjections:
+    with _projections_lock:
+        projections = _projections.get(league)
+        if projections is None:
+            projections = LeagueProjections(league)
+            _projections[league] = projections
+        return projections
+
+
+def simulate_trade(league_id: int, team_id: int, partner_team_id: int, send: list, receive: list, year: int = 2025):
+    """
+    Recomputes both teams' optimal weekly lineups and rest-of-season projected
+    points after team_id sends `send` player ids for partner_team_id's `receive`.
+    Raises LookupError for unknown teams and ValueError for players not on the expected roster.
+    """
+    projections = league_projections(get_league(league_id, year))
+    team = projections.team_state(team_id)
+    partner = projections.team_state(partner_team_id)
+    if team is None or partner is None:
+        raise LookupError("Team not found")
+    if team_id == partner_team_id:
+        raise ValueError("A team cannot trade with itself")
+
+    send, receive = set(send), set(receive)
+    outgoing = [p for p in team.players if p["player_id"] in send]
+    incoming = [p for p in partner.players if p["player_id"] in receive]
+    if len(outgoing) != len(send):
+        raise ValueError(f"Players {sorted(send - {p['player_id'] for p in outgoing})} are not on team {team_id}")
+    if len(incoming) != len(receive):
+        raise ValueError(f"Players {sorted(receive - {p['player_id'] for p in incoming})} are not on team {partner_team_id}")
+
+    team_after = team.with_roster([p for p in team.players if p["player_id"] not in send] + incoming, projections.slots)
+    partner_after = partner.with_roster([p for p in partner.players if p["player_id"] not in receive] + outgoing, projections.slots)
+
+    results = []
+    for before, after, gave, got in ((team, team_after, outgoing, incoming), (partner, partner_after, incoming, outgoing)):
+        before_summary = before.summary(projections.weeks)
+        after_summary = after.summary(projections.weeks)
+        results.append({
+            "team_id": before.team_id,
+            "team_name": before.team_name,
+            "sends": [{"player_id": p["player_id"], "name": p["name"], "position": p["position"]} for p in gave],
+            "receives": [{"player_id": p["player_id"], "name": p["name"], "position": p["position"]} for p in got],
+            "before": before_summary,
+            "after": after_summary,
+            "rest_of_season_delta": round(after_summary["rest_of_season_points"] - before_summary["rest_of_season_points"], 2),
+        })
+
+    return {"weeks": projections.weeks, "teams": results}
@@ -0,0 +1,202 @@
+import threading
+import weakref
+
+import numpy as np
+
+from app.helper import get_league
+from app.models.records import league_records
+from app.services.draft_analysis import replacement_levels, starters_per_position
+from app.services.free_agent_index import get_free_agent_index
+from app.services.lineup import best_assignment, eligibility_matrix, starter_slots
+from app.utils.metrics import traced
+
+# Players on these slots can't be dropped to make room
+UNDROPPABLE_SLOTS = {"IR"}
+# Upgrading free agents re-solved exactly with the lineup optimizer, per team
+MAX_REFINE = 100
+
+
+def _value(row: dict) -> float:
+    return float(row.get("projected_avg_points") or 0.0)
+
+
+class WaiverBoard:
+    """
+    Waiver targets for every team of one League snapshot and free agent pool.
+
+    All (team, free agent) pairs are screened at once: gain[t, f] is how much free
+    agent f out-projects the weakest starter of team t in any slot f may fill. The
+    most promising candidates per team are then re-solved exactly with the lineup
+    optimizer, which also catches gains from moving a starter into a flex slot.
+    """
+
+    def __init__(self, league, free_agents: list, version=None):
+        self.version = version
+        self.slots = starter_slots(getattr(league.settings, "position_slot_counts", {}))
+        records = league_records(league)
+        self.teams = list(records.teams.values())
+        self._team_index = {team.team_id: i for i, team in enumerate(self.teams)}
+
+        self.free_agents = [row for row in free_agents if row.get("eligible_slots")]
+        self.fa_values = np.array([_value(row) for row in self.free_agents])
+        self.fa_eligible = eligibility_matrix(self.free_agents, self.slots)     # (slots, F)
+
+        self._rosters = []
+        starters = np.zeros((len(self.teams), len(self.slots)))
+        for i, team in enumerate(self.teams):
+            players = [
+                {
+                    "player_id": p.player_id,
+                    "name": p.name,
+                    "position": p.position,
+                    "eligible_slots": p.eligible_slots,
+                    "lineup_slot": p.lineup_slot,
+                    "projected_avg_points": p.projected_avg_points,
+                }
+                for p in team.roster
+            ]
+            values = np.array([_value(p) for p in players])
+            eligible = eligibility_matrix(players, self.slots)
+            assignment, total = best_assignment(eligible, values)
+            filled = assignment >= 0
+            starters[i, filled] = values[assignment[filled]]
+            self._rosters.append((players, values, eligible, assignment, total))
+        self.starters = starters
+
+        # Replacement level per position from every rostered player in the league
+        rostered = [p for players, *_ in self._rosters for p in players]
+        self.replacement = replacement_levels(
+            np.array([p["position"] or "" for p in rostered], dtype=object),
+            np.array([_value(p) for p in rostered]),
+            max(len(self.teams), 1),
+            starters_per_position(getattr(league.settings, "position_slot_counts", {})),
+        )
+
+        if len(self.slots) and len(self.free_agents):
+            upgrade = self.fa_values[None, None, :] - starters[:, :, None]                 # (T, slots, F)
+            upgrade = np.where(self.fa_eligible[None, :, :], upgrade, -np.inf)
+            self.replaces = upgrade.argmax(axis=1)                                          # (T, F) slot index
+            self.gain = np.maximum(upgrade.max(axis=1), 0.0)                                # (T, F)
+        else:
+            self.replaces = np.zeros((len(self.teams), len(self.free_agents)), dtype=np.int64)
+            self.gain = np.zeros((len(self.teams), len(self.free_agents)))
+
+        self._targets = {}
+        self._lock = threading.Lock()
+
+    def _exact_gain(self, i: int, f: int) -> float:
+        players, values, eligible, _, total = self._rosters[i]
+        with_fa = np.hstack([eligible, self.fa_eligible[:, f:f + 1]])
+        return best_assignment(with_fa, np.append(values, self.fa_values[f]))[1] - total
+
+    def _drop_candidate(self, i: int) -> dict:
+        players, values, _, assignment, _ = self._rosters[i]
+        started = set(assignment[assignment >= 0].tolist())
+        bench = [j for j in range(len(players)) if j not in started and players[j]["lineup_slot"] not in UNDROPPABLE_SLOTS]
+        if not bench:
+            return None
+        j = min(bench, key=lambda j: values[j])
+        return {"player_id": players[j]["player_id"], "name": players[j]["name"], "position": players[j]["position"], "projected_avg_points": round(float(values[j]), 2)}
+
+    def _ranked(self, i: int) -> list:
+        """
+        Every free agent for team i: those that upgrade the lineup (the best MAX_REFINE
+        re-solved exactly) by lineup gain, then the rest by value over replacement.
+        Computed once per team and board.
+        """
+        with self._lock:
+            ranked = self._targets.get(i)
+        if ranked is not None:
+            return ranked
+
+        players, _, _, assignment, _ = self._rosters[i]
+        order = np.lexsort((-self.fa_values, -self.gain[i]))
+        refine = set(order[:MAX_REFINE][self.gain[i, order[:MAX_REFINE]] > 0].tolist())
+        ranked = []
+        for f in order.tolist():
+            row = self.free_agents[f]
+            gain = self._exact_gain(i, f) if f in refine else 0.0
+            slot = int(self.replaces[i, f])
+            replaced = int(assignment[slot]) if gain > 0 else -1
+            ranked.append({
+                "player_id": row["player_id"],
+                "name": row["name"],
+                "position": row["position"],
+                "pro_team": row.get("pro_team"),
+                "injury_status": row.get("injury_status"),
+                "percent_owned": row.get("percent_owned"),
+                "projected_avg_points": round(float(self.fa_values[f]), 2),
+                "value_over_replacement": round(float(self.fa_values[f] - self.replacement.get(row["position"], 0.0)), 2),
+                "lineup_gain": round(float(gain), 2),
+                "replaces": players[replaced]["name"] if replaced >= 0 else None,
+                "slot": self.slots[slot] if gain > 0 else None,
+            })
+        ranked.sort(key=lambda r: (r["lineup_gain"], r["value_over_replacement"]), reverse=True)
+        with self._lock:
+            self._targets.setdefault(i, ranked)
+        return ranked
+
+    def targets(self, team_id: int, limit: int = 10, positions: set = None) -> dict:
+        i = self._team_index.get(team_id)
+        if i is None:
+            return None
+        team = self.teams[i]
+        ranked = [r for r in self._ranked(i) if not positions or r["position"] in positions]
+        return {
+            "team_id": team.team_id,
+            "team_name": team.team_name,
+            "starting_points": round(float(self._rosters[i][4]), 2),
+            "drop_candidate": self._drop_candidate(i),
+            "targets": ranked[:limit],
+        }
+
+
+_boards = weakref.WeakKeyDictionary()
+_boards_lock = threading.Lock()
+
+
+def waiver_board(league_id: int, year: int = 2025) -> WaiverBoard:
+    """
+    The WaiverBoard for the cached league, rebuilt only when the league snapshot or
+    its free agent pool changes.
+    """
+    league = get_league(league_id, year)
+    index = get_free_agent_index(league_id, year)
+    version, rows = index.snapshot()
+    version = (id(index), version)
+    with _boards_lock:
+        board = _boards.get(league)
+    if board is None or board.version != version:
+        board = WaiverBoard(league, rows, version)
+        with _boards_lock:
+            _boards[league] = board
+    return board
+
+
+def _parse_positions(position: str = None) -> set:
+    return {p.strip().upper() for p in position.split(",") if p.strip()} if position else None
+
+
+@traced()
+def fetch_waiver_targets(league_id: int, team_id: int, limit: int = 10, position: str = None, year: int = 2025) -> dict:
+    """
+    Free agents ranked by how much they would improve one team's projected starting lineup.
+    """
+    board = waiver_board(league_id, year)
+    result = board.targets(team_id, limit, _parse_positions(position))
+    if result is not None:
+        result["replacement_levels"] = {k: round(v, 2) for k, v in board.replacement.items()}
+    return result
+
+
+@traced()
+def fetch_all_waiver_targets(league_id: int, limit: int = 5, position: str = None, year: int = 2025) -> dict:
+    """
+    Waiver targets for every team from one shared board.
+    """
+    board = waiver_board(league_id, year)
+    positions = _parse_positions(position)
+    return {
+        "replacement_levels": {k: round(v, 2) for k, v in board.replacement.items()},
+        "teams": [board.targets(team.team_id, limit, positions) for team in board.teams],
+    }
@@ -0,0 +1,465 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.config import WAREHOUSE_DIR, CURRENT_SEASON, ACTIVITY_PAGE_SIZE
+from app.services import snapshots
+
+logger = logging.getLogger(__name__)
+
+# Bump when the table layout changes; older seasons must be re-ingested
+WAREHOUSE_SCHEMA_VERSION = 1
+MAX_ACTIVITY_ITEMS = 5000
+
+# Column name -> dtype for each table. Strings live in meta.json and are referenced by index/id.
+TABLES = {
+    "teams": {
+        "team_id": np.int64, "wins": np.int64, "losses": np.int64, "ties": np.int64,
+        "points_for": np.float64, "points_against": np.float64, "final_standing": np.int64,
+    },
+    "matchups": {
+        "week": np.int64, "home_team_id": np.int64, "away_team_id": np.int64,
+        "home_score": np.float64, "away_score": np.float64, "playoff": np.bool_,
+    },
+    "lineups": {
+        "week": np.int64, "team_id": np.int64, "player_id": np.int64, "slot": np.int64,
+        "points": np.float64, "projected_points": np.float64,
+    },
+    "draft": {
+        "overall": np.int64, "round": np.int64, "round_pick": np.int64, "team_id": np.int64,
+        "player_id": np.int64, "bid_amount": np.float64, "keeper": np.bool_,
+    },
+    "activity": {
+        "date": np.int64, "team_id": np.int64, "player_id": np.int64, "action": np.int64, "bid_amount": np.float64,
+    },
+}
+
+
+def _columns(table: str, rows: list) -> dict:
+    """
+    Turns a list of row tuples (in TABLES column order) into typed column arrays.
+    """
+    spec = TABLES[table]
+    if not rows:
+        return {name: np.zeros(0, dtype=dtype) for name, dtype in spec.items()}
+    transposed = list(zip(*rows))
+    return {name: np.asarray(values, dtype=dtype) for (name, dtype), values in zip(spec.items(), transposed)}
+
+
+class _Interner:
+    """
+    Maps strings to stable small ints for storage in integer columns.
+    """
+
+    def __init__(self):
+        self.values = []
+        self._index = {}
+
+    def __call__(self, value) -> int:
+        value = "" if value is None else str(value)
+        i = self._index.get(value)
+        if i is None:
+            i = self._index[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+
+def extract_season(league) -> tuple:
+    """
+    Pulls teams, matchups, box-score lineups, draft and activity for one season
+    into column arrays plus a JSON-able meta dict of names.
+    """
+    reg_season = int(getattr(league.settings, "reg_season_count", 0) or 0)
+    players = {}
+    slots, actions = _Interner(), _Interner()
+
+    def remember(player):
+        player_id = getattr(player, "playerId", None)
+        if player_id is not None and player_id not in players:
+            players[player_id] = [getattr(player, "name", None), getattr(player, "position", None)]
+        return player_id if player_id is not None else -1
+
+    teams, matchups, seen = [], [], set()
+    for team in league.teams:
+        teams.append((
+            team.team_id, team.wins, team.losses, getattr(team, "ties", 0),
+            getattr(team, "points_for", 0.0), getattr(team, "points_against", 0.0),
+            getattr(team, "final_standing", 0) or 0,
+        ))
+        scores = getattr(team, "scores", []) or []
+        for week, opponent in enumerate(getattr(team, "schedule", []) or [], start=1):
+            pair = (week, *sorted((team.team_id, opponent.team_id)))
+            if pair in seen or week > len(scores) or opponent.team_id == team.team_id:
+                continue
+            seen.add(pair)
+            opponent_scores = getattr(opponent, "scores", []) or []
+            matchups.append((
+                week, team.team_id, opponent.team_id, scores[week - 1],
+                opponent_scores[week - 1] if week <= len(opponent_scores) else 0.0,
+                bool(reg_season and week > reg_season),
+            ))
+        for player in getattr(team, "roster", []):
+            remember(player)
+
+    lineups = []
+    if league.year >= 2019:
+        last_week = int(getattr(league, "current_week", 0) or 0)
+        for week in range(1, last_week + 1):
+            try:
+                box_scores = league.box_scores(week)
+            except Exception as e:
+                logger.warning("Skipping box scores for %s week %s: %s", league.year, week, e)
+                continue
+            for box in box_scores:
+                for side in ("home", "away"):
+                    team = getattr(box, f"{side}_team", None)
+                    if not getattr(team, "team_id", None):
+                        continue
+                    for player in getattr(box, f"{side}_lineup", []):
+                        lineups.append((
+                            week, team.team_id, remember(player), slots(player.slot_position),
+                            player.points or 0.0, player.projected_points or 0.0,
+                        ))
+
+    draft = []
+    for overall, pick in enumerate(getattr(league, "draft", []) or [], start=1):
+        player_id = pick.playerId if pick.playerId is not None else -1
+        if player_id not in players and player_id != -1:
+            players[player_id] = [pick.playerName, None]
+        draft.append((
+            overall, pick.round_num or 0, pick.round_pick or 0, getattr(pick.team, "team_id", -1) or -1,
+            player_id, pick.bid_amount or 0, bool(pick.keeper_status),
+        ))
+
+    activity = []
+    if league.year >= 2019:
+        offset = 0
+        while offset < MAX_ACTIVITY_ITEMS:
+            try:
+                page = league.recent_activity(size=ACTIVITY_PAGE_SIZE, offset=offset)
+            except Exception as e:
+                logger.warning("Skipping activity for %s: %s", league.year, e)
+                break
+            for item in page:
+                for action in item.actions:
+                    if len(action) < 3:
+                        continue
+                    team, kind, player = action[:3]
+                    bid = action[3] if len(action) > 3 else 0
+                    activity.append((item.date, getattr(team, "team_id", -1) or -1, remember(player), actions(kind), bid or 0))
+            if len(page) < ACTIVITY_PAGE_SIZE:
+                break
+            offset += len(page)
+
+    tables = {
+        "teams": _columns("teams", teams),
+        "matchups": _columns("matchups", matchups),
+        "lineups": _columns("lineups", lineups),
+        "draft": _columns("draft", draft),
+        "activity": _columns("activity", activity),
+    }
+    meta = {
+        "schema_version": WAREHOUSE_SCHEMA_VERSION,
+        "year": league.year,
+        "ingested_at": time.time(),
+        "reg_season_count": reg_season,
+        "position_slot_counts": dict(getattr(league.settings, "position_slot_counts", {}) or {}),
+        "teams": {str(t.team_id): t.team_name for t in league.teams},
+        "players": {str(k): v for k, v in players.items()},
+        "slots": slots.values,
+        "actions": actions.values,
+    }
+    return tables, meta
+
+
+def season_dir(league_id: int, year: int, root: str = WAREHOUSE_DIR) -> Path:
+    return Path(root) / str(league_id) / str(year)
+
+
+def write_season(league_id: int, year: int, tables: dict, meta: dict, root: str = WAREHOUSE_DIR) -> Path:
+    """
+    Writes one season as <table>.<column>.npy files plus meta.json, swapped in atomically.
+    """
+    final = season_dir(league_id, year, root)
+    tmp = final.with_name(f".{year}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for table, columns in tables.items():
+        for column, values in columns.items():
+            np.save(tmp / f"{table}.{column}.npy", values, allow_pickle=False)
+    (tmp / "meta.json").write_text(json.dumps(meta, separators=(",", ":")))
+
+    old = final.with_name(f".{year}.{os.getpid()}.old")
+    if final.exists():
+        os.replace(final, old)
+    os.replace(tmp, final)
+    shutil.rmtree(old, ignore_errors=True)
+    return final
+
+
+class SeasonData:
+    """
+    One ingested season; column arrays are memory-mapped on first use.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.meta = json.loads((path / "meta.json").read_text())
+        self.year = int(self.meta["year"])
+        self._tables = {}
+
+    def table(self, name: str) -> dict:
+        columns = self._tables.get(name)
+        if columns is None:
+            columns = {
+                column: np.load(self.path / f"{name}.{column}.npy", mmap_mode="r", allow_pickle=False)
+                for column in TABLES[name]
+            }
+            self._tables[name] = columns
+        return columns
+
+    def team_name(self, team_id: int) -> str:
+        return self.meta["teams"].get(str(team_id))
+
+    def player(self, player_id: int) -> list:
+        return self.meta["players"].get(str(player_id), [None, None])
+
+
+def _dir_mtime(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class Warehouse:
+    """
+    Every ingested season of one league, read from disk without calling ESPN.
+    """
+
+    def __init__(self, league_id: int, root: str = WAREHOUSE_DIR):
+        self.league_id = league_id
+        self.root = Path(root) / str(league_id)
+        # write_season swaps season directories in by rename, which bumps this
+        self.mtime = _dir_mtime(self.root)
+        self.seasons = {}
+        for path in sorted(self.root.glob("[0-9]*")):
+            try:
+                season = SeasonData(path)
+            except (OSError, ValueError, KeyError):
+                continue
+            if season.meta.get("schema_version") == WAREHOUSE_SCHEMA_VERSION:
+                self.seasons[season.year] = season
+
+    def years(self) -> list:
+        return sorted(self.seasons)
+
+
+_warehouses = {}
+_warehouses_lock = threading.Lock()
+
+
+def get_warehouse(league_id: int) -> Warehouse:
+    """
+    The league's Warehouse, re-scanned whenever its directory changes, so seasons
+    ingested by the CLI in another process show up without a restart.
+    """
+    with _warehouses_lock:
+        warehouse = _warehouses.get(league_id)
+        if warehouse is None or warehouse.mtime != _dir_mtime(warehouse.root):
+            warehouse = _warehouses[league_id] = Warehouse(league_id)
+        return warehouse
+
+
+def ingest_season(league_id: int, year: int) -> dict:
+    league = snapshots.build_league(league_id, year, mode=snapshots.PREFER)
+    tables, meta = extract_season(league)
+    write_season(league_id, year, tables, meta)
+    with _warehouses_lock:
+        _warehouses.pop(league_id, None)
+    return {"year": year, **{table: len(next(iter(columns.values()))) for table, columns in tables.items()}}
+
+
+def ingest_league(league_id: int, years: list = None) -> list:
+    """
+    Ingests the given seasons, or every past season ESPN lists for the league.
+    Past seasons go through the snapshot store in prefer mode, so re-running is cheap.
+    """
+    if years is None:
+        league = snapshots.build_league(league_id, CURRENT_SEASON, mode=snapshots.PREFER)
+        years = sorted(int(y) for y in getattr(league, "previousSeasons", []) or [])
+    results = []
+    for year in years:
+        try:
+            results.append(ingest_season(league_id, year))
+            logger.info("Ingested league %s season %s", league_id, year)
+        except Exception as e:
+            logger.warning("Failed to ingest league %s season %s: %s", league_id, year, e)
+            results.append({"year": year, "error": str(e)})
+    return results
+
+
+def all_time_records(league_id: int) -> list:
+    """
+    Career totals per team id across every ingested season, plus single-week highs and lows.
+    """
+    warehouse = get_warehouse(league_id)
+    teams = {}
+    for year, season in sorted(warehouse.seasons.items()):
+        t = season.table("teams")
+        for i, team_id in enumerate(t["team_id"].tolist()):
+            row = teams.setdefault(team_id, {
+                "team_id": team_id, "team_name": season.team_name(team_id), "seasons": 0,
+                "wins": 0, "losses": 0, "ties": 0, "points_for": 0.0, "points_against": 0.0,
+                "championships": 0, "best_week": None, "worst_week": None,
+            })
+            row["team_name"] = season.team_name(team_id)   # most recent name wins
+            row["seasons"] += 1
+            row["wins"] += int(t["wins"][i])
+            row["losses"] += int(t["losses"][i])
+            row["ties"] += int(t["ties"][i])
+            row["points_for"] += float(t["points_for"][i])
+            row["points_against"] += float(t["points_against"][i])
+            row["championships"] += int(t["final_standing"][i] == 1)
+
+        m = season.table("matchups")
+        weeks = np.concatenate([m["week"], m["week"]])
+        team_ids = np.concatenate([m["home_team_id"], m["away_team_id"]])
+        scores = np.concatenate([m["home_score"], m["away_score"]])
+        for team_id, row in teams.items():
+            mask = (team_ids == team_id) & (scores > 0)
+            if not mask.any():
+                continue
+            hi, lo = np.argmax(np.where(mask, scores, -np.inf)), np.argmin(np.where(mask, scores, np.inf))
+            if row["best_week"] is None or scores[hi] > row["best_week"]["points"]:
+                row["best_week"] = {"year": year, "week": int(weeks[hi]), "points": float(scores[hi])}
+            if row["worst_week"] is None or scores[lo] < row["worst_week"]["points"]:
+                row["worst_week"] = {"year": year, "week": int(weeks[lo]), "points": float(scores[lo])}
+
+    for row in teams.values():
+        games = row["wins"] + row["losses"] + row["ties"]
+        row["win_pct"] = round((row["wins"] + 0.5 * row["ties"]) / games, 4) if games else 0.0
+        row["points_for"] = round(row["points_for"], 2)
+        row["points_against"] = round(row["points_against"], 2)
+    return sorted(teams.values(), key=lambda r: (r["win_pct"], r["points_for"]), reverse=True)
+
+
+def head_to_head(league_id: int, team_id: int, opponent_id: int = None) -> list:
+    """
+    All-time record of team_id against each opponent (or one), with every game played.
+    """
+    warehouse = get_warehouse(league_id)
+    opponents = {}
+    for year, season in sorted(warehouse.seasons.items()):
+        m = season.table("matchups")
+        home, away = m["home_team_id"], m["away_team_id"]
+        for i in np.flatnonzero((home == team_id) | (away == team_id)).tolist():
+            is_home = int(home[i]) == team_id
+            opp = int(away[i] if is_home else home[i])
+            if opponent_id is not None and opp != opponent_id:
+                continue
+            points, against = (float(m["home_score"][i]), float(m["away_score"][i]))
+            if not is_home:
+                points, against = against, points
+            if points == 0 and against == 0:
+                continue  # not played yet
+            row = opponents.setdefault(opp, {
+                "opponent_id": opp, "opponent_name": season.team_name(opp),
+                "wins": 0, "losses": 0, "ties": 0, "points_for": 0.0, "points_against": 0.0, "games": [],
+            })
+            row["opponent_name"] = season.team_name(opp)
+            row["wins" if points > against else "losses" if points < against else "ties"] += 1
+            row["points_for"] += points
+            row["points_against"] += against
+            row["games"].append({
+                "year": year, "week": int(m["week"][i]), "playoff": bool(m["playoff"][i]),
+                "points_for": points, "points_against": against,
+            })
+    for row in opponents.values():
+        row["points_for"] = round(row["points_for"], 2)
+        row["points_against"] = round(row["points_against"], 2)
+    return sorted(opponents.values(), key=lambda r: r["opponent_id"])
+
+
+def season_player_points(season: SeasonData) -> tuple:
+    """
+    (player ids, fantasy points scored while rostered) for one season, from box scores.
+    Bench and IR weeks count too: the question is what the player produced.
+    """
+    lineups = season.table("lineups")
+    if not len(lineups["player_id"]):
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    player_ids, inverse = np.unique(lineups["player_id"], return_inverse=True)
+    return player_ids, np.bincount(inverse, weights=lineups["points"], minlength=len(player_ids))
+
+
+def lookup(sorted_keys: np.ndarray, values: np.ndarray, query: np.ndarray, default: float = 0.0) -> np.ndarray:
+    """
+    Vectorized dict lookup: values for each query key, `default` where the key is missing.
+    """
+    if not len(sorted_keys):
+        return np.full(len(query), default)
+    position = np.clip(np.searchsorted(sorted_keys, query), 0, len(sorted_keys) - 1)
+    return np.where(sorted_keys[position] == query, values[position], default)
+
+
+def draft_value(league_id: int, year: int = None) -> list:
+    """
+    Every draft pick joined to the points its player scored that season, per ingested season.
+    """
+    warehouse = get_warehouse(league_id)
+    results = []
+    for season_year, season in sorted(warehouse.seasons.items()):
+        if year is not None and season_year != year:
+            continue
+        d = season.table("draft")
+        player_ids, points = season_player_points(season)
+        pick_points = lookup(player_ids, points, d["player_id"])
+
+        picks = []
+        for i in range(len(d["overall"])):
+            name, pos = season.player(int(d["player_id"][i]))
+            picks.append({
+                "overall": int(d["overall"][i]), "round": int(d["round"][i]), "round_pick": int(d["round_pick"][i]),
+                "team_id": int(d["team_id"][i]), "team_name": season.team_name(int(d["team_id"][i])),
+                "player_id": int(d["player_id"][i]), "player_name": name, "position": pos,
+                "season_points": round(float(pick_points[i]), 2),
+            })
+        rounds = {}
+        for pick in picks:
+            rounds.setdefault(pick["round"], []).append(pick["season_points"])
+        results.append({
+            "year": season_year,
+            "picks": picks,
+            "rounds": [{"round": r, "avg_points": round(float(np.mean(p)), 2)} for r, p in sorted(rounds.items())],
+        })
+    return results
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Ingest past seasons of a league into the local warehouse.")
+    parser.add_argument("league_id", type=int)
+    parser.add_argument("--years", help="Seasons to ingest, e.g. 2019-2024 or 2021,2023 (default: every past season)")
+    args = parser.parse_args(argv)
+
+    years = None
+    if args.years:
+        years = []
+        for part in args.years.split(","):
+            start, _, end = part.partition("-")
+            years.extend(range(int(start), int(end or start) + 1))
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    for result in ingest_league(args.league_id, years):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+
+def approx_size(obj, _seen=None) -> int:
+    """
+    Rough, recursive estimate of an object's memory footprint in bytes.
+    Walks containers and instance __dict__s, counting each object once.
+    """
+    if _seen is None:
+        _seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in _seen:
+            continue
+        _seen.add(id(current))
+        try:
+            total += sys.getsizeof(current)
+        except TypeError:
+            continue
+
+        if isinstance(current, (str, bytes, bytearray, int, float, bool, type(None))):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__") and not isinstance(current, type):
+            stack.append(vars(current))
+    return total
+
+
+class _Entry:
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+class _Flight:
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with per-entry TTLs, a memory cap and
+    single-flight loading so concurrent misses for one key share one load.
+    """
+
+    def __init__(self, default_ttl: float, max_entries: int = 128, max_bytes: int = 0, size_of=approx_size):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._flights = {}
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.loads = 0
+        self.load_errors = 0
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for key, or default if missing or expired.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry.value
+
+    def peek(self, key, default=None):
+        """
+        Returns the cached value for key without touching LRU order or counters.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.expires_at <= time.monotonic():
+                return default
+            return entry.value
+
+    def set(self, key, value, ttl: float = None):
+        """
+        Stores value under key for ttl seconds (default_ttl if not given).
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        size = self.size_of(value) if self.max_bytes else 0
+        with self._lock:
+            self._store(key, value, ttl, size)
+
+    def get_or_load(self, key, loader, ttl: float = None):
+        """
+        Returns the cached value for key, calling loader() on a miss.
+        Only one thread runs the loader per key; the others wait for its result.
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry.value
+            self.misses += 1
+
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self.load_errors += 1
+                self._flights.pop(key, None)
+            flight.error = e
+            flight.event.set()
+            raise
+
+        ttl = self.default_ttl if ttl is None else ttl
+        size = self.size_of(value) if self.max_bytes else 0
+        with self._lock:
+            self.loads += 1
+            self._store(key, value, ttl, size)
+            self._flights.pop(key, None)
+        flight.value = value
+        flight.event.set()
+        return value
+
+    def invalidate(self, key) -> bool:
+        """
+        Drops key from the cache. Returns True if an entry was removed.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self._bytes -= entry.size
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def keys(self):
+        with self._lock:
+            return list(self._entries.keys())
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "loads": self.loads,
+                "load_errors": self.load_errors,
+                "in_flight": len(self._flights),
+            }
+
+    # --- internals (caller holds self._lock) ---
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._entries.pop(key)
+            self._bytes -= entry.size
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key, value, ttl: float, size: int):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[key] = _Entry(value, time.monotonic() + ttl, size)
+        self._bytes += size
+        self._evict()
+
+    def _evict(self):
+        # Always keep the most recently stored entry, even if it alone exceeds the cap
+        while len(self._entries) > 1 and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evictions += 1
@@ -1,2 +1,189 @@
+import gzip
+import hashlib
 import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
 from pathlib import Path
+
+# Bump when the envelope layout changes; older snapshots are then ignored
+SNAPSHOT_SCHEMA_VERSION = 1
+
+
+def snapshot_key(request: dict) -> str:
+    """
+    Stable hash of an upstream request description (path, params, headers).
+    """
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def write_json_gz(path: Path, data) -> None:
+    """
+    Atomically writes data as gzip-compressed JSON.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def read_json_gz(path: Path):
+    """
+    Reads gzip-compressed JSON, returning None if the file is missing or corrupt.
+    """
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+
+
+class SnapshotStore(ABC):
+    """
+    Interface for persisting raw ESPN JSON payloads per (league_id, year, request key).
+    """
+
+    @abstractmethod
+    def load(self, league_id: int, year: int, key: str):
+        ...
+
+    @abstractmethod
+    def save(self, league_id: int, year: int, key: str, request: dict, payload) -> None:
+        ...
+
+    @abstractmethod
+    def entries(self, league_id: int, year: int) -> list:
+        """
+        Returns metadata (key, request, saved_at) for every snapshot of a league season.
+        """
+
+    @staticmethod
+    def _envelope(request: dict, payload) -> dict:
+        return {
+            "schema": SNAPSHOT_SCHEMA_VERSION,
+            "saved_at": time.time(),
+            "request": request,
+            "payload": payload,
+        }
+
+
+class NullSnapshotStore(SnapshotStore):
+    """
+    Store that keeps nothing; used when snapshots are disabled.
+    """
+
+    def load(self, league_id, year, key):
+        return None
+
+    def save(self, league_id, year, key, request, payload):
+        pass
+
+    def entries(self, league_id, year):
+        return []
+
+
+class FileSnapshotStore(SnapshotStore):
+    """
+    One gzip-compressed JSON file per payload under root/<league_id>/<year>/<key>.json.gz.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _path(self, league_id, year, key) -> Path:
+        return self.root / str(league_id) / str(year) / f"{key}.json.gz"
+
+    def load(self, league_id, year, key):
+        envelope = read_json_gz(self._path(league_id, year, key))
+        if not envelope or envelope.get("schema") != SNAPSHOT_SCHEMA_VERSION:
+            return None
+        return envelope["payload"]
+
+    def save(self, league_id, year, key, request, payload):
+        write_json_gz(self._path(league_id, year, key), self._envelope(request, payload))
+
+    def entries(self, league_id, year):
+        folder = self.root / str(league_id) / str(year)
+        results = []
+        for path in sorted(folder.glob("*.json.gz")):
+            envelope = read_json_gz(path)
+            if not envelope or envelope.get("schema") != SNAPSHOT_SCHEMA_VERSION:
+                continue
+            results.append({
+                "key": path.name[: -len(".json.gz")],
+                "request": envelope.get("request"),
+                "saved_at": envelope.get("saved_at"),
+            })
+        return results
+
+
+class SQLiteSnapshotStore(SnapshotStore):
+    """
+    All payloads in a single SQLite file, zlib-compressed.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    league_id INTEGER NOT NULL,
+                    year INTEGER NOT NULL,
+                    key TEXT NOT NULL,
+                    schema INTEGER NOT NULL,
+                    saved_at REAL NOT NULL,
+                    request TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    PRIMARY KEY (league_id, year, key)
+                )
+                """
+            )
+
+    def load(self, league_id, year, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM snapshots WHERE league_id = ? AND year = ? AND key = ? AND schema = ?",
+                (league_id, year, key, SNAPSHOT_SCHEMA_VERSION),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def save(self, league_id, year, key, request, payload):
+        blob = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (league_id, year, key, SNAPSHOT_SCHEMA_VERSION, time.time(), json.dumps(request, default=str), blob),
+            )
+
+    def entries(self, league_id, year):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, request, saved_at FROM snapshots WHERE league_id = ? AND year = ? AND schema = ? ORDER BY key",
+                (league_id, year, SNAPSHOT_SCHEMA_VERSION),
+            ).fetchall()
+        return [{"key": key, "request": json.loads(request), "saved_at": saved_at} for key, request, saved_at in rows]
+
+
+def open_snapshot_store(backend: str, location) -> SnapshotStore:
+    """
+    Builds a snapshot store for the configured backend: "file", "sqlite" or "none".
+    """
+    if backend == "file":
+        return FileSnapshotStore(location)
+    if backend == "sqlite":
+        return SQLiteSnapshotStore(Path(location) / "snapshots.sqlite3")
+    if backend == "none":
+        return NullSnapshotStore()
+    raise ValueError(f"Unknown snapshot backend: {backend}")
@@ -0,0 +1,228 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds (seconds) for latency histograms
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds (bytes) for payload size histograms
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((labels or {}).items()))
+
+
+def _format_labels(key: tuple, extra: dict = None) -> str:
+    items = list(key) + list((extra or {}).items())
+    if not items:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self._series = {}   # label key -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * len(self.buckets) + [0.0, 0]
+            i = bisect_left(self.buckets, value)
+            if i < len(self.buckets):
+                series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(key, list(series)) for key, series in self._series.items()]
+        for key, series in sorted(items):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(key, {'le': bound})} {cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, {'le': '+Inf'})} {series[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_format_labels(key)} {value}" for key, value in items)
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Minimal Prometheus-style registry: histograms and counters updated inline,
+    plus collectors called at scrape time for values owned elsewhere (cache stats).
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help: str, buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help, buckets))
+
+    def counter(self, name: str, help: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help))
+
+    def add_collector(self, collector):
+        """
+        collector() returns [(name, type, help, [(labels dict, value), ...]), ...].
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            for name, kind, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(f"{name}{_format_labels(_label_key(labels))} {value}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+request_seconds = registry.histogram("http_request_duration_seconds", "Request latency by route")
+response_bytes = registry.histogram("http_response_size_bytes", "Response body size by route", SIZE_BUCKETS)
+span_seconds = registry.histogram("span_duration_seconds", "Time spent in instrumented functions")
+upstream_seconds = registry.histogram("espn_upstream_duration_seconds", "ESPN request latency")
+upstream_requests = registry.counter("espn_upstream_requests_total", "ESPN requests by kind and outcome")
+
+
+# Per-request profile: span name -> [calls, seconds]. Set only for opted-in requests.
+_profile = contextvars.ContextVar("profile", default=None)
+
+
+def start_profile() -> dict:
+    profile = {}
+    _profile.set(profile)
+    return profile
+
+
+def record_span(name: str, seconds: float):
+    span_seconds.observe(seconds, span=name)
+    profile = _profile.get()
+    if profile is not None:
+        entry = profile.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+
+@contextmanager
+def span(name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - start)
+
+
+def traced(name: str = None):
+    """
+    Decorator recording a function's duration as a span (sync or async).
+    """
+    def decorator(fn):
+        span_name = name or fn.__name__
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def server_timing(profile: dict) -> str:
+    """
+    Formats a profile as a Server-Timing header value (durations in milliseconds).
+    """
+    return ", ".join(
+        f'{name.replace(" ", "_")};dur={seconds * 1000:.2f};desc="{calls}x"'
+        for name, (calls, seconds) in sorted(profile.items(), key=lambda item: -item[1][1])
+    )
+
+
+def cache_collector(caches: dict):
+    """
+    Collector exposing TTLCache.stats() counters and hit ratios for named caches.
+    """
+    fields = (
+        ("hits", "cache_hits_total", "counter", "Cache hits"),
+        ("misses", "cache_misses_total", "counter", "Cache misses"),
+        ("evictions", "cache_evictions_total", "counter", "Entries evicted for size"),
+        ("hit_ratio", "cache_hit_ratio", "gauge", "Hits / (hits + misses) since start"),
+        ("entries", "cache_entries", "gauge", "Entries currently cached"),
+        ("bytes", "cache_bytes", "gauge", "Approximate bytes held"),
+    )
+
+    def collect():
+        stats = {name: cache.stats() for name, cache in caches.items()}
+        return [
+            (metric, kind, help, [({"cache": name}, round(s.get(field, 0), 4)) for name, s in stats.items()])
+            for field, metric, kind, help in fields
+        ]
+    return collect
+
+
+@contextmanager
+def upstream_call(kind: str):
+    """
+    Times one ESPN request: counted by kind and outcome, and reported as the
+    "upstream" span of the current request's profile.
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        seconds = time.perf_counter() - start
+        upstream_seconds.observe(seconds, kind=kind)
+        upstream_requests.inc(kind=kind, outcome=outcome)
+        record_span("upstream", seconds)
@@ -0,0 +1,132 @@
+import gzip
+import hashlib
+import json
+import threading
+import weakref
+
+from fastapi import Request, Response
+from app.utils.metrics import span
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Bodies smaller than this aren't worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+
+def _default(obj):
+    # NumPy scalars/arrays and anything else espn_api hands back
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    return str(obj)
+
+
+def dumps(data) -> bytes:
+    """
+    Serializes a response payload to JSON bytes. Non-string dict keys (e.g. the
+    int scoring periods in player stats) become strings, like jsonable_encoder does.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(data, default=_default, separators=(",", ":")).encode()
+
+
+def _etag_matches(header: str, etags: set) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip() in etags for tag in header.split(","))
+
+
+class CachedPayload:
+    """
+    One serialized response body plus its lazily built compressed variants.
+    Each encoding gets its own strong ETag, derived from the uncompressed bytes.
+    """
+
+    __slots__ = ("body", "empty", "digest", "_encoded", "_lock")
+
+    def __init__(self, data):
+        with span("serialize"):
+            self.body = dumps(data)
+        self.empty = not data
+        self.digest = hashlib.sha1(self.body).hexdigest()[:20]
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def etag(self, encoding: str = None) -> str:
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+    def encoded(self, encoding: str) -> bytes:
+        with self._lock:
+            body = self._encoded.get(encoding)
+            if body is None:
+                with span("compress"):
+                    if encoding == "br":
+                        body = brotli.compress(self.body, quality=5)
+                    else:
+                        body = gzip.compress(self.body, compresslevel=6, mtime=0)
+                self._encoded[encoding] = body
+            return body
+
+    def _pick_encoding(self, accept_encoding: str) -> str:
+        if len(self.body) < MIN_COMPRESS_BYTES:
+            return None
+        accepted = {part.split(";")[0].strip().lower() for part in accept_encoding.split(",")}
+        if brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    def response(self, request: Request, status_code: int = 200) -> Response:
+        """
+        200 with the best encoding the client accepts, or 304 if it already holds this payload.
+        """
+        encoding = self._pick_encoding(request.headers.get("accept-encoding", ""))
+        headers = {
+            "ETag": self.etag(encoding),
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "no-cache",   # always revalidate, which is a cheap 304
+        }
+        variants = {self.etag(), self.etag("gzip"), self.etag("br")}
+        if _etag_matches(request.headers.get("if-none-match"), variants):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+            return Response(self.encoded(encoding), status_code=status_code, media_type="application/json", headers=headers)
+        return Response(self.body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+_payloads = weakref.WeakKeyDictionary()
+_payloads_lock = threading.Lock()
+
+
+def snapshot_payload(snapshot, key, build) -> CachedPayload:
+    """
+    Serializes build() once per data snapshot (e.g. a cached League object) and key.
+    The payloads are dropped together with the snapshot they were built from.
+    """
+    with _payloads_lock:
+        payloads = _payloads.get(snapshot)
+        if payloads is None:
+            payloads = _payloads[snapshot] = {}
+        payload = payloads.get(key)
+    if payload is None:
+        with span("build"):
+            data = build()
+        payload = CachedPayload(data)
+        with _payloads_lock:
+            payload = payloads.setdefault(key, payload)
+    return payload
@@ -0,0 +1,62 @@
+"""
+Compares two benchmark result files, e.g. before and after a change:
+
+    python -m benchmarks.compare data/benchmarks/results/<old>.json data/benchmarks/results/<new>.json
+"""
+import argparse
+import json
+
+
+def _change(old, new) -> str:
+    if not old or new is None:
+        return "    n/a"
+    return f"{(new - old) / old * 100:+7.1f}%"
+
+
+def compare(old: dict, new: dict) -> list:
+    lines = [f"{old['meta'].get('commit', '?')[:12]} -> {new['meta'].get('commit', '?')[:12]}", ""]
+    before = {(r["route"], r["concurrency"]): r for r in old.get("routes", [])}
+    for row in new.get("routes", []):
+        prev = before.get((row["route"], row["concurrency"]))
+        if prev is None:
+            continue
+        lines.append(
+            f"{row['route']:55} c={row['concurrency']:<4} "
+            f"rps {_change(prev['throughput_rps'], row['throughput_rps'])}  "
+            f"p50 {_change(prev['p50_ms'], row['p50_ms'])}  "
+            f"p99 {_change(prev['p99_ms'], row['p99_ms'])}"
+        )
+
+    before = {r["function"]: r for r in old.get("serializers", []) if "error" not in r}
+    rows = [r for r in new.get("serializers", []) if "error" not in r and r["function"] in before]
+    if rows:
+        lines.append("")
+    for row in rows:
+        prev = before[row["function"]]
+        lines.append(
+            f"{row['function']:30} build {_change(prev['build_mean_ms'], row['build_mean_ms'])}  "
+            f"encode {_change(prev['encode_mean_ms'], row['encode_mean_ms'])}  "
+            f"bytes {_change(prev['bytes'], row['bytes'])}"
+        )
+
+    if old.get("memory") and new.get("memory"):
+        lines.append("")
+        for field in ("load_seconds", "hydrated_bytes", "with_derived_bytes"):
+            lines.append(f"{field:30} {old['memory'][field]} -> {new['memory'][field]} {_change(old['memory'][field], new['memory'][field])}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument("old")
+    parser.add_argument("new")
+    args = parser.parse_args()
+    with open(args.old) as f:
+        old = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    print("\n".join(compare(old, new)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import importlib
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Routers whose GET routes are benchmarked, and the prefix main.py mounts them under
+ROUTER_MODULES = ("app.routers.league", "app.routers.players", "app.routers.free_agents")
+API_PREFIX = "/api"
+# Unbounded event stream; it never completes, so it has no latency to measure
+SKIP_ROUTES = {"/league/{league_id}/box-scores/stream"}
+
+# Most routes don't take a year and serve their default season
+BENCH_YEAR = 2025
+
+DEFAULT_FIXTURES_DIR = "data/benchmarks/fixtures"
+DEFAULT_RESULTS_DIR = "data/benchmarks/results"
+
+
+def configure(fixtures_dir: str, mode: str) -> Path:
+    """
+    Points the app at the fixture snapshot store before app.config is imported.
+    Activity logs and the warehouse go to a scratch directory so runs don't touch data/.
+    """
+    if "app.config" in sys.modules:
+        raise RuntimeError("configure() must run before the app is imported")
+    scratch = Path(tempfile.mkdtemp(prefix="fantasy-bench-"))
+    os.environ.update({
+        "SNAPSHOT_BACKEND": "file",
+        "SNAPSHOT_DIR": str(Path(fixtures_dir).resolve()),
+        "SNAPSHOT_MODE": mode,
+        "SCHEDULER_ENABLED": "0",
+        "ACTIVITY_LOG_DIR": str(scratch / "activity"),
+        "WAREHOUSE_DIR": str(scratch / "warehouse"),
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+    })
+    return scratch
+
+
+def benchmark_routes(league_id: int, team_id: int, week: int, only: str = None) -> list:
+    """
+    (route template, url) for every GET route of ROUTER_MODULES, with path parameters
+    filled in and required query parameters set from the week.
+    """
+    query_values = {"week": week, "weeks": f"1-{week}"}
+    routes = []
+    for module in ROUTER_MODULES:
+        for route in importlib.import_module(module).router.routes:
+            if "GET" in route.methods and route.path not in SKIP_ROUTES and not (only and only not in route.path):
+                routes.append(route)
+
+    results = []
+    for route in routes:
+        url = API_PREFIX + route.path.format(league_id=league_id, team_id=team_id)
+        required = [p.name for p in route.dependant.query_params if p.field_info.is_required()]
+        missing = [name for name in required if name not in query_values]
+        if missing:
+            raise ValueError(f"No benchmark value for required query params {missing} of {route.path}")
+        if required:
+            url += "?" + "&".join(f"{name}={query_values[name]}" for name in required)
+        results.append((route.path, url))
+    return results
+
+
+def run_metadata() -> dict:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, timeout=10).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
@@ -0,0 +1,48 @@
+"""
+Records the ESPN responses the benchmarks replay. Needs network access (and
+ESPN_S2/SWID for private leagues); run from backend/:
+
+    python -m benchmarks.record <league_id> [--week 1] [--fixtures data/benchmarks/fixtures]
+"""
+import argparse
+import asyncio
+
+from benchmarks.harness import BENCH_YEAR, DEFAULT_FIXTURES_DIR, benchmark_routes, configure
+
+
+async def record(app, routes: list) -> list:
+    import httpx
+
+    results = []
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for template, url in routes:
+            response = await client.get(url)
+            results.append((template, response.status_code))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record ESPN fixtures for the offline benchmarks")
+    parser.add_argument("league_id", type=int)
+    parser.add_argument("--team-id", type=int, default=None, help="Defaults to the league's first team")
+    parser.add_argument("--week", type=int, default=1)
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    args = parser.parse_args()
+
+    configure(args.fixtures, mode="live")
+    from app.helper import refresh_league
+    from app.main import app
+    from app.services.snapshots import list_snapshots
+
+    # Fetch live so the league's own payloads are recorded, not warm-started from old ones
+    league = refresh_league(args.league_id, BENCH_YEAR)
+    team_id = args.team_id or league.teams[0].team_id
+    routes = benchmark_routes(args.league_id, team_id, args.week)
+    for template, status in asyncio.run(record(app, routes)):
+        print(f"{status}  {template}")
+    print(f"{len(list_snapshots(args.league_id, BENCH_YEAR))} payloads recorded in {args.fixtures}")
+
+
+if __name__ == "__main__":
+    main()
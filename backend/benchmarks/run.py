@@ -0,0 +1,205 @@
+"""
+Offline benchmarks for the league, players and free agent routes, replaying the
+fixtures written by benchmarks.record (no ESPN access needed). Run from backend/:
+
+    python -m benchmarks.run <league_id> [--concurrency 1,8,32] [--requests 200]
+
+Results are written as JSON (see --out) for benchmarks.compare.
+"""
+import argparse
+import asyncio
+import gc
+import inspect
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.harness import (
+    BENCH_YEAR,
+    DEFAULT_FIXTURES_DIR,
+    DEFAULT_RESULTS_DIR,
+    benchmark_routes,
+    configure,
+    run_metadata,
+)
+
+
+def latency_summary(latencies: list, wall: float) -> dict:
+    ms = np.asarray(latencies) * 1000
+    return {
+        "throughput_rps": round(len(ms) / wall, 2) if wall else None,
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+async def bench_route(client, url: str, concurrency: int, requests: int, warmup: int) -> dict:
+    """
+    Sends `requests` GETs through `concurrency` workers and summarizes their latencies.
+    """
+    for _ in range(warmup):
+        await client.get(url)
+
+    latencies, statuses, sizes = [], {}, []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            sizes.append(len(response.content))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - start
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "status": {str(k): v for k, v in sorted(statuses.items())},
+        "errors": sum(v for k, v in statuses.items() if k >= 500),
+        "avg_bytes": int(np.mean(sizes)),
+        **latency_summary(latencies, wall),
+    }
+
+
+async def bench_routes(app, routes: list, levels: list, requests: int, warmup: int) -> list:
+    import httpx
+
+    results = []
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for template, url in routes:
+            for concurrency in levels:
+                result = await bench_route(client, url, concurrency, requests, warmup)
+                results.append({"route": template, "url": url, **result})
+                print(f"{template:55} c={concurrency:<4} {result['throughput_rps']:>9} rps  "
+                      f"p50 {result['p50_ms']:>8} ms  p99 {result['p99_ms']:>8} ms  {result['status']}")
+    return results
+
+
+def league_memory(app, league_id: int, routes: list) -> dict:
+    """
+    Memory held by one cached league: right after hydrating it from fixtures, and
+    after every benchmarked route has built its derived indexes and payloads once.
+    """
+    import httpx
+    from app.helper import get_league, league_cache
+
+    async def touch_routes():
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for _, url in routes:
+                await client.get(url)
+
+    league_cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    get_league(league_id, BENCH_YEAR)
+    load_seconds = time.perf_counter() - start
+    gc.collect()
+    hydrated = tracemalloc.get_traced_memory()[0] - baseline
+    asyncio.run(touch_routes())
+    gc.collect()
+    derived = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return {
+        "load_seconds": round(load_seconds, 4),
+        "hydrated_bytes": hydrated,
+        "with_derived_bytes": derived,
+        "cache_estimate_bytes": league_cache.stats()["bytes"],
+    }
+
+
+def bench_serializers(league_id: int, team_id: int, week: int, repeat: int) -> list:
+    """
+    Cost of each espn_service fetch_* function on a warm league, and of encoding its result.
+    Finished-week caches are cleared between calls so scoreboards are rebuilt each time.
+    """
+    from app.services import espn_service
+    from app.utils.responses import dumps
+
+    values = {"league_id": league_id, "team_id": team_id, "week": week, "year": BENCH_YEAR}
+    results = []
+    for name, fn in inspect.getmembers(espn_service, inspect.isfunction):
+        if not name.startswith("fetch_") or fn.__module__ != espn_service.__name__:
+            continue
+        params = inspect.signature(fn).parameters
+        if any(p not in values and params[p].default is inspect.Parameter.empty for p in params):
+            continue
+        kwargs = {p: values[p] for p in params if p in values}
+        build, encode = [], []
+        try:
+            for _ in range(repeat):
+                espn_service.final_week_cache.clear()
+                start = time.perf_counter()
+                data = fn(**kwargs)
+                build.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                body = dumps(data)
+                encode.append(time.perf_counter() - start)
+        except Exception as e:
+            results.append({"function": name, "error": str(e)})
+            print(f"{name:30} failed: {e}")
+            continue
+        results.append({
+            "function": name,
+            "calls": repeat,
+            "build_mean_ms": round(float(np.mean(build)) * 1000, 4),
+            "build_min_ms": round(float(np.min(build)) * 1000, 4),
+            "encode_mean_ms": round(float(np.mean(encode)) * 1000, 4),
+            "bytes": len(body),
+        })
+        print(f"{name:30} build {results[-1]['build_mean_ms']:>9} ms  encode {results[-1]['encode_mean_ms']:>9} ms  {len(body)} B")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded ESPN fixtures and benchmark the API")
+    parser.add_argument("league_id", type=int)
+    parser.add_argument("--team-id", type=int, default=None, help="Defaults to the league's first team")
+    parser.add_argument("--week", type=int, default=1)
+    parser.add_argument("--concurrency", default="1,8,32", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per route and concurrency level")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20, help="Calls per fetch_* function")
+    parser.add_argument("--routes", default=None, help="Only routes whose path contains this")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES_DIR)
+    parser.add_argument("--out", default=None, help=f"Result file (default {DEFAULT_RESULTS_DIR}/<commit>.json)")
+    parser.add_argument("--skip-memory", action="store_true")
+    parser.add_argument("--skip-serializers", action="store_true")
+    args = parser.parse_args()
+    levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+
+    configure(args.fixtures, mode="replay")
+    from app.helper import get_league
+    from app.main import app
+
+    league = get_league(args.league_id, BENCH_YEAR)
+    team_id = args.team_id or league.teams[0].team_id
+    routes = benchmark_routes(args.league_id, team_id, args.week, only=args.routes)
+
+    meta = run_metadata()
+    results = {
+        "meta": {**meta, "league_id": args.league_id, "team_id": team_id, "week": args.week, "args": vars(args)},
+        "memory": None if args.skip_memory else league_memory(app, args.league_id, routes),
+        "routes": asyncio.run(bench_routes(app, routes, levels, args.requests, args.warmup)),
+        "serializers": [] if args.skip_serializers else bench_serializers(args.league_id, team_id, args.week, args.repeat),
+    }
+
+    out = Path(args.out or f"{DEFAULT_RESULTS_DIR}/{(meta['commit'] or 'unknown')[:12]}.json")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2))
+    print(f"Results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+// src/app/api/overview/route.ts
+import { NextResponse } from "next/server";
+
+export async function GET(request: Request) {
+  try {
+    const backendUrl = process.env.BACKEND_URL;
+    const leagueId = process.env.LEAGUE_ID;
+
+    if (!backendUrl || !leagueId) {
+      throw new Error("BACKEND_URL or LEAGUE_ID is not defined");
+    }
+
+    // Pass through section selection, e.g. ?include=teams,settings,scoreboard
+    const { searchParams } = new URL(request.url);
+    const query = new URLSearchParams();
+    for (const key of ["include", "week"]) {
+      const value = searchParams.get(key);
+      if (value) query.set(key, value);
+    }
+
+    const ifNoneMatch = request.headers.get("if-none-match");
+    const res = await fetch(`${backendUrl}/api/league/${leagueId}/overview?${query}`, {
+      headers: ifNoneMatch ? { "If-None-Match": ifNoneMatch } : {},
+      cache: "no-store",
+    });
+
+    const etag = res.headers.get("etag");
+    if (res.status === 304) {
+      return new NextResponse(null, { status: 304, headers: etag ? { ETag: etag } : {} });
+    }
+
+    if (!res.ok) {
+      return NextResponse.json({ error: "Failed to fetch league overview" }, { status: res.status });
+    }
+
+    // Stream the body through unchanged: the ETag is strong, so the bytes must match the backend's
+    const headers: Record<string, string> = {
+      "Content-Type": res.headers.get("content-type") ?? "application/json",
+    };
+    if (etag) {
+      headers.ETag = etag;
+      headers["Cache-Control"] = "no-cache";
+    }
+    return new NextResponse(res.body, { headers });
+  } catch (err) {
+    console.error("Error fetching league overview in proxy:", err);
+    return NextResponse.json({ error: "Internal server error" }, { status: 500 });
+  }
+}
@@ -1,7 +1,7 @@
 // src/app/api/teams/route.ts
 import { NextResponse } from "next/server";
 
-export async function GET() {
+export async function GET(request: Request) {
   try {
     const backendUrl = process.env.BACKEND_URL;
     const leagueId = process.env.LEAGUE_ID;
@@ -10,17 +10,33 @@ export async function GET() {
       throw new Error("BACKEND_URL or LEAGUE_ID is not defined");
     }
 
-    const res = await fetch(`${backendUrl}/api/league/${leagueId}`);
+    // Revalidate with the backend's ETag so unchanged data comes back as an empty 304
+    const ifNoneMatch = request.headers.get("if-none-match");
+    const res = await fetch(`${backendUrl}/api/league/${leagueId}`, {
+      headers: ifNoneMatch ? { "If-None-Match": ifNoneMatch } : {},
+      cache: "no-store",
+    });
+
+    const etag = res.headers.get("etag");
+    if (res.status === 304) {
+      return new NextResponse(null, { status: 304, headers: etag ? { ETag: etag } : {} });
+    }
 
     if (!res.ok) {
       return NextResponse.json({ error: "Failed to fetch teams" }, { status: res.status });
     }
 
-    const data = await res.json();
-    return NextResponse.json(data);
+    // Stream the body through unchanged: the ETag is strong, so the bytes must match the backend's
+    const headers: Record<string, string> = {
+      "Content-Type": res.headers.get("content-type") ?? "application/json",
+    };
+    if (etag) {
+      headers.ETag = etag;
+      headers["Cache-Control"] = "no-cache";
+    }
+    return new NextResponse(res.body, { headers });
   } catch (err) {
     console.error("Error fetching teams in proxy:", err);
     return NextResponse.json({ error: "Internal server error" }, { status: 500 });
   }
 }
-